@@ -0,0 +1,277 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Province wide (batch) generation of the recommendation and pathway documents
+
+Every club gets its own subfolder of the report directory holding its officials' documents, its
+consolidated report and its email list, exactly as a single club run produces them. Clubs are
+handed out to a pool of worker processes. Each completed club is recorded in a checkpoint file in
+the report directory so an interrupted run picks up where it stopped. A club is only skipped if its
+data is unchanged since it was completed. The checkpoint is removed once a run finishes without
+errors, the next run starts over.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional
+
+import pandas as pd
+from docx import Document  # type: ignore
+
+import odp_report
+import pathway_report
+from config import AnalyzerConfig
+from official_docs import ProgressCallback, worker_count
+from report_manifest import content_hashes
+from report_writer import SaveFailure
+from task_runner import Task
+
+EMAIL_LIST_COLUMNS = ["Last Name", "First Name", "EMail", "Filename"]
+
+# Club selection that runs the batch
+ALL_CLUBS = "All Clubs"
+
+
+class BatchReport(NamedTuple):
+    directory_key: str  # Config option holding the report directory
+    report_file_key: str  # Config option holding the consolidated report file name
+    generator: Callable  # Class producing a club's documents, constructed with (club, club_data, config)
+    template_version: int
+
+
+BATCH_REPORTS = {
+    "odp": BatchReport(
+        "odp_report_directory", "odp_report_file_docx", odp_report.docgenCore, odp_report.TEMPLATE_VERSION
+    ),
+    "pathway": BatchReport(
+        "np_report_directory", "np_report_file_docx", pathway_report.NewPathway, pathway_report.TEMPLATE_VERSION
+    ),
+}
+
+
+class BatchCheckpoint:
+    """The clubs completed by a batch run and a digest of the data each one was generated from"""
+
+    def __init__(self, directory: str, report: str):
+        self._filename = os.path.abspath(os.path.join(directory, f"{report}-batch.json"))
+        self._clubs: dict = {}
+        try:
+            with open(self._filename, "r", encoding="utf-8") as checkpoint_file:
+                self._clubs = json.load(checkpoint_file).get("clubs", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.info("Ignoring unreadable checkpoint {}: {}".format(self._filename, type(e).__name__))
+
+    def __len__(self) -> int:
+        return len(self._clubs)
+
+    def is_done(self, club: str, digest: str) -> bool:
+        return self._clubs.get(club) == digest
+
+    def mark_done(self, club: str, digest: str) -> None:
+        """Record a completed club, the file is rewritten right away so it survives an interruption"""
+        self._clubs[club] = digest
+        temp_file = self._filename + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"clubs": self._clubs}, checkpoint_file)
+        os.replace(temp_file, self._filename)
+
+    def clear(self) -> None:
+        self._clubs = {}
+        try:
+            os.remove(self._filename)
+        except FileNotFoundError:
+            pass
+
+
+def club_digest(club_data: pd.DataFrame, *context: str) -> str:
+    """A single hash of everything a club's documents are generated from"""
+    return hashlib.sha256("".join(content_hashes(club_data, *context)).encode()).hexdigest()
+
+
+def club_directory(directory: str, club: str) -> str:
+    return os.path.abspath(os.path.join(directory, club))
+
+
+def _generate_club(
+    report: str, config: AnalyzerConfig, directory: str, club: str, club_full: str, club_data: Any, reportdate: str
+) -> int:
+    """Worker process entry point - produce one club's documents, returns the number of officials listed"""
+    spec = BATCH_REPORTS[report]
+    config = copy.deepcopy(config)  # The directory is changed for this club only
+    config.set_str(spec.directory_key, directory)
+    os.makedirs(directory, exist_ok=True)
+
+    master = Document()
+    generator = spec.generator(club, club_data, config)
+    club_csv = generator.dump_data_docx(club_full, reportdate, master)
+    pd.DataFrame(club_csv, columns=EMAIL_LIST_COLUMNS).to_csv(
+        os.path.join(directory, os.path.basename(config.get_str("email_list_csv"))), index=False
+    )
+    master.save(os.path.join(directory, os.path.basename(config.get_str(spec.report_file_key))))
+    if generator.failures:
+        # The club is not marked as done so the next run tries these officials again
+        first = generator.failures[0]
+        raise RuntimeError(
+            f"{len(generator.failures)} document(s) not produced, first {first.description}: {first.error}"
+        )
+    return len(club_csv)
+
+
+def run_batch(
+    report: str,
+    rtr_data: pd.DataFrame,
+    club_list_names: list,
+    config: AnalyzerConfig,
+    reportdate: str,
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+) -> list:
+    """Generate the documents for every club in club_list_names, returns a SaveFailure per failed club.
+
+    The email lists of all the clubs (including those completed by an earlier, interrupted run) are
+    combined into one in the report directory.
+    """
+    spec = BATCH_REPORTS[report]
+    directory = config.get_str(spec.directory_key)
+    checkpoint = BatchCheckpoint(directory, report)
+
+    clubs = []  # Clubs with officials to report on
+    pending = []
+    for club, club_full in club_list_names:
+        club_data = odp_report.select_club_officials(rtr_data, club, config)
+        if club_data.empty:
+            continue
+        clubs.append(club)
+        digest = club_digest(club_data, report, str(spec.template_version), club, club_full)
+        if not checkpoint.is_done(club, digest):
+            pending.append((club, club_full, club_data, digest))
+    if len(checkpoint):
+        logging.info(f"Resuming batch, {len(clubs) - len(pending)} club(s) already complete")
+
+    failures = []
+    total = len(pending)
+    done = 0
+
+    def completed(club: str, club_full: str, digest: str, result: Any) -> None:
+        nonlocal done
+        done += 1
+        if isinstance(result, Exception):
+            logging.info("Unable to generate documents for {}: {}".format(club_full, type(result).__name__))
+            logging.info("Exception message: {}".format(result))
+            failures.append(SaveFailure(club_full, f"{type(result).__name__} - {result}"))
+        else:
+            checkpoint.mark_done(club, digest)
+            logging.info(f"Completed {club_full}, {result} official(s) ({done}/{total})")
+        if progress is not None:
+            progress(done, total)
+
+    workers = worker_count(workers, total, min_jobs=2)
+    if workers <= 1:
+        for club, club_full, club_data, digest in pending:
+            try:
+                result = _generate_club(
+                    report, config, club_directory(directory, club), club, club_full, club_data, reportdate
+                )
+            except Exception as e:
+                result = e
+            completed(club, club_full, digest, result)
+    else:
+        # spawn (rather than fork) as the workers are started from a thread of the UI
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(
+                    _generate_club,
+                    report,
+                    config,
+                    club_directory(directory, club),
+                    club,
+                    club_full,
+                    club_data,
+                    reportdate,
+                ): (club, club_full, digest)
+                for club, club_full, club_data, digest in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                completed(*futures[future], result)
+
+    # Combine the clubs' email lists, in club order
+    email_list_csv = os.path.basename(config.get_str("email_list_csv"))
+    try:
+        email_lists = []
+        for club in clubs:
+            club_csv = os.path.join(club_directory(directory, club), email_list_csv)
+            if os.path.exists(club_csv):
+                email_lists.append(pd.read_csv(club_csv, dtype=str, keep_default_na=False))
+        if email_lists:
+            pd.concat(email_lists).to_csv(os.path.join(directory, email_list_csv), index=False)
+    except Exception as e:
+        logging.info("Unable to save email list: {}".format(type(e).__name__))
+        logging.info("Exception message: {}".format(e))
+        failures.append(SaveFailure(email_list_csv, f"{type(e).__name__} - {e}"))
+
+    if not failures:
+        checkpoint.clear()
+    return failures
+
+
+class Generate_Batch(Task):
+    """Run a batch on a background thread, failures holds the clubs that could not be generated"""
+
+    def __init__(self, report: str, rtr_data: pd.DataFrame, club_list_names: list, config: AnalyzerConfig):
+        super().__init__()
+        self._report = report
+        self._df = rtr_data
+        self._club_list_names = club_list_names
+        self._config = config
+        self.failures: list = []
+
+    def run_task(self):
+        logging.info("Batch Reporting in Progress...")
+        self.stage("Generating clubs")
+        report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
+        try:
+            self.failures = run_batch(
+                self._report,
+                self._df,
+                self._club_list_names,
+                self._config,
+                report_time,
+                self._config.get_int("render_workers"),
+                self.progress,
+            )
+        except Exception as e:
+            logging.info("Batch failed: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            self.failures = [SaveFailure("Batch", f"{type(e).__name__} - {e}")]
+        logging.info("Batch Reporting Complete")
@@ -21,9 +21,15 @@
 
 """Analyze SWON data and generate a club compliance report"""
 
+import time
 
+_STARTED = time.perf_counter()  # Before the other imports so they are included in the startup timing
+
+import logging
 import os
 import sys
+from multiprocessing import freeze_support
+
 import sentry_sdk
 from sentry_sdk.integrations.socket import SocketIntegration
 from sentry_sdk.integrations.threading import ThreadingIntegration
@@ -68,9 +74,28 @@ def initialize_sentry(settings: AnalyzerConfig) -> None:
     )
 
 
+class StartupTimer:
+    """Time the stages of starting the application, logged once the window is up"""
+
+    def __init__(self, started: float):
+        self._started = started
+        self._stages: list = []
+
+    def mark(self, stage: str) -> None:
+        """Record the end of a stage"""
+        self._stages.append((stage, time.perf_counter() - self._started))
+
+    def log(self) -> None:
+        stages = ", ".join(f"{stage} {elapsed:.2f}s" for stage, elapsed in self._stages)
+        logging.info(f"Startup timing ({ANALYZER_VERSION}): {stages}")
+
+
 def main():
     """Runs the Offiicals Utilities"""
 
+    timer = StartupTimer(_STARTED)
+    timer.mark("imports")
+
     bundle_dir = getattr(sys, "_MEIPASS", os.path.abspath(os.path.dirname(__file__)))
 
     root = ctk.CTk()
@@ -78,6 +103,7 @@ def main():
     rtr_data = RTR(config)
 
     initialize_sentry(config)
+    timer.mark("settings")
 
     ctk.set_appearance_mode(config.get_str("Theme"))  # Modes: "System" (standard), "Dark", "Light"
     ctk.set_default_color_theme(config.get_str("Colour"))  # Themes: "blue" (standard), "green", "dark-blue"
@@ -92,9 +118,11 @@ def main():
 
     content = ui.SwonApp(root, config, rtr_data)
     content.grid(column=0, row=0, sticky="news")
+    timer.mark("main screen")
 
     try:
         root.update()
+        timer.mark("window shown")
         import pyi_splash  # type: ignore
 
         if pyi_splash.is_alive():
@@ -109,10 +137,12 @@ def main():
     #    ctk.set_widget_scaling(new_scaling_float)
     #    ctk.set_window_scaling(new_scaling_float)
 
+    timer.log()  # The log handlers are set up by the main screen
     root.mainloop()
 
     config.save()
 
 
 if __name__ == "__main__":
+    freeze_support()  # Document rendering workers in the frozen executable
     main()
@@ -0,0 +1,379 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Performance benchmarks
+
+Times the slow parts of the analyzer on synthetic exports (see rtr_synthetic.py) of several sizes:
+
+    python club_analyze_bench.py --sizes 1000,10000 --save baseline.json
+    python club_analyze_bench.py --sizes 1000,10000 --compare baseline.json --threshold 0.2
+
+Each benchmark is run --repeat times and the fastest run is kept. With --compare the results are
+checked against a saved run and the exit status is 1 if anything is more than --threshold (a
+fraction) slower, so a change can be checked for slowdowns before it is merged. --results compares a
+saved run instead of running the benchmarks again. The reports and the per-club benchmarks only cover
+a fixed sample of the clubs so the larger sizes finish in a reasonable time.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+import rtr_synthetic
+from batch_docs import run_batch
+from club_analyze_cli import EXIT_FAILED, EXIT_OK
+from club_summary import club_summary
+from config import AnalyzerConfig
+from officials_index import BROWSE_POSITIONS, SORT_KEYS, OfficialsIndex
+from rtr_loader import Data_Loader, RTR_Data, status_values
+from sanction_report import club_report_data, generate_club_reports
+
+RESULTS_VERSION = 1
+
+# Slowdowns smaller than this (in seconds) are timer noise rather than regressions
+MIN_DIFFERENCE = 0.01
+
+# Settings the benchmarks run with, on top of the defaults (the saved settings are not used)
+_SETTINGS = {
+    "incremental_docs": "False",
+    "bundle_docs": "False",
+    "render_workers": "1",
+    "report_format": "docx",
+    "gen_word": "True",
+    "gen_1_per_club": "True",
+}
+
+
+class Dataset:
+    """A synthetic export of one size, in both formats, and the data loaded from it"""
+
+    def __init__(self, directory: str, officials: int, clubs: int, seed: int, sample: int):
+        self.directory = directory
+        self.officials = officials
+        self.clubs = clubs
+        self.config = AnalyzerConfig()
+        for name, value in dict(AnalyzerConfig.defaults(), **_SETTINGS).items():
+            self.config.set_str(name, value)
+
+        export = rtr_synthetic.generate_rtr(officials, clubs, seed)
+        self.csv_file = os.path.join(directory, "rtr.csv")
+        self.html_file = os.path.join(directory, "rtr.xls")
+        rtr_synthetic.write_csv(export, self.csv_file)
+        rtr_synthetic.write_html(export, self.html_file)
+
+        self.rtr_data = load(self.config, self.csv_file)
+        self.rtr = RTR_Data(self.config)
+        self.rtr.load_rtr_data(self.rtr_data)
+
+        # Evenly spread through the club list, the same clubs every run
+        step = max(1, len(self.rtr.club_list_names) // sample)
+        self.sample = self.rtr.club_list_names[::step][:sample]
+
+    def output_directory(self, name: str) -> str:
+        """An empty directory for the files of a benchmark"""
+        directory = os.path.join(self.directory, name)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        return directory
+
+
+def load(config: AnalyzerConfig, filename: str) -> pd.DataFrame:
+    config = copy.deepcopy(config)
+    config.set_str("officials_list", filename)
+    loader = Data_Loader(config)
+    loader.run()
+    if loader.failure_reason:
+        raise RuntimeError(f"Unable to load {filename}: {loader.failure_reason}")
+    return loader.rtr_data
+
+
+def _timed(function: Callable, *args) -> float:
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def bench_load_csv(data: Dataset) -> float:
+    return _timed(load, data.config, data.csv_file)
+
+
+def bench_load_html(data: Dataset) -> float:
+    return _timed(load, data.config, data.html_file)
+
+
+def bench_merge(data: Dataset) -> float:
+    """Two overlapping exports loaded one after the other"""
+    half = len(data.rtr_data) // 2
+    first = data.rtr_data.iloc[: half + half // 10]
+    second = data.rtr_data.iloc[half:]
+    rtr = RTR_Data(data.config)
+
+    def merge():
+        rtr.load_rtr_data(first)
+        rtr.load_rtr_data(second)
+
+    return _timed(merge)
+
+
+def bench_stats(data: Dataset) -> float:
+    def stats():
+        data.rtr.calculate_stats()
+        data.rtr.statistics()
+
+    return _timed(stats)
+
+
+def bench_club_summary(data: Dataset) -> float:
+    def summaries():
+        for club, _ in data.sample:
+            club_data, _ = club_report_data(data.rtr, club, data.config)
+            club_summary(club, club_data, data.config)
+
+    return _timed(summaries)
+
+
+def bench_sanction_docx(data: Dataset) -> float:
+    config = copy.deepcopy(data.config)
+    config.set_str("report_directory", data.output_directory("sanction"))
+    rtr = copy.copy(data.rtr)
+    rtr.club_list_names = data.sample
+    started = time.perf_counter()
+    failures = generate_club_reports(rtr, config)
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise RuntimeError(f"{failures[0].description}: {failures[0].error}")
+    return elapsed
+
+
+def _bench_documents(data: Dataset, report: str, directory_key: str) -> float:
+    config = copy.deepcopy(data.config)
+    config.set_str(directory_key, data.output_directory(report))
+    started = time.perf_counter()
+    failures = run_batch(report, data.rtr.rtr_data, data.sample, config, "Benchmark", 1)
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise RuntimeError(f"{failures[0].description}: {failures[0].error}")
+    return elapsed
+
+
+def bench_odp_docs(data: Dataset) -> float:
+    return _bench_documents(data, "odp", "odp_report_directory")
+
+
+def bench_pathway_docs(data: Dataset) -> float:
+    return _bench_documents(data, "pathway", "np_report_directory")
+
+
+def bench_browse_filter(data: Dataset) -> float:
+    """What the data browser does for every club and position, starting from a new index"""
+    statuses = status_values(data.config)
+
+    def browse():
+        index = OfficialsIndex(data.rtr.rtr_data.reset_index(drop=True), data.rtr.version)
+        for _, club_full in data.sample:
+            for _, position in BROWSE_POSITIONS:
+                for certs in [["Q", "C"], ["Q"], ["C"]]:
+                    matches = index.lookup(club_full, position, certs, statuses)
+                    for key in SORT_KEYS:
+                        index.grid_columns(position, index.sort(matches, key, position))
+
+    return _timed(browse)
+
+
+class Benchmark(NamedTuple):
+    function: Callable[[Dataset], float]
+    description: str
+
+
+BENCHMARKS = {
+    "load_csv": Benchmark(bench_load_csv, "load a CSV export"),
+    "load_html": Benchmark(bench_load_html, "load an HTML export"),
+    "merge": Benchmark(bench_merge, "merge two loaded exports"),
+    "stats": Benchmark(bench_stats, "summary statistics"),
+    "club_summary": Benchmark(bench_club_summary, "sanctioning analysis of the sampled clubs"),
+    "sanction_docx": Benchmark(bench_sanction_docx, "sanctioning reports of the sampled clubs"),
+    "odp_docs": Benchmark(bench_odp_docs, "recommendation documents of the sampled clubs"),
+    "pathway_docs": Benchmark(bench_pathway_docs, "pathway documents of the sampled clubs"),
+    "browse_filter": Benchmark(bench_browse_filter, "data browser filtering of the sampled clubs"),
+}
+
+
+def run_benchmarks(sizes: list, names: list, repeat: int, officials_per_club: int, sample: int, seed: int) -> dict:
+    """Time the benchmarks at each size, the results are keyed by name/size"""
+    results = {}
+    for size in sizes:
+        clubs = max(1, size // officials_per_club)
+        with tempfile.TemporaryDirectory(prefix="swon-bench-") as directory:
+            logging.warning(f"Preparing {size} officials of {clubs} clubs")
+            data = Dataset(directory, size, clubs, seed, sample)
+            for name in names:
+                times = [BENCHMARKS[name].function(data) for _ in range(repeat)]
+                results[f"{name}/{size}"] = {
+                    "seconds": min(times),
+                    "median": statistics.median(times),
+                    "repeat": repeat,
+                    "officials": size,
+                    "clubs": clubs,
+                    "sampled_clubs": len(data.sample),
+                }
+                logging.warning(f"{name}/{size}: {min(times):.3f}s")
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+        },
+        "seed": seed,
+        "results": results,
+    }
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def regressed(self, threshold: float) -> bool:
+        return self.ratio > 1 + threshold and self.current - self.baseline > MIN_DIFFERENCE
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """A Comparison for every benchmark in both runs"""
+    current = results["results"]
+    previous = baseline["results"]
+    return [
+        Comparison(name, previous[name]["seconds"], current[name]["seconds"]) for name in current if name in previous
+    ]
+
+
+def print_comparison(comparisons: list, threshold: float) -> int:
+    """Print the comparisons, returns the number of regressions"""
+    regressions = 0
+    print(f"{'benchmark':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for comparison in comparisons:
+        flag = ""
+        if comparison.regressed(threshold):
+            regressions += 1
+            flag = "  SLOWER"
+        print(
+            f"{comparison.name:<28}{comparison.baseline:>11.3f}s{comparison.current:>11.3f}s"
+            f"{comparison.ratio - 1:>+10.1%}{flag}"
+        )
+    print(f"{regressions} regression(s) over {threshold:.0%}")
+    return regressions
+
+
+def _sizes(value: str) -> list:
+    try:
+        sizes = [int(size) for size in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected sizes such as 1000,10000, not {value}")
+    if any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError("sizes must be at least 1")
+    return sizes
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Swim Ontario Club Analyzer - performance benchmarks",
+        epilog="benchmarks: " + "; ".join(f"{name} - {bench.description}" for name, bench in BENCHMARKS.items()),
+    )
+    parser.add_argument(
+        "--sizes", type=_sizes, default=[1000, 10000], help="officials in each export (default 1000,10000)"
+    )
+    parser.add_argument(
+        "--only", action="append", choices=list(BENCHMARKS), metavar="NAME", help="only run this benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=3, metavar="N", help="runs of each benchmark (default 3)")
+    parser.add_argument("--officials-per-club", type=int, default=50, metavar="N", help="(default %(default)s)")
+    parser.add_argument(
+        "--sample", type=int, default=10, metavar="N", help="clubs the reports are run for (default %(default)s)"
+    )
+    parser.add_argument("--seed", type=int, default=rtr_synthetic.SEED, metavar="N", help="(default %(default)s)")
+    parser.add_argument("--save", metavar="FILE", help="save the results as JSON, e.g. as a new baseline")
+    parser.add_argument("--compare", metavar="FILE", help="baseline results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="slowdown, as a fraction of the baseline, that counts as a regression (default %(default)s)",
+    )
+    parser.add_argument("--results", metavar="FILE", help="compare these saved results rather than running")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log everything the analyzer does")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.results and not args.compare:
+        parser.error("--results needs --compare")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(message)s")
+
+    try:
+        baseline = None
+        if args.compare:  # Read first, there is no point running the benchmarks if it is not usable
+            with open(args.compare, "r", encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+        if args.results:
+            with open(args.results, "r", encoding="utf-8") as results_file:
+                results = json.load(results_file)
+        else:
+            names = args.only or list(BENCHMARKS)
+            results = run_benchmarks(args.sizes, names, args.repeat, args.officials_per_club, args.sample, args.seed)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as results_file:
+                json.dump(results, results_file, indent=2)
+    except Exception as e:
+        logging.error(f"{type(e).__name__} - {e}")
+        return EXIT_FAILED
+
+    if baseline is None:
+        for name, result in results["results"].items():
+            print(f"{name:<28}{result['seconds']:>11.3f}s")
+        return EXIT_OK
+    if baseline.get("machine") != results.get("machine"):
+        print("The baseline is from a different machine or library versions, the times may not compare")
+    return EXIT_FAILED if print_comparison(compare(results, baseline), args.threshold) else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Command line Club Analyzer
+
+Loads one or more RTR exports and produces the reports without the UI (Tk is never imported), e.g.
+for scheduled runs:
+
+    python club_analyze_cli.py --rtr export.csv --output reports --render-workers 4 sanction odp
+
+Options start from the saved settings of the application and every setting can be overridden on the
+command line. The recommendation and pathway documents are produced for all clubs (or the --club
+ones) in a folder per club, as the batch run of the application does. --output puts everything in
+one directory with the recommendation and pathway documents in its odp and pathway folders.
+
+The exit status is 0 when everything was produced, 1 if the data could not be loaded or any report
+failed and 2 for usage errors.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from multiprocessing import freeze_support
+
+from batch_docs import BATCH_REPORTS, run_batch
+from config import AnalyzerConfig
+from data_export import export_data
+from np_warnings import dump_warnings, find_warnings
+from pathway_report import PATHWAY_CSV_COLUMNS
+from report_backends import DocxBackend
+from report_writer import SaveFailure
+from rtr_loader import Data_Loader, RTR_Data, status_values
+from sanction_report import generate_club_reports
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+# Settings with no command line option, they only apply to the UI or the commands and --rtr replace them
+_UI_SETTINGS = [
+    "officials_list",
+    "gen_np_csv",
+    "gen_np_warnings",
+    "Theme",
+    "Scaling",
+    "Colour",
+    "client_id",
+    "DefaultMenu",
+    "update_check_url",
+]
+
+# Where --output puts each report, the documents of each report get their own folder as officials'
+# documents are named after the official
+_OUTPUT_DIRECTORIES = {"report_directory": "", "odp_report_directory": "odp", "np_report_directory": "pathway"}
+_OUTPUT_FILES = ["np_report_file_csv", "np_ror_file_docx"]
+
+COMMANDS = {
+    "load": "load the data and print a summary",
+    "sanction": "sanctioning reports (ROR/POA) for every club",
+    "odp": "officials development recommendation documents",
+    "pathway": "new pathway documents",
+    "pathway-csv": "new pathway CSV export of all officials",
+    "pathway-warnings": "new pathway warnings report",
+}
+
+
+def _bool_setting(value: str) -> str:
+    if value.lower() in ["1", "yes", "true", "on"]:
+        return "True"
+    if value.lower() in ["0", "no", "false", "off"]:
+        return "False"
+    raise argparse.ArgumentTypeError(f"expected true or false, not {value}")
+
+
+def _int_setting(value: str) -> str:
+    try:
+        return str(int(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, not {value}")
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add an option for every setting that applies outside of the UI"""
+    settings = parser.add_argument_group("settings", "override the saved settings of the application")
+    for name, default in AnalyzerConfig.defaults().items():
+        if name in _UI_SETTINGS:
+            continue
+        if default.lower() in ["true", "false"]:
+            value_type, metavar = _bool_setting, "{true,false}"
+        elif default.isdigit():
+            value_type, metavar = _int_setting, "N"
+        else:
+            value_type, metavar = str, "VALUE"
+        settings.add_argument(
+            "--" + name.replace("_", "-"), dest=name, type=value_type, metavar=metavar, help=f"(default {default})"
+        )
+
+
+def apply_settings(config: AnalyzerConfig, args: argparse.Namespace) -> None:
+    """Copy the settings given on the command line into config, nothing is saved"""
+    for name in AnalyzerConfig.defaults():
+        value = getattr(args, name, None)
+        if value is not None:
+            config.set_str(name, value)
+
+
+def set_output_directory(config: AnalyzerConfig, output: str) -> None:
+    """Point every report at output"""
+    for name, folder in _OUTPUT_DIRECTORIES.items():
+        directory = os.path.join(output, folder)
+        os.makedirs(directory, exist_ok=True)
+        config.set_str(name, directory)
+    for name in _OUTPUT_FILES:
+        config.set_str(name, os.path.join(output, os.path.basename(config.get_str(name))))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Swim Ontario Club Analyzer - produce the reports from RTR exports without the UI",
+        epilog="commands: " + "; ".join(f"{name} - {text}" for name, text in COMMANDS.items()),
+    )
+    parser.add_argument("commands", nargs="+", choices=list(COMMANDS), metavar="command", help="what to produce")
+    parser.add_argument(
+        "--rtr",
+        action="append",
+        metavar="FILE",
+        help="RTR export to load (CSV or HTML), repeat to merge several. Defaults to the saved officials list",
+    )
+    parser.add_argument("--output", metavar="DIR", help="directory for all of the reports")
+    parser.add_argument("--club", action="append", metavar="CODE", help="only report on this club, can be repeated")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and failures")
+    add_settings_arguments(parser)
+    return parser
+
+
+def load_data(config: AnalyzerConfig, files: list) -> RTR_Data:
+    """Load and merge the RTR exports, the returned data is empty if any of them failed"""
+    rtr = RTR_Data(config)
+    for filename in files:
+        config.set_str("officials_list", filename)
+        loader = Data_Loader(config)
+        loader.run()  # On this thread, there is nothing else to do while it loads
+        if loader.failure_reason or loader.rtr_data.empty:
+            logging.error("%s: %s" % (filename, loader.failure_reason or "No officials loaded"))
+            rtr.reset_data()
+            break
+        rtr.load_rtr_data(loader.rtr_data)
+    return rtr
+
+
+def select_clubs(rtr: RTR_Data, clubs: list) -> list:
+    """The (code, name) of the clubs reported on, unknown codes are logged and dropped"""
+    if not clubs:
+        return rtr.club_list_names
+    known = {code for code, _ in rtr.club_list_names}
+    for code in clubs:
+        if code not in known:
+            logging.error("Club %s is not in the data" % code)
+    return [club for club in rtr.club_list_names if club[0] in clubs]
+
+
+def print_summary(rtr: RTR_Data) -> None:
+    for name, value in rtr.statistics().items():
+        print(f"{name.removeprefix('total_')}: {value}")
+
+
+def run_command(command: str, rtr: RTR_Data, config: AnalyzerConfig, clubs: list, all_clubs: bool) -> list:
+    """Produce the output of a command for clubs, returns a SaveFailure for everything that failed.
+
+    The pathway exports cover every official (including those of clubs with no officials of their own)
+    unless the clubs were picked on the command line.
+    """
+    report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
+
+    if command == "load":
+        print_summary(rtr)
+        return []
+
+    if command == "sanction":
+        rtr.club_list_names = clubs  # The reports are of every club in the list
+        return generate_club_reports(rtr, config)
+
+    if command in BATCH_REPORTS:
+        return run_batch(command, rtr.rtr_data, clubs, config, report_time, config.get_int("render_workers"))
+
+    officials = rtr.rtr_data[rtr.rtr_data["Status"].isin(status_values(config))]
+    if not all_clubs:
+        officials = officials[officials["ClubCode"].isin([code for code, _ in clubs])]
+
+    if command == "pathway-csv":
+        filename = config.get_str("np_report_file_csv")
+        try:
+            export_data(officials, filename, PATHWAY_CSV_COLUMNS)
+        except Exception as e:
+            logging.info("Unable to save CSV file: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            return [SaveFailure(filename, f"{type(e).__name__} - {e}")]
+        return []
+
+    if command == "pathway-warnings":
+        filename = config.get_str("np_ror_file_docx")
+        warnings_table = find_warnings(officials)
+        logging.info(f"{len(warnings_table)} warning(s) for {len(officials)} officials")
+        report = DocxBackend()
+        dump_warnings(report, warnings_table, len(officials), report_time)
+        try:
+            report.save(filename)
+        except Exception as e:
+            logging.info("Unable to save full report: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            return [SaveFailure(filename, f"{type(e).__name__} - {e}")]
+        return []
+
+    raise ValueError(f"Unknown command {command}")
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+
+    config = AnalyzerConfig()
+    apply_settings(config, args)
+    if args.output is not None:
+        set_output_directory(config, args.output)
+
+    rtr = load_data(config, args.rtr or [config.get_str("officials_list")])
+    if rtr.rtr_data.empty:
+        return EXIT_FAILED
+
+    clubs = select_clubs(rtr, args.club or [])
+    status = EXIT_OK
+    if args.club and len(clubs) != len(set(args.club)):
+        status = EXIT_FAILED
+
+    for command in args.commands:
+        logging.info("Running %s" % command)
+        try:
+            failures = run_command(command, rtr, config, clubs, not args.club)
+        except Exception as e:
+            logging.info("Unable to run {}: {}".format(command, type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            failures = [SaveFailure(command, f"{type(e).__name__} - {e}")]
+        for failure in failures:
+            logging.error(f"{command}: {failure.description}: {failure.error}")
+        if failures:
+            status = EXIT_FAILED
+
+    return status
+
+
+if __name__ == "__main__":
+    freeze_support()  # Document rendering workers in the frozen executable
+    sys.exit(main())
@@ -0,0 +1,334 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Memory profiling
+
+Loads RTR exports and builds the sanctioning (ROR) report as the application does, measuring the
+memory used by each step so the steps that run a large export out of memory can be found:
+
+    python club_analyze_memory.py --rtr province.xls --output memory.txt
+
+The stages are sniff, parse, normalize, derive and filter for each export (see Data_Loader), merge,
+affiliates (the affiliations exploded to a row per club), club_summary for every club (or the --club
+ones) and docx build, the ROR document with every club. For each stage the report has
+
+    traced peak      the most memory allocated by Python (tracemalloc) during the stage, above what
+                     was allocated when it started
+    traced retained  what the stage added to the memory still allocated once it finished
+    RSS              the resident memory of the process when the stage started, the most it reached
+                     (sampled every --interval seconds) and when it finished. This includes what
+                     tracemalloc does not see, such as memory freed but not given back to the system.
+
+followed by the lines that allocated most of what the stage retained. tracemalloc slows everything
+down and uses memory of its own (as do the snapshots for --top), --no-trace only samples the RSS.
+The RSS comes from psutil when it is installed and from /proc on Linux otherwise.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Event, Thread
+from typing import Iterator, NamedTuple, Optional
+
+from club_analyze_cli import EXIT_FAILED, EXIT_OK, add_settings_arguments, apply_settings
+from club_summary import club_summary
+from config import AnalyzerConfig
+from report_backends import DocxBackend
+from rtr_loader import Data_Loader, RTR_Data
+from sanction_report import club_report_data
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+MB = 1024 * 1024
+
+# Frames kept for each allocation, enough to get from pandas back to the analyzer
+TRACEBACK_FRAMES = 25
+
+# Smaller allocations are not listed for a stage
+MIN_TOP_SIZE = 64 * 1024
+
+_SOURCE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def rss() -> Optional[int]:
+    """Resident memory of this process in bytes, None if it can not be found"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class StageMemory(NamedTuple):
+    """Memory used by one stage, in bytes. The traced values are 0 without tracemalloc and the RSS
+    values None if the RSS is not available."""
+
+    stage: str
+    seconds: float
+    traced_peak: int
+    traced_retained: int
+    rss_start: Optional[int]
+    rss_peak: Optional[int]
+    rss_end: Optional[int]
+    top: list  # "file:line size" of the lines that allocated most of what was retained
+
+
+class MemoryProfiler:
+    """Measures the memory of each stage run in a stage() block, between start() and stop()"""
+
+    def __init__(self, trace: bool = True, interval: float = 0.01, top: int = 3):
+        self._trace = trace
+        self._interval = interval
+        self._top = top if trace else 0
+        self._rss_peak: Optional[int] = None
+        self._stopped = Event()
+        self._sampler: Optional[Thread] = None
+        self.stages: list = []
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self._interval):
+            value = rss()
+            peak = self._rss_peak
+            if value is not None and peak is not None and value > peak:
+                self._rss_peak = value
+
+    def start(self) -> None:
+        if self._trace:
+            tracemalloc.start(TRACEBACK_FRAMES)
+        self._stopped.clear()
+        self._sampler = Thread(target=self._sample, name="RSS", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._trace:
+            tracemalloc.stop()
+
+    def _snapshot(self) -> Optional[tracemalloc.Snapshot]:
+        if not self._top:
+            return None
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def _top_lines(self, before: tracemalloc.Snapshot) -> list:
+        """The analyzer's lines that allocated the most of what was retained since before"""
+        sizes: dict = {}
+        for stat in self._snapshot().compare_to(before, "traceback"):  # type: ignore
+            # The innermost frame in the analyzer rather than in pandas or python-docx
+            frames = [frame for frame in stat.traceback if os.path.dirname(frame.filename) == _SOURCE_DIRECTORY]
+            frame = frames[-1] if frames else stat.traceback[-1]
+            line = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            sizes[line] = sizes.get(line, 0) + stat.size_diff
+        largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[: self._top]
+        return [f"{line} {size / MB:.1f} MB" for line, size in largest if size >= MIN_TOP_SIZE]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        gc.collect()  # So garbage left by the previous stage is not counted as this one's
+        before = self._snapshot()
+        if self._trace:
+            tracemalloc.reset_peak()
+        traced_start = tracemalloc.get_traced_memory()[0] if self._trace else 0
+        rss_start = self._rss_peak = rss()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            traced_peak = tracemalloc.get_traced_memory()[1] if self._trace else 0
+            gc.collect()
+            traced_end = tracemalloc.get_traced_memory()[0] if self._trace else 0
+            rss_end = rss()
+            rss_peak = max(self._rss_peak, rss_end) if self._rss_peak is not None and rss_end is not None else None
+
+            top = self._top_lines(before) if before is not None else []
+
+            self.stages.append(
+                StageMemory(
+                    name,
+                    seconds,
+                    traced_peak - traced_start,
+                    traced_end - traced_start,
+                    rss_start,
+                    rss_peak,
+                    rss_end,
+                    top,
+                )
+            )
+            logging.warning(f"{name}: {seconds:.1f}s" + (f", RSS {rss_peak / MB:.0f} MB" if rss_peak else ""))
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / MB:.1f}"
+
+
+def report_text(stages: list, trace: bool) -> str:
+    """The stages as a table, sizes in MB"""
+    lines = [
+        f"{'stage':<24}{'seconds':>9}{'traced peak':>13}{'retained':>10}{'RSS start':>11}{'RSS peak':>10}{'RSS end':>9}"
+    ]
+    for stage in stages:
+        traced = (_megabytes(stage.traced_peak), _megabytes(stage.traced_retained)) if trace else ("-", "-")
+        lines.append(
+            f"{stage.stage:<24}{stage.seconds:>9.2f}{traced[0]:>13}{traced[1]:>10}"
+            f"{_megabytes(stage.rss_start):>11}{_megabytes(stage.rss_peak):>10}{_megabytes(stage.rss_end):>9}"
+        )
+        lines.extend(f"    {line}" for line in stage.top)
+    peaks = [stage.rss_peak for stage in stages if stage.rss_peak is not None]
+    if peaks:
+        worst = max(stages, key=lambda stage: stage.rss_peak or 0)
+        lines.append(f"Highest RSS {_megabytes(worst.rss_peak)} MB during {worst.stage}")
+    else:
+        lines.append("RSS not available, install psutil")
+    return "\n".join(lines)
+
+
+def profile_run(profiler: MemoryProfiler, config: AnalyzerConfig, files: list, clubs: list, report_file: str) -> None:
+    """Load the exports and build the ROR report of clubs (all of them if empty) in stages"""
+    rtr = RTR_Data(config)
+    for filename in files:
+        suffix = f" ({os.path.basename(filename)})" if len(files) > 1 else ""
+        loader_config = copy.deepcopy(config)
+        loader_config.set_str("officials_list", filename)
+        loader = Data_Loader(loader_config)
+        with profiler.stage("sniff" + suffix):
+            loaded = loader.sniff(filename)
+        if loaded:
+            with profiler.stage("parse" + suffix):
+                loaded = loader.parse(filename)
+        if not loaded:
+            raise RuntimeError(f"Unable to load {filename}: {loader.failure_reason}")
+        with profiler.stage("normalize" + suffix):
+            loader.normalize()
+        with profiler.stage("derive" + suffix):
+            loader.derive()
+        with profiler.stage("filter" + suffix):
+            loader.filter()
+        new_data = loader.rtr_data
+        del loader  # Only the loaded data is kept, as in the application
+        with profiler.stage("merge" + suffix):
+            rtr.merge_data(new_data)
+        del new_data
+
+    with profiler.stage("affiliates"):
+        rtr.extract_affiliates()
+
+    selected = [club for club in rtr.club_list_names if not clubs or club[0] in clubs]
+    summaries = []
+    with profiler.stage("club_summary"):
+        for club, club_full in selected:
+            club_data, affiliation_reg_ids = club_report_data(rtr, club, config)
+            summaries.append((club_full, club_summary(club, club_data, config), affiliation_reg_ids))
+
+    report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
+    with profiler.stage("docx build"):
+        master = DocxBackend.master(report_file)
+        for club_full, summary, affiliation_reg_ids in summaries:
+            section = DocxBackend()
+            summary.dump_report(section, club_full, report_time, affiliation_reg_ids)
+            master.add(section)
+        master.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Swim Ontario Club Analyzer - memory used loading and reporting")
+    parser.add_argument(
+        "--rtr",
+        action="append",
+        metavar="FILE",
+        help="RTR export to load, repeat to merge several. Defaults to the saved officials list",
+    )
+    parser.add_argument("--club", action="append", metavar="CODE", help="only report on this club, can be repeated")
+    parser.add_argument("--output", metavar="FILE", help="write the report to FILE, as JSON if it ends in .json")
+    parser.add_argument("--report-file", metavar="FILE", help="keep the ROR document built (default a temporary file)")
+    parser.add_argument("--no-trace", action="store_true", help="only sample the RSS, without tracemalloc")
+    parser.add_argument(
+        "--top", type=int, default=3, metavar="N", help="lines listed for each stage, 0 for none (default %(default)s)"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.01, metavar="SECONDS", help="RSS sampling interval (default %(default)s)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log everything the analyzer does")
+    add_settings_arguments(parser)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(message)s")
+
+    config = AnalyzerConfig()
+    apply_settings(config, args)
+    files = args.rtr or [config.get_str("officials_list")]
+
+    profiler = MemoryProfiler(not args.no_trace, args.interval, args.top)
+    with tempfile.TemporaryDirectory(prefix="swon-memory-") as directory:
+        report_file = args.report_file or os.path.join(directory, "ror.docx")
+        profiler.start()
+        try:
+            profile_run(profiler, config, files, args.club or [], report_file)
+        except Exception as e:
+            logging.error(f"{type(e).__name__} - {e}")
+            return EXIT_FAILED
+        finally:
+            profiler.stop()
+
+    text = report_text(profiler.stages, not args.no_trace)
+    print(text)
+    if args.output:
+        try:
+            with open(args.output, "w", encoding="utf-8") as output:
+                if args.output.lower().endswith(".json"):
+                    json.dump(
+                        {
+                            "created": datetime.now().isoformat(timespec="seconds"),
+                            "files": files,
+                            "tracemalloc": not args.no_trace,
+                            "stages": [stage._asdict() for stage in profiler.stages],
+                        },
+                        output,
+                        indent=2,
+                    )
+                else:
+                    output.write(text + "\n")
+        except Exception as e:
+            logging.error(f"Unable to save {args.output}: {type(e).__name__} - {e}")
+            return EXIT_FAILED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
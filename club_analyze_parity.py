@@ -0,0 +1,435 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Output parity checks
+
+Runs the current implementation of part of the analyzer and a candidate replacement (e.g. a faster
+rewrite) side by side and reports every difference in what they produce:
+
+    python club_analyze_parity.py --loader fast_loader:Data_Loader
+    python club_analyze_parity.py --rtr anonymized.csv --summary fast_summary:club_summary
+
+Candidates are given as module:name and are used in place of
+
+    --loader            rtr_loader.Data_Loader, the loaded data is compared column by column
+    --summary           club_summary.club_summary, as_dict() (Sanction_Level, Failed_Sanctions, the
+                        counts and errors) and the text of the club's sanctioning report are compared
+    --odp-renderer      odp_report.render_official, the text of each official's document is compared
+    --pathway-renderer  pathway_report.render_official
+
+Each check feeds the candidate what the current code produces for the steps before it, so a
+difference shows up where it is introduced. Without a candidate the current code is compared with
+itself, which checks the checks.
+
+The data is synthetic exports (--sizes and --seeds, loaded from both the CSV and the HTML format)
+and any --rtr exports. A real export can be made safe to keep as test data with --anonymize, which
+writes a copy with the names, emails and ids replaced and only the columns the analyzer uses.
+
+The exit status is 0 when the outputs match, 1 if anything differs or failed and 2 for usage errors.
+"""
+
+import argparse
+import copy
+import difflib
+import importlib
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Callable, NamedTuple
+
+import chardet
+import numpy as np
+import pandas as pd
+
+import odp_report
+import pathway_report
+import rtr_synthetic
+from batch_docs import BATCH_REPORTS
+from club_analyze_cli import EXIT_FAILED, EXIT_OK
+from club_summary import club_summary
+from config import AnalyzerConfig
+from docx_utils import document_text
+from report_backends import DocxBackend
+from rtr_fields import REQUIRED_RTR_FIELDS
+from rtr_loader import Data_Loader, RTR_Data
+from sanction_report import club_report_data
+
+# Values shown for each difference found in a column or report
+MAX_EXAMPLES = 5
+
+# A fixed report date so it does not differ between the two runs
+REPORT_DATE = "January 01 2024 12:00AM"
+
+
+class Difference(NamedTuple):
+    check: str  # loader, summary, odp or pathway
+    dataset: str
+    item: str  # Column, club or official
+    detail: str
+
+
+def candidate(spec: str) -> Callable:
+    """The object named by module:name"""
+    module, _, name = spec.partition(":")
+    if not module or not name:
+        raise argparse.ArgumentTypeError(f"expected module:name, not {spec}")
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError) as e:
+        raise argparse.ArgumentTypeError(f"{spec}: {type(e).__name__} - {e}")
+
+
+def read_export(filename: str) -> pd.DataFrame:
+    """An export as it is in the file, every value as text"""
+    with open(filename, "r", errors="replace") as f:
+        first_line = f.readline()
+    if "Registration Id" in first_line:
+        with open(filename, "rb") as f:
+            encoding = chardet.detect(f.read(1000000))["encoding"]
+        return pd.read_csv(filename, dtype=str, keep_default_na=False, encoding=encoding)
+    export = pd.read_html(filename, keep_default_na=False)[0].astype(str)
+    export.columns = export.iloc[0]  # The first row is the column names
+    return export[1:].reset_index(drop=True)
+
+
+def anonymize(export: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """The export with only the columns the analyzer uses and made up names, emails and ids.
+
+    The same official gets the same replacement everywhere so merged and duplicated records still
+    line up, the clubs and the certification records are kept as they are.
+    """
+    missing = [field for field in REQUIRED_RTR_FIELDS if field not in export.columns]
+    if missing:
+        raise ValueError("Missing Fields - " + ", ".join(missing))
+    export = export[REQUIRED_RTR_FIELDS].copy()
+    rng = np.random.default_rng(seed)
+
+    registration_ids = [value for value in export["Registration Id"].unique() if value != ""]
+    new_ids = rng.choice(9000000, len(registration_ids), replace=False) + 1000000
+    officials = {old: number for number, old in enumerate(registration_ids)}
+    number = export["Registration Id"].map(officials)
+    present = number.notna()
+    number = number[present].astype(int)
+
+    first_names = rng.choice(rtr_synthetic._FIRST_NAMES, len(registration_ids))
+    last_names = rng.choice(rtr_synthetic._LAST_NAMES, len(registration_ids))
+    export.loc[present, "Registration Id"] = new_ids[number].astype(str)
+    export.loc[present, "First Name"] = first_names[number]
+    export.loc[present, "Last Name"] = last_names[number]
+    export.loc[present, "Email"] = [f"official{k}@example.com" for k in number]
+    export.loc[present, "id"] = (number + 1).astype(str)
+    return export
+
+
+def _load(loader_class: Callable, config: AnalyzerConfig, filename: str) -> pd.DataFrame:
+    config = copy.deepcopy(config)
+    config.set_str("officials_list", filename)
+    loader = loader_class(config)
+    loader.run()
+    if loader.failure_reason:
+        raise RuntimeError(f"Unable to load {filename}: {loader.failure_reason}")
+    return loader.rtr_data
+
+
+def _examples(values: list) -> str:
+    shown = ", ".join(values[:MAX_EXAMPLES])
+    return shown + (f" and {len(values) - MAX_EXAMPLES} more" if len(values) > MAX_EXAMPLES else "")
+
+
+def compare_data(reference: pd.DataFrame, candidate: pd.DataFrame) -> list:
+    """(column, detail) for every column of the loaded data that differs, rows are matched by position"""
+    differences = []
+    missing = [column for column in reference.columns if column not in candidate.columns]
+    extra = [column for column in candidate.columns if column not in reference.columns]
+    if missing:
+        differences.append(("(columns)", "missing " + _examples(missing)))
+    if extra:
+        differences.append(("(columns)", "extra " + _examples(extra)))
+    if not missing and not extra and list(reference.columns) != list(candidate.columns):
+        differences.append(("(columns)", "in a different order"))
+    if len(reference) != len(candidate):
+        differences.append(("(rows)", f"{len(reference)} officials, the candidate has {len(candidate)}"))
+        return differences
+    if not reference.index.equals(candidate.index):
+        differences.append(("(rows)", "the index differs"))
+
+    officials = reference["Registration Id"].astype(str).to_numpy()
+    for column in reference.columns:
+        if column not in candidate.columns:
+            continue
+        expected = reference[column].to_numpy(dtype=object)
+        actual = candidate[column].to_numpy(dtype=object)
+        both_empty = pd.isna(expected) & pd.isna(actual)
+        rows = np.flatnonzero(~(both_empty | (expected == actual)))
+        if reference[column].dtype != candidate[column].dtype:
+            differences.append(
+                (column, f"type {reference[column].dtype}, the candidate's is {candidate[column].dtype}")
+            )
+        if len(rows):
+            values = [f"{officials[row]}: {expected[row]!r} != {actual[row]!r}" for row in rows]
+            differences.append((column, f"{len(rows)} official(s) differ - " + _examples(values)))
+    return differences
+
+
+def compare_values(reference: Any, candidate: Any, path: str = "") -> list:
+    """(path, detail) for every difference between two JSON like values"""
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        differences = []
+        for key in list(reference) + [key for key in candidate if key not in reference]:
+            if key not in candidate or key not in reference:
+                differences.append((f"{path}{key}", "only in the " + ("current" if key in reference else "candidate")))
+            else:
+                differences.extend(compare_values(reference[key], candidate[key], f"{path}{key}."))
+        return differences
+    if reference != candidate:
+        return [(path.rstrip("."), f"{reference!r} != {candidate!r}")]
+    return []
+
+
+def compare_text(reference: list, candidate: list) -> str:
+    """The first lines of a diff of two documents' text, empty if they are the same"""
+    if reference == candidate:
+        return ""
+    diff = [line for line in difflib.unified_diff(reference, candidate, "current", "candidate", lineterm="", n=0)]
+    return "\n".join(diff[2 : 2 + 4 * MAX_EXAMPLES])
+
+
+class Dataset(NamedTuple):
+    name: str
+    files: list  # The same export in each of the formats
+    rtr: RTR_Data  # Loaded by the current code
+
+
+class ParityRun:
+    """The checks of one run, differences holds everything found"""
+
+    def __init__(self, config: AnalyzerConfig, loader: Callable, summary: Callable, renderers: dict, sample: int):
+        self._config = config
+        self._loader = loader
+        self._summary = summary
+        self._renderers = renderers  # odp/pathway -> candidate render_official
+        self._sample = sample
+        self.differences: list = []
+        self.checked: dict = {"loader": 0, "summary": 0, "odp": 0, "pathway": 0}
+
+    def _found(self, check: str, dataset: str, item: str, detail: str) -> None:
+        self.differences.append(Difference(check, dataset, item, detail))
+
+    def check_loader(self, dataset: Dataset) -> None:
+        for filename in dataset.files:
+            name = f"{dataset.name} ({os.path.splitext(filename)[1]})"
+            reference = _load(Data_Loader, self._config, filename)
+            try:
+                data = _load(self._loader, self._config, filename)
+            except Exception as e:
+                self._found("loader", name, "(load)", f"{type(e).__name__} - {e}")
+                continue
+            self.checked["loader"] += 1
+            for column, detail in compare_data(reference, data):
+                self._found("loader", name, column, detail)
+
+    def _clubs(self, rtr: RTR_Data, sample: int) -> list:
+        if sample <= 0 or sample >= len(rtr.club_list_names):
+            return rtr.club_list_names
+        step = len(rtr.club_list_names) // sample
+        return rtr.club_list_names[::step][:sample]
+
+    def check_summary(self, dataset: Dataset) -> None:
+        for club, club_full in self._clubs(dataset.rtr, 0):
+            club_data, affiliation_reg_ids = club_report_data(dataset.rtr, club, self._config)
+            reference = club_summary(club, club_data, self._config)
+            try:
+                summary = self._summary(club, club_data, self._config)
+                results = summary.as_dict()
+                report = DocxBackend()
+                summary.dump_report(report, club_full, REPORT_DATE, affiliation_reg_ids)
+            except Exception as e:
+                self._found("summary", dataset.name, club, f"{type(e).__name__} - {e}")
+                continue
+            self.checked["summary"] += 1
+            for key, detail in compare_values(reference.as_dict(), results):
+                self._found("summary", dataset.name, f"{club} {key}", detail)
+
+            reference_report = DocxBackend()
+            reference.dump_report(reference_report, club_full, REPORT_DATE, affiliation_reg_ids)
+            diff = compare_text(document_text(reference_report.doc), document_text(report.doc))
+            if diff:
+                self._found("summary", dataset.name, f"{club} report", diff)
+
+    def check_documents(self, dataset: Dataset, report: str) -> None:
+        reference_render = {"odp": odp_report.render_official, "pathway": pathway_report.render_official}[report]
+        render = self._renderers.get(report, reference_render)
+        for club, club_full in self._clubs(dataset.rtr, self._sample):
+            club_data = odp_report.select_club_officials(dataset.rtr.rtr_data, club, self._config)
+            generator = BATCH_REPORTS[report].generator(club, club_data, self._config)
+            for _, entry in generator.officials().iterrows():
+                official = f"{club} {entry['Registration Id']}"
+                expected = document_text(reference_render(entry, club, club_full, REPORT_DATE))
+                try:
+                    actual = document_text(render(entry, club, club_full, REPORT_DATE))
+                except Exception as e:
+                    self._found(report, dataset.name, official, f"{type(e).__name__} - {e}")
+                    continue
+                self.checked[report] += 1
+                diff = compare_text(expected, actual)
+                if diff:
+                    self._found(report, dataset.name, official, diff)
+
+
+def datasets(config: AnalyzerConfig, directory: str, sizes: list, seeds: list, files: list) -> list:
+    """The synthetic exports (written to directory in both formats) and the given exports"""
+    found = []
+    for size in sizes:
+        for seed in seeds:
+            export = rtr_synthetic.generate_rtr(size, max(1, size // 50), seed, blank_rows=2)
+            csv_file = os.path.join(directory, f"rtr-{size}-{seed}.csv")
+            html_file = os.path.join(directory, f"rtr-{size}-{seed}.xls")
+            rtr_synthetic.write_csv(export, csv_file)
+            rtr_synthetic.write_html(export, html_file)
+            found.append((f"synthetic {size} seed {seed}", [csv_file, html_file]))
+    found.extend((os.path.basename(filename), [filename]) for filename in files)
+
+    loaded = []
+    for name, dataset_files in found:
+        rtr = RTR_Data(config)
+        rtr.load_rtr_data(_load(Data_Loader, config, dataset_files[0]))
+        loaded.append(Dataset(name, dataset_files, rtr))
+    return loaded
+
+
+def print_differences(differences: list) -> None:
+    for difference in differences:
+        lines = difference.detail.splitlines() or [""]
+        print(f"{difference.check}: {difference.dataset}: {difference.item}: {lines[0]}")
+        for line in lines[1:]:
+            print(f"    {line}")
+
+
+def _numbers(value: str) -> list:
+    try:
+        return [int(number) for number in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected numbers such as 500,2000, not {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Swim Ontario Club Analyzer - output parity checks")
+    parser.add_argument("--loader", type=candidate, metavar="MODULE:NAME", help="candidate Data_Loader")
+    parser.add_argument("--summary", type=candidate, metavar="MODULE:NAME", help="candidate club_summary")
+    parser.add_argument("--odp-renderer", type=candidate, metavar="MODULE:NAME", help="candidate ODP render_official")
+    parser.add_argument(
+        "--pathway-renderer", type=candidate, metavar="MODULE:NAME", help="candidate pathway render_official"
+    )
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=["loader", "summary", "odp", "pathway"],
+        help="only run this check (default all of them)",
+    )
+    parser.add_argument("--rtr", action="append", default=[], metavar="FILE", help="export to check with")
+    parser.add_argument(
+        "--sizes", type=_numbers, default=[500], help="officials in the synthetic exports (default 500)"
+    )
+    parser.add_argument(
+        "--seeds", type=_numbers, default=[1, 2, 3], help="seeds of the synthetic exports (default 1,2,3)"
+    )
+    parser.add_argument("--no-synthetic", action="store_true", help="only check the --rtr exports")
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=3,
+        metavar="N",
+        help="clubs whose documents are compared in each export, 0 for all (default %(default)s)",
+    )
+    parser.add_argument(
+        "--anonymize",
+        nargs=2,
+        metavar=("EXPORT", "OUTPUT"),
+        help="write an anonymized copy of EXPORT (CSV if OUTPUT ends in .csv, otherwise HTML) and stop",
+    )
+    parser.add_argument("--seed", type=int, default=rtr_synthetic.SEED, help="seed of --anonymize")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log everything the analyzer does")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(message)s")
+
+    if args.anonymize:
+        source, output = args.anonymize
+        try:
+            export = anonymize(read_export(source), args.seed)
+            if output.lower().endswith(".csv"):
+                rtr_synthetic.write_csv(export, output)
+            else:
+                rtr_synthetic.write_html(export, output)
+        except Exception as e:
+            logging.error(f"Unable to anonymize {source}: {type(e).__name__} - {e}")
+            return EXIT_FAILED
+        print(f"{len(export)} rows written to {output}")
+        return EXIT_OK
+
+    config = AnalyzerConfig()
+    for name, value in AnalyzerConfig.defaults().items():
+        config.set_str(name, value)  # Not the saved settings, so a run can be repeated anywhere
+
+    renderers = {"odp": args.odp_renderer, "pathway": args.pathway_renderer}
+    run = ParityRun(
+        config,
+        args.loader or Data_Loader,
+        args.summary or club_summary,
+        {report: render for report, render in renderers.items() if render is not None},
+        args.sample,
+    )
+    checks = args.check or ["loader", "summary", "odp", "pathway"]
+
+    with tempfile.TemporaryDirectory(prefix="swon-parity-") as directory:
+        try:
+            data = datasets(
+                config,
+                directory,
+                [] if args.no_synthetic else args.sizes,
+                [] if args.no_synthetic else args.seeds,
+                args.rtr,
+            )
+        except Exception as e:
+            logging.error(f"{type(e).__name__} - {e}")
+            return EXIT_FAILED
+        for dataset in data:
+            logging.warning(f"Checking {dataset.name}")
+            if "loader" in checks:
+                run.check_loader(dataset)
+            if "summary" in checks:
+                run.check_summary(dataset)
+            for report in ["odp", "pathway"]:
+                if report in checks:
+                    run.check_documents(dataset, report)
+
+    print_differences(run.differences)
+    checked = ", ".join(f"{count} {check}" for check, count in run.checked.items() if check in checks)
+    print(f"{len(run.differences)} difference(s) - checked {checked}")
+    return EXIT_FAILED if run.differences else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
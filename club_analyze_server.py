@@ -0,0 +1,291 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Sanctioning query service
+
+A small HTTP server that loads an RTR export once and answers sanctioning queries for it, so an
+office sharing one provincial export only pays for loading it once:
+
+    python club_analyze_server.py --rtr export.csv --port 8765
+
+    GET /status                 what is loaded
+    GET /clubs                  [[code, name], ...]
+    GET /clubs/<code>           the club's sanctioning summary (club_summary.as_dict)
+    GET /cohost?club=A&club=B   the summary for clubs hosting together
+
+The staffing search behind a summary can take a while for a large club so every club's summary is
+worked out in the background after loading, and co-host results are kept once computed. The export
+is checked for changes every few seconds and reloaded once it has been completely written, queries
+are answered from the previous data until the new one is ready.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+from club_analyze_cli import add_settings_arguments, apply_settings
+from club_summary import club_summary
+from config import AnalyzerConfig
+from rtr_loader import Data_Loader, RTR_Data
+from sanction_report import club_report_data, cohost_report_data
+
+# Co-host results kept, the least recently used are dropped first
+MAX_COHOST_RESULTS = 256
+
+# Seconds between checks of the export for changes
+POLL_INTERVAL = 5.0
+
+
+class UnknownClub(KeyError):
+    pass
+
+
+class SanctionService:
+    """The loaded export and the sanctioning results worked out from it"""
+
+    def __init__(self, config: AnalyzerConfig, filename: str):
+        self._config = config
+        self.filename = os.path.abspath(filename)
+        self._lock = Lock()  # Held while the data or the results are swapped or updated
+        self.rtr = RTR_Data(config)
+        self._club_results: dict = {}
+        self._cohost_results: OrderedDict = OrderedDict()
+        self._file_stamp: Optional[tuple] = None  # (modification time, size) of the file loaded
+        self.loaded_at = ""
+        self.load_seconds = 0.0
+        self.failure_reason = ""
+
+    def _stamp(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def changed(self, stamp: Optional[tuple]) -> bool:
+        return stamp is not None and stamp != self._file_stamp
+
+    def load(self) -> bool:
+        """Load the export, the data in use is only replaced if it loads"""
+        stamp = self._stamp()
+        started = time.perf_counter()
+        config = copy.deepcopy(self._config)
+        config.set_str("officials_list", self.filename)
+        loader = Data_Loader(config)
+        loader.run()
+        if loader.failure_reason or loader.rtr_data.empty:
+            self.failure_reason = loader.failure_reason or "No officials loaded"
+            logging.error("Unable to load %s: %s" % (self.filename, self.failure_reason))
+            self._file_stamp = stamp  # Not tried again until the file changes
+            return False
+
+        rtr = RTR_Data(self._config)
+        rtr.load_rtr_data(loader.rtr_data)
+        with self._lock:
+            self.rtr = rtr
+            self._club_results = {}
+            self._cohost_results.clear()
+            self._file_stamp = stamp
+            self.loaded_at = datetime.now().isoformat(timespec="seconds")
+            self.load_seconds = time.perf_counter() - started
+            self.failure_reason = ""
+        logging.info(
+            "Loaded %d officials from %s in %.1fs" % (rtr.rtr_data.shape[0], self.filename, self.load_seconds)
+        )
+        return True
+
+    def summary(self, club_codes: list) -> dict:
+        """The sanctioning summary of a club, or of clubs hosting together"""
+        clubs = tuple(sorted(set(club_codes)))
+        with self._lock:
+            rtr = self.rtr
+            if len(clubs) == 1 and clubs in self._club_results:
+                return self._club_results[clubs]
+            if clubs in self._cohost_results:
+                self._cohost_results.move_to_end(clubs)
+                return self._cohost_results[clubs]
+
+        club_names = dict(rtr.club_list_names)
+        unknown = [club for club in clubs if club not in club_names]
+        if not clubs or unknown:
+            raise UnknownClub(", ".join(unknown) or "No clubs given")
+
+        if len(clubs) == 1:
+            club_data, affiliation_reg_ids = club_report_data(rtr, clubs[0], self._config)
+            result = club_summary(clubs[0], club_data, self._config).as_dict()
+        else:
+            club_data, affiliation_reg_ids = cohost_report_data(rtr, list(clubs), self._config)
+            result = club_summary("COHOST", club_data, self._config).as_dict()
+        result["clubs"] = [[club, club_names[club]] for club in clubs]
+        result["affiliates"] = [str(reg_id) for reg_id in affiliation_reg_ids]
+
+        with self._lock:
+            if self.rtr is rtr:  # Not reloaded in the meantime
+                if len(clubs) == 1:
+                    self._club_results[clubs] = result
+                else:
+                    self._cohost_results[clubs] = result
+                    while len(self._cohost_results) > MAX_COHOST_RESULTS:
+                        self._cohost_results.popitem(last=False)
+        return result
+
+    def warm(self) -> None:
+        """Work out the summary of every club, stops if the data is reloaded"""
+        rtr = self.rtr
+        started = time.perf_counter()
+        for club, _ in rtr.club_list_names:
+            if self.rtr is not rtr:
+                return
+            try:
+                self.summary([club])
+            except Exception as e:
+                logging.info("Unable to analyze {}: {}".format(club, type(e).__name__))
+                logging.info("Exception message: {}".format(e))
+        logging.info("%d club summaries ready in %.1fs" % (len(rtr.club_list_names), time.perf_counter() - started))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "file": self.filename,
+                "loaded_at": self.loaded_at,
+                "load_seconds": round(self.load_seconds, 3),
+                "officials": self.rtr.rtr_data.shape[0],
+                "clubs": len(self.rtr.club_list_names),
+                "club_summaries": len(self._club_results),
+                "cohost_summaries": len(self._cohost_results),
+                "failure_reason": self.failure_reason,
+            }
+
+    def watch(self, interval: float, warm: bool) -> None:
+        """Reload the export whenever it changes, runs forever"""
+        last_seen = self._stamp()
+        while True:
+            time.sleep(interval)
+            stamp = self._stamp()
+            # Only once it has stopped changing, the export may still be being written
+            if self.changed(stamp) and stamp == last_seen:
+                logging.info("%s has changed, reloading" % self.filename)
+                if self.load() and warm:
+                    Thread(target=self.warm, name="Warm", daemon=True).start()
+            last_seen = stamp
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "SWON-Analyzer"
+
+    def do_GET(self):
+        service: SanctionService = self.server.service  # type: ignore
+        url = urlparse(self.path)
+        path = [unquote(part) for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        try:
+            if path == ["status"]:
+                self._reply(200, service.status())
+            elif service.rtr.rtr_data.empty:
+                self._reply(503, {"error": "No data loaded", "failure_reason": service.failure_reason})
+            elif path == ["clubs"]:
+                self._reply(200, service.rtr.club_list_names)
+            elif len(path) == 2 and path[0] == "clubs":
+                self._reply(200, service.summary([path[1]]))
+            elif path == ["cohost"]:
+                # ?club=A&club=B or ?club=A,B
+                clubs = [club for value in query.get("club", []) for club in value.split(",") if club]
+                self._reply(200, service.summary(clubs))
+            else:
+                self._reply(404, {"error": "Unknown request"})
+        except UnknownClub as e:
+            self._reply(404, {"error": "Unknown club", "clubs": e.args[0]})
+        except Exception as e:
+            logging.info("Unable to answer {}: {}".format(self.path, type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            self._reply(500, {"error": f"{type(e).__name__} - {e}"})
+
+    def _reply(self, status: int, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.info("%s - %s" % (self.address_string(), format % args))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Swim Ontario Club Analyzer - sanctioning query service")
+    parser.add_argument("--rtr", metavar="FILE", help="RTR export to serve. Defaults to the saved officials list")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default %(default)s)")
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=POLL_INTERVAL,
+        metavar="SECONDS",
+        help="how often the export is checked for changes, 0 to never reload (default %(default)s)",
+    )
+    parser.add_argument("--no-warm", action="store_true", help="only work out club summaries when asked for")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and failures")
+    add_settings_arguments(parser)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+
+    config = AnalyzerConfig()
+    apply_settings(config, args)
+
+    service = SanctionService(config, args.rtr or config.get_str("officials_list"))
+    if not service.load():
+        return 1
+    if not args.no_warm:
+        Thread(target=service.warm, name="Warm", daemon=True).start()
+    if args.poll > 0:
+        Thread(target=service.watch, args=(args.poll, not args.no_warm), name="Watch", daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), _Handler)
+    server.service = service  # type: ignore
+    logging.info("Serving %s on http://%s:%d/" % (service.filename, args.host, server.server_address[1]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
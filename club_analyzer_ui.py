@@ -25,52 +25,70 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import time
 import tkinter as tk
+from collections import deque
+from threading import Lock
 from tkinter import StringVar
 import webbrowser
-from typing import Any
-from platformdirs import user_log_dir
+from typing import Any, Optional
+from platformdirs import user_cache_dir, user_log_dir
 import pathlib
 
 import customtkinter as ctk  # type: ignore
-import pandas as pd
-from requests.exceptions import RequestException
 
-import swon_version
 from config import AnalyzerConfig
-from odp import Generate_Documents_Frame
-from pathway import Pathway_Documents_Frame, Pathway_ROR_Frame
 from rtr import RTR, RTR_Frame
-from rtrbrowse import RTR_Browse_Frame
-from sanction import Sanction_COA_CoHost, Sanction_ROR
+from task_runner import Task, watch_task
 from version import ANALYZER_VERSION, UNLOCK_CODE
 from ui_common import Application_Preferences
 
+# The report screens (and the python-docx and slugify imports behind them) are only
+# loaded the first time they are selected, see SwonApp._create_frame
+
 tkContainer = Any
 
 
 class TextHandler(logging.Handler):
     # This class allows you to log to a Tkinter Text or ScrolledText widget
     # Adapted from Moshe Kaplan: https://gist.github.com/moshekaplan/c425f861de7bbf28ef06
+    #
+    # Records are buffered and added to the widget in batches by a timer on the Tk thread rather than
+    # one callback per record, the widget only keeps the last MAX_LINES lines. If more than MAX_LINES
+    # records arrive between flushes the oldest are dropped (they are still in the log file).
+
+    FLUSH_INTERVAL = 200  # milliseconds
+    MAX_LINES = 5000
 
     def __init__(self, text):
         # run the regular Handler __init__
         logging.Handler.__init__(self)
         # Store a reference to the Text it will log to
         self.text = text
+        self._pending: deque = deque(maxlen=self.MAX_LINES)
+        self._pending_lock = Lock()
+        self.text.after(self.FLUSH_INTERVAL, self._flush_to_text)
 
     def emit(self, record):
         msg = self.format(record)
-
-        def append():
+        with self._pending_lock:
+            self._pending.append(msg)
+
+    def _flush_to_text(self) -> None:
+        with self._pending_lock:
+            messages = list(self._pending)
+            self._pending.clear()
+        if messages:
             self.text.configure(state="normal")
-            self.text.insert(tk.END, msg + "\n")
+            self.text.insert(tk.END, "\n".join(messages) + "\n")
+            # Every message ends in a newline so the last character is on the line after the text
+            excess = int(self.text.index("end-1c").split(".")[0]) - 1 - self.MAX_LINES
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
             self.text.configure(state="disabled")
             # Autoscroll to the bottom
             self.text.yview(tk.END)
-
-        # This is necessary because we can't modify the Text from other threads
-        self.text.after(0, append)
+        self.text.after(self.FLUSH_INTERVAL, self._flush_to_text)
 
 
 class _Logging(ctk.CTkFrame):
@@ -118,6 +136,31 @@ class _Logging(ctk.CTkFrame):
         log.addHandler(text_handler)
 
 
+class _Update_Check(Task):
+    """Look for a newer release without holding up the UI, newer is set if there is one.
+
+    The release list is cached (see swon_version.cached_releases) so most starts don't go to the
+    network at all. url replaces the GitHub releases url if it is set.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(daemon=True)  # Don't keep the application open waiting for the network
+        self._url = url
+        self.newer: Optional[Any] = None
+
+    def run_task(self):
+        import swon_version  # Brings in requests, only needed here
+
+        cachedir = user_cache_dir("swon-analyzer", "Swim Ontario")
+        try:
+            pathlib.Path(cachedir).mkdir(parents=True, exist_ok=True)
+            latest_version = swon_version.latest(self._url or None, os.path.join(cachedir, "releases.json"))
+            if latest_version is not None and not swon_version.is_latest_version(latest_version, ANALYZER_VERSION):
+                self.newer = latest_version
+        except Exception as ex:
+            logging.warning("Error checking for update: %s", ex)
+
+
 class SwonApp(ctk.CTkFrame):
     """Main Appliction"""
 
@@ -125,8 +168,7 @@ class SwonApp(ctk.CTkFrame):
         super().__init__(container)
         self._config = config
         self._rtr_data = rtr_data
-        self.df = pd.DataFrame()
-        self.affiliates = pd.DataFrame()
+        self._frames: dict = {}  # Screens built so far, by name
         self.unlocked: bool = False
         self.menu_mode: StringVar = StringVar(value=self._config.get_str("DefaultMenu"))
     
@@ -296,25 +338,20 @@ class SwonApp(ctk.CTkFrame):
 
         """Turn on the New Version button if there's a newer released version"""
 
-        try:
-            latest_version = swon_version.latest()
-            if latest_version is not None and not swon_version.is_latest_version(latest_version, ANALYZER_VERSION):
-                self.new_ver_button = ctk.CTkButton(
-                    self.navigation_frame,
-                    corner_radius=0,
-                    height=40,
-                    border_spacing=10,
-                    text=f"New Version {latest_version.tag}",
-                    fg_color="transparent",
-                    text_color=("gray10", "gray90"),
-                    hover_color=("gray70", "gray30"),
-                    anchor="w",
-                    command=self.new_ver_button_event,
-                )
-                self.new_ver_url = latest_version.url
-                self.new_ver_button.grid(row=10, column=0, sticky="sew")
-        except RequestException as ex:
-            logging.warning("Error checking for update: %s", ex)
+        self.new_ver_button = ctk.CTkButton(
+            self.navigation_frame,
+            corner_radius=0,
+            height=40,
+            border_spacing=10,
+            text="New Version",
+            fg_color="transparent",
+            text_color=("gray10", "gray90"),
+            hover_color=("gray70", "gray30"),
+            anchor="w",
+            command=self.new_ver_button_event,
+        )
+        self.new_ver_url = ""
+        watch_task(self, _Update_Check(self._config.get_str("update_check_url")), None, self._update_check_finished)
 
         self.log_button = ctk.CTkButton(
             self.navigation_frame,
@@ -344,59 +381,32 @@ class SwonApp(ctk.CTkFrame):
         )
         self.help_button.grid(row=12, column=0, sticky="sew")
 
-        # The RTR frame is common to all applications
-
-        self.app_preferences_frame = Application_Preferences(self, self._config)
-        self.app_preferences_frame.configure(corner_radius=0, fg_color="transparent")
-        self.app_preferences_frame.grid_columnconfigure(0, weight=1)
-        self.app_preferences_frame.grid(row=0, column=1, sticky="new")
+        # The RTR and logging frames are built straight away, the RTR screen is shown first and the
+        # logging frame sets up the log handlers. Everything else is built on first use.
 
         self.rtr_frame = RTR_Frame(self, self._config, self._rtr_data)
         self.rtr_frame.configure(corner_radius=0, fg_color="transparent")
         self.rtr_frame.grid_columnconfigure(0, weight=1)
-        self.rtr_frame.grid(row=0, column=1, sticky="new")
+        self._frames["rtr"] = self.rtr_frame
 
         self.help_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
 
-        # create the subframes - Sanctioning Application
-
-        self.sanction_ror_frame = Sanction_ROR(self, self._config, self._rtr_data)
-        self.sanction_ror_frame.configure(corner_radius=0, fg_color="transparent")
-        self.sanction_ror_frame.grid_columnconfigure(0, weight=1)
-
-        self.sanction_coa_frame = Sanction_COA_CoHost(self, self._config, self._rtr_data)
-        self.sanction_coa_frame.configure(corner_radius=0, fg_color="transparent")
-        self.sanction_coa_frame.grid_columnconfigure(0, weight=1)
-
-        # create the subframes - ODP Application
-
-        self.odp_doc_frame = Generate_Documents_Frame(self, self._config, self._rtr_data)
-        self.odp_doc_frame.configure(corner_radius=0, fg_color="transparent")
-        self.odp_doc_frame.grid_columnconfigure(0, weight=1)
-
-        self.rtr_browser_frame = RTR_Browse_Frame(self, self._config, self._rtr_data)
-        self.rtr_browser_frame.configure(corner_radius=0, fg_color="transparent")
-        self.rtr_browser_frame.grid_columnconfigure(0, weight=1)
-
-        # create the subframes - New Pathway Application
-
-        self.pathway_ror_frame = Pathway_ROR_Frame(self, self._config, self._rtr_data)
-        self.pathway_ror_frame.configure(corner_radius=0, fg_color="transparent")
-        self.pathway_ror_frame.grid_columnconfigure(0, weight=1)
-
-        self.pathway_doc_frame = Pathway_Documents_Frame(self, self._config, self._rtr_data)
-        self.pathway_doc_frame.configure(corner_radius=0, fg_color="transparent")
-        self.pathway_doc_frame.grid_columnconfigure(0, weight=1)
-
         # Logging Window
         self.log_frame = _Logging(self, self._config)
         self.log_frame.configure(corner_radius=0, fg_color="transparent")
         self.log_frame.grid_columnconfigure(0, weight=1)
+        self._frames["log"] = self.log_frame
 
         # Default to the RTR button pressed
         self.change_buttons(self._config.get_str("DefaultMenu"))
         self.rtr_button_event()
 
+    def _update_check_finished(self, thread: _Update_Check) -> None:
+        if thread.newer is not None:
+            self.new_ver_button.configure(text=f"New Version {thread.newer.tag}")
+            self.new_ver_url = thread.newer.url
+            self.new_ver_button.grid(row=10, column=0, sticky="sew")
+
     def change_buttons(self, value):
         if value == "COA/MM":
             self.sanction_ror_button.grid_forget()
@@ -434,42 +444,52 @@ class SwonApp(ctk.CTkFrame):
         self.pathway_doc_button.configure(fg_color=("gray75", "gray25") if name == "pathway-doc" else "transparent")
 
         # show selected frame
+        selected = self._frame(name)
+        for frame in self._frames.values():
+            if frame is not selected:
+                frame.grid_forget()
+        selected.grid(row=0, column=1, sticky="nsew" if name == "log" else "new")
+
+    def _create_frame(self, name: str) -> ctk.CTkFrame:
+        """Build the frame of a screen, importing the modules it needs"""
         if name == "app-preferences":
-            self.app_preferences_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.app_preferences_frame.grid_forget()
-        if name == "rtr":
-            self.rtr_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.rtr_frame.grid_forget()
+            return Application_Preferences(self, self._config)
         if name == "sanction-ror":
-            self.sanction_ror_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.sanction_ror_frame.grid_forget()
+            from sanction import Sanction_ROR
+
+            return Sanction_ROR(self, self._config, self._rtr_data)
         if name == "sanction-coa":
-            self.sanction_coa_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.sanction_coa_frame.grid_forget()
+            from sanction import Sanction_COA_CoHost
+
+            return Sanction_COA_CoHost(self, self._config, self._rtr_data)
         if name == "odp-doc":
-            self.odp_doc_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.odp_doc_frame.grid_forget()
+            from odp import Generate_Documents_Frame
+
+            return Generate_Documents_Frame(self, self._config, self._rtr_data)
         if name == "rtr-browser":
-            self.rtr_browser_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.rtr_browser_frame.grid_forget()
-        if name == "log":
-            self.log_frame.grid(row=0, column=1, sticky="nsew")
-        else:
-            self.log_frame.grid_forget()
+            from rtrbrowse import RTR_Browse_Frame
+
+            return RTR_Browse_Frame(self, self._config, self._rtr_data)
         if name == "pathway-ror":
-            self.pathway_ror_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.pathway_ror_frame.grid_forget()
+            from pathway import Pathway_ROR_Frame
+
+            return Pathway_ROR_Frame(self, self._config, self._rtr_data)
         if name == "pathway-doc":
-            self.pathway_doc_frame.grid(row=0, column=1, sticky="new")
-        else:
-            self.pathway_doc_frame.grid_forget()
+            from pathway import Pathway_Documents_Frame
+
+            return Pathway_Documents_Frame(self, self._config, self._rtr_data)
+        raise ValueError(f"Unknown screen {name}")
+
+    def _frame(self, name: str) -> ctk.CTkFrame:
+        """The frame of a screen, built the first time it is shown"""
+        if name not in self._frames:
+            start = time.perf_counter()
+            frame = self._create_frame(name)
+            frame.configure(corner_radius=0, fg_color="transparent")
+            frame.grid_columnconfigure(0, weight=1)
+            self._frames[name] = frame
+            logging.info("Screen {} ready in {:.2f}s".format(name, time.perf_counter() - start))
+        return self._frames[name]
 
     def app_preferences_button_event(self) -> None:
         self.select_frame_by_name("app-preferences")
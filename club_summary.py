@@ -50,16 +50,28 @@ from copy import copy, deepcopy
 from datetime import datetime
 from typing import Any
 
-import docx  # type: ignore
 import pandas as pd
 from docx import Document  # type: ignore
-from docx.shared import Inches  # type: ignore
 
 from config import AnalyzerConfig
+from report_backends import DocxBackend, ReportBackend
 from rtr_fields import RTR_CLINICS
 
 LIST_OR_DICT = list | dict
 
+# The skill summaries (clinics taken, 1 sign-off, 2 sign-offs) and RTR error lists included in as_dict()
+_SKILLS = ["Intro", "SandT", "IT", "JoS", "ChiefT", "Clerk", "MM", "Starter", "CFJ", "RecSec", "Referee"]
+_RTR_ERRORS = [
+    "NoLevel_Missing_Cert",
+    "NoLevel_Missing_SM",
+    "NoLevel_Has_II",
+    "Missing_Level_II",
+    "Invalid_Level_II",
+    "Missing_Level_III",
+    "SandT_IT_Combo_Error",
+    "SandT_JS_Date_Warning",
+]
+
 
 class club_summary:
     def __init__(self, club: str, club_data_set: pd.DataFrame, config: AnalyzerConfig, **kwargs):
@@ -787,35 +799,52 @@ class club_summary:
                 return working_plan
         return []
 
+    def as_dict(self) -> dict:
+        """The results as JSON serializable data, keyed by the names of the attributes holding them"""
+        return {
+            "club_code": self.club_code,
+            "officials": len(self._club_data_full),
+            "Sanction_Level": list(self.Sanction_Level),
+            "Failed_Sanctions": list(self.Failed_Sanctions),
+            "Levels": {
+                "Level_None": int(self.Level_None),
+                "Level_1s": int(self.Level_1s),
+                "Level_2s": int(self.Level_2s),
+                "Level_3s": int(self.Level_3s),
+                "Level_4s": int(self.Level_4s),
+                "Level_5s": int(self.Level_5s),
+            },
+            "Skills": {name: [int(count) for count in getattr(self, name)[:3]] for name in _SKILLS},
+            "Qualified_Refs": [ref[0] for ref in self.Qualified_Refs],
+            "Level_2_Qualified_Refs": [ref[0] for ref in self.Level_2_Qualified_Refs],
+            "Level_4_5s": list(self.Level_4_5s),
+            "Errors": {name: list(getattr(self, name)) for name in _RTR_ERRORS},
+        }
+
     def dump_data_docx(self, doc: Document, club_fullname: str, reportdate: str, affiliates: list):
         """Produce the Word Document for the club"""
-        doc.add_heading(club_fullname + " (" + self.club_code + ")", 0)
-        doc.add_heading("Provisionally Approved Sanction Types (as of " + reportdate + ")", level=2)
-        sanction_p = doc.add_paragraph()
-        sanction_p.add_run("\n".join(self.Sanction_Level))
+        self.dump_report(DocxBackend(doc), club_fullname, reportdate, affiliates)
+
+    def dump_report(self, report: ReportBackend, club_fullname: str, reportdate: str, affiliates: list):
+        """Produce the club report through any of the report backends"""
+        report.heading(club_fullname + " (" + self.club_code + ")", 0)
+        report.heading("Provisionally Approved Sanction Types (as of " + reportdate + ")", 2)
         if len(self.Sanction_Level) == 0:
-            sanction_p.add_run("NO APPROVED SANCTION TYPES")
-
-        doc.add_heading("Officials Summary", level=2)
-        ps = doc.add_paragraph("No Level: %d\n" % self.Level_None)
-        ps.add_run("Level 1 : %d\n" % self.Level_1s)
-        ps.add_run("Level 2 : %d\n" % self.Level_2s)
-        ps.add_run("Level 3 : %d\n" % self.Level_3s)
-        ps.add_run("Level 4 : %d\n" % self.Level_4s)
-        ps.add_run("Level 5 : %d" % self.Level_5s)
-
-        doc.add_heading("Skills Summary (Excludes Level 4/5)", level=3)
-        table = doc.add_table(rows=1, cols=4)
-        row = table.rows[0].cells
-        row[0].text = "Qualfication"
-        row[1].text = "Total Clinics"
-        row[2].text = "1 Sign-Off"
-        row[3].text = "2 Sign-Offs"
-        row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.RIGHT
-        row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-        row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-        row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+            report.paragraph("\n".join(self.Sanction_Level), "NO APPROVED SANCTION TYPES")
+        else:
+            report.paragraph("\n".join(self.Sanction_Level))
+
+        report.heading("Officials Summary", 2)
+        report.paragraph(
+            "No Level: %d\n" % self.Level_None,
+            "Level 1 : %d\n" % self.Level_1s,
+            "Level 2 : %d\n" % self.Level_2s,
+            "Level 3 : %d\n" % self.Level_3s,
+            "Level 4 : %d\n" % self.Level_4s,
+            "Level 5 : %d" % self.Level_5s,
+        )
 
+        report.heading("Skills Summary (Excludes Level 4/5)", 3)
         table_data = [
             ("Intro to Swimming", str(self.Intro[0]), str(self.Intro[1]), str(self.Intro[2])),
             ("Stroke & Turn (Pre Sept/23)", str(self.SandT[0]), str(self.SandT[1]), str(self.SandT[2])),
@@ -829,22 +858,16 @@ class club_summary:
             ("Chief Recorder/Recorder", str(self.RecSec[0]), "", ""),
             ("Referee", str(self.Referee[0]), "", ""),
         ]
-
-        for entry in table_data:
-            row = table.add_row().cells
-            for k in range(len(entry)):
-                row[k].text = entry[k]
-                row[k].width = Inches(2.5) if k == 0 else Inches(1.5)
-                row[k].paragraphs[0].alignment = (
-                    docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER if k > 0 else docx.enum.text.WD_ALIGN_PARAGRAPH.RIGHT
-                )
-
-        table.style = "Light Grid Accent 5"
+        report.table(
+            ["Qualfication", "Total Clinics", "1 Sign-Off", "2 Sign-Offs"],
+            table_data,
+            ["right", "center", "center", "center"],
+            [2.5, 1.5, 1.5, 1.5],
+        )
 
         if len(self.Qualified_Refs) > 0:
-            doc.add_heading("Qualified Level III Referees", level=3)
-            refp = doc.add_paragraph()
-            refp.add_run(
+            report.heading("Qualified Level III Referees", 3)
+            report.paragraph(
                 "\n".join(
                     ref[0]
                     + (" (Para eModule)" if ref[2] == "yes" else "")
@@ -854,9 +877,8 @@ class club_summary:
             )
 
         if len(self.Level_2_Qualified_Refs) > 0:
-            doc.add_heading("Qualified Level II Referees", level=3)
-            refp = doc.add_paragraph()
-            refp.add_run(
+            report.heading("Qualified Level II Referees", 3)
+            report.paragraph(
                 "\n".join(
                     ref[0]
                     + (" (Para eModule)" if ref[2] == "yes" else "")
@@ -868,81 +890,61 @@ class club_summary:
         if self._config.get_bool("incl_affiliates") and affiliates:
             affiliated_officials = self._club_data_full[self._club_data_full["Registration Id"].isin(affiliates)]
             if not affiliated_officials.empty:  # We could have affiliated officials but no supporting data
-                doc.add_heading("Affiliated Officials", level=3)
-
-                atable = doc.add_table(rows=1, cols=3)
-                row = atable.rows[0].cells
-                row[0].text = "Registration Id"
-                row[1].text = "Name"
-                row[2].text = "Certification Level"
-                row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-                row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-                row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-
-                for index, affiliated_official in affiliated_officials.iterrows():
-                    row = atable.add_row().cells
-                    row[0].text = str(affiliated_official["Registration Id"])
-                    row[1].text = (
-                        affiliated_official["Last Name"]
-                        + ", "
-                        + affiliated_official["First Name"]
-                        + " ("
-                        + affiliated_official["ClubCode"]
-                        + ")"
-                    )
-                    row[2].text = affiliated_official["Current_CertificationLevel"]
-                    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-                    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-                    row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-
-                atable.style = "Light Grid Accent 5"
-                atable.allow_autofit = True
+                report.heading("Affiliated Officials", 3)
+                report.table(
+                    ["Registration Id", "Name", "Certification Level"],
+                    [
+                        [
+                            str(affiliated_official["Registration Id"]),
+                            affiliated_official["Last Name"]
+                            + ", "
+                            + affiliated_official["First Name"]
+                            + " ("
+                            + affiliated_official["ClubCode"]
+                            + ")",
+                            affiliated_official["Current_CertificationLevel"],
+                        ]
+                        for index, affiliated_official in affiliated_officials.iterrows()
+                    ],
+                    ["left", "left", "left"],
+                )
 
         if self._config.get_bool("incl_sanction_errors") and self.Failed_Sanctions:
-            doc.add_heading("Sanctioning Issues", level=3)
-            error_p = doc.add_paragraph()
-            error_p.add_run("\n".join(self.Failed_Sanctions))
+            report.heading("Sanctioning Issues", 3)
+            report.paragraph("\n".join(self.Failed_Sanctions))
 
         if self._config.get_bool("incl_errors"):
             if self.NoLevel_Missing_Cert:
-                doc.add_heading("RTR Error - Official(s) missing Level I Certification Record", level=2)
-                error_p1 = doc.add_paragraph()
-                error_p1.add_run("\n".join(self.NoLevel_Missing_Cert))
+                report.heading("RTR Error - Official(s) missing Level I Certification Record", 2)
+                report.paragraph("\n".join(self.NoLevel_Missing_Cert))
 
             if self.Missing_Level_II:
-                doc.add_heading("RTR Error - Official(s) missing Level II Certification Record", level=2)
-                error_p3 = doc.add_paragraph()
-                error_p3.add_run("\n".join(self.Missing_Level_II))
-            
+                report.heading("RTR Error - Official(s) missing Level II Certification Record", 2)
+                report.paragraph("\n".join(self.Missing_Level_II))
+
             if self.Invalid_Level_II:
-                doc.add_heading("RTR Error - Official(s) has invalid Level II Certification Record", level=2)
-                error_p5 = doc.add_paragraph()
-                error_p5.add_run("\n".join(self.Invalid_Level_II))
+                report.heading("RTR Error - Official(s) has invalid Level II Certification Record", 2)
+                report.paragraph("\n".join(self.Invalid_Level_II))
 
             if self.Missing_Level_III:
-                doc.add_heading("RTR Possible Error - Official(s) missing Level III Certification Record", level=2)
-                error_p2 = doc.add_paragraph()
-                error_p2.add_run("* COA to check last certification date and para certification status\n")
-                error_p2.add_run("\n".join(self.Missing_Level_III))
+                report.heading("RTR Possible Error - Official(s) missing Level III Certification Record", 2)
+                report.paragraph(
+                    "* COA to check last certification date and para certification status\n",
+                    "\n".join(self.Missing_Level_III),
+                )
 
             if self.SandT_IT_Combo_Error:
-                doc.add_heading(
-                    "RTR Error - Official(s) has IT Record and Combo S&T record - Should only be one", level=2
-                )
-                error_p4 = doc.add_paragraph()
-                error_p4.add_run("\n".join(self.SandT_IT_Combo_Error))
+                report.heading("RTR Error - Official(s) has IT Record and Combo S&T record - Should only be one", 2)
+                report.paragraph("\n".join(self.SandT_IT_Combo_Error))
 
             if self.NoLevel_Missing_SM:
-                doc.add_heading("RTR Warning - Level I Partially Complete - Need Safety Marshal", level=2)
-                warn_p = doc.add_paragraph()
-                warn_p.add_run("\n".join(self.NoLevel_Missing_SM))
+                report.heading("RTR Warning - Level I Partially Complete - Need Safety Marshal", 2)
+                report.paragraph("\n".join(self.NoLevel_Missing_SM))
 
             if self.NoLevel_Has_II:
-                doc.add_heading("RTR Warning - Official has Level II clinics - Missing Level I Certification", level=2)
-                warn_p2 = doc.add_paragraph()
-                warn_p2.add_run("\n".join(self.NoLevel_Has_II))
+                report.heading("RTR Warning - Official has Level II clinics - Missing Level I Certification", 2)
+                report.paragraph("\n".join(self.NoLevel_Has_II))
 
             if self.SandT_JS_Date_Warning:
-                doc.add_heading("RTR Warning - S&T Combo Clinic and JoS Clinic date mismatch", level=2)
-                warn_p3 = doc.add_paragraph()
-                warn_p3.add_run("\n".join(self.SandT_JS_Date_Warning))
+                report.heading("RTR Warning - S&T Combo Clinic and JoS Clinic date mismatch", 2)
+                report.paragraph("\n".join(self.SandT_JS_Date_Warning))
@@ -59,14 +59,19 @@ class AnalyzerConfig:
             "video_finish": "False",  # Using a Video Finish System
             "gen_1_per_club": "False",  # Generate 1 Word Doc / Club
             "gen_word": "True",  # Generate Master Word Doc
+            "report_format": "docx",  # Sanctioning report output - docx or html
             "gen_np_csv": "False",  # Generate CSV File
             "gen_np_warnings": "False",  # Generate Pathway Warnings
             "email_list_csv": "docgen-email-list.csv",  # Email List File name
+            "incremental_docs": "False",  # Only regenerate changed per-official documents, reused ones keep their date
+            "bundle_docs": "False",  # Write the per-official documents and email list to one zip file
+            "render_workers": "0",  # Processes used to render per-official documents (0 = automatic)
             "Theme": "System",  # Theme- System, Dark or Light
             "Scaling": "100%",  # Display Zoom Level
             "Colour": "blue",  # Colour Theme
             "client_id": "",  # Client ID
             "DefaultMenu": "COA/Co-Host",  # Default Menu
+            "update_check_url": "",  # Releases list checked for a new version (empty = GitHub)
         }
     }
 
@@ -87,6 +92,11 @@ class AnalyzerConfig:
             client_id = str(uuid.uuid4())
         self.set_str("client_id", client_id)
 
+    @classmethod
+    def defaults(cls) -> dict:
+        """Every option and its default value"""
+        return dict(cls._CONFIG_DEFAULTS[cls._INI_HEADING])
+
     def save(self) -> None:
         """Save the (updated) configuration to the ini file"""
         with open(self._CONFIG_FILE, "w") as configfile:
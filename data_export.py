@@ -0,0 +1,125 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Export of RTR data to CSV, compressed CSV, Parquet and Arrow files
+
+The format is picked from the file extension. When pyarrow is installed the compressed CSV, Parquet
+and Arrow files are written from an Arrow table by its multithreaded writers. Plain CSV files are
+always written by pandas so they stay identical to earlier exports (pyarrow quotes every string).
+Without pyarrow compressed CSV falls back to pandas and Parquet and Arrow are not available.
+"""
+
+import logging
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+    import pyarrow.feather as pa_feather  # type: ignore
+    import pyarrow.parquet as pa_parquet  # type: ignore
+except ImportError:
+    pa = None
+
+from task_runner import Task
+
+# File dialog types for the exports, the first one is the default
+EXPORT_FILETYPES = [
+    ("CSV Files", "*.csv"),
+    ("Compressed CSV (gzip)", "*.csv.gz"),
+    ("Compressed CSV (zstd)", "*.csv.zst"),
+    ("Parquet Files", "*.parquet"),
+    ("Arrow IPC Files", "*.arrow"),
+]
+
+# Extension -> (format, compression)
+_FORMATS = {
+    ".csv": ("csv", None),
+    ".csv.gz": ("csv", "gzip"),
+    ".csv.zst": ("csv", "zstd"),
+    ".parquet": ("parquet", "zstd"),
+    ".arrow": ("arrow", "lz4"),
+    ".feather": ("arrow", "lz4"),
+}
+
+
+def export_format(filename: str) -> tuple:
+    """Return (format, compression) for filename from its extension, unknown extensions are plain CSV"""
+    name = filename.lower()
+    for extension in sorted(_FORMATS, key=len, reverse=True):
+        if name.endswith(extension):
+            return _FORMATS[extension]
+    return _FORMATS[".csv"]
+
+
+def _to_arrow(data: pd.DataFrame) -> "pa.Table":
+    try:
+        return pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Text columns holding a mix of types (e.g. numbers and strings), export them as text
+        text_columns = {column: "string" for column in data.columns if data[column].dtype == object}
+        return pa.Table.from_pandas(data.astype(text_columns), preserve_index=False)
+
+
+def export_data(data: pd.DataFrame, filename: str, columns: Optional[list] = None) -> None:
+    """Write data (only columns, if given) to filename in the format given by its extension"""
+
+    if columns is not None:
+        data = data[columns]
+    export, compression = export_format(filename)
+
+    if pa is None or (export == "csv" and compression is None):
+        if export != "csv":
+            raise RuntimeError(f"Saving {export} files requires the pyarrow package")
+        data.to_csv(filename, index=False, compression=compression)
+        return
+
+    table = _to_arrow(data)
+    if export == "parquet":
+        pa_parquet.write_table(table, filename, compression=compression)
+    elif export == "arrow":
+        pa_feather.write_feather(table, filename, compression=compression)
+    else:
+        with pa.CompressedOutputStream(filename, compression) as stream:
+            pa_csv.write_csv(table, stream)
+
+
+class Export_Data(Task):
+    """Run export_data on a background thread, error is set if it failed"""
+
+    def __init__(self, data: pd.DataFrame, filename: str, columns: Optional[list] = None):
+        super().__init__()
+        self._data = data
+        self._filename = filename
+        self._columns = columns
+        self.error: Optional[Exception] = None
+
+    def run_task(self):
+        self.stage("Exporting", 0, 1)
+        try:
+            export_data(self._data, self._filename, self._columns)
+            logging.info("Export Saved: {}".format(self._filename))
+            self.progress(1, 1)
+        except Exception as e:
+            logging.info("Unable to save export: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            self.error = e
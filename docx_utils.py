@@ -0,0 +1,140 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Word document helpers shared by the report generators"""
+
+import io
+import os
+import zipfile
+
+from docx import Document  # type: ignore
+from docx.document import Document as DocumentObject  # type: ignore
+from docx.oxml import parse_xml  # type: ignore
+from docx.oxml.ns import qn  # type: ignore
+from docx.table import Table  # type: ignore
+from docx.text.paragraph import Paragraph  # type: ignore
+from lxml import etree  # type: ignore
+
+
+def append_body(master: DocumentObject, body: list) -> None:
+    """Append serialized body elements (as produced by a worker process) to master, followed by a page break."""
+    doc_body = master.element.body
+    sect_pr = doc_body.sectPr
+    for fragment in body:
+        element = parse_xml(fragment)
+        if sect_pr is not None:
+            sect_pr.addprevious(element)
+        else:
+            doc_body.append(element)
+    master.add_page_break()
+
+
+def read_body(filename: str) -> list:
+    """Return the serialized body elements of a saved document, in the form used by append_body"""
+    with zipfile.ZipFile(filename) as package:
+        root = etree.fromstring(package.read("word/document.xml"))
+    body = root.find(qn("w:body"))
+    return [etree.tostring(element) for element in body.iterchildren() if element.tag != qn("w:sectPr")]
+
+
+def document_text(doc: DocumentObject) -> list:
+    """The text of a document in body order, line by line with a line per table row (cells separated by |)"""
+    lines = []
+    for element in doc.element.body.iterchildren():
+        if element.tag == qn("w:p"):
+            lines.extend(Paragraph(element, doc).text.split("\n"))
+        elif element.tag == qn("w:tbl"):
+            lines.extend(" | ".join(cell.text for cell in row.cells) for row in Table(element, doc).rows)
+    return lines
+
+
+class StreamingDocxWriter:
+    """Write a consolidated Word document one section at a time.
+
+    Instead of holding the whole report as a python-docx DOM until it is saved, each section is
+    serialized straight into the word/document.xml member of the output zip as it is added. Only
+    one section is ever in memory and the early sections reach the disk while the later ones are
+    still being produced. The package parts (styles, numbering, etc.) come from the default
+    python-docx template so sections must be built from Document() as well.
+
+        with StreamingDocxWriter(filename) as writer:
+            for ...:
+                section = Document()
+                ...
+                writer.add_document(section)
+    """
+
+    _DOCUMENT_PART = "word/document.xml"
+
+    def __init__(self, filename: str):
+        template = io.BytesIO()
+        Document().save(template)
+        self._filename = filename
+        self._zip = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED)
+        try:
+            with zipfile.ZipFile(template) as template_zip:
+                for item in template_zip.infolist():
+                    if item.filename == self._DOCUMENT_PART:
+                        document_xml = template_zip.read(item)
+                    else:
+                        self._zip.writestr(item, template_zip.read(item))
+            # Everything up to the final section properties is written now, the rest on close()
+            split = document_xml.rindex(b"<w:sectPr")
+            self._tail = document_xml[split:]
+            self._stream = self._zip.open(self._DOCUMENT_PART, "w")
+            self._stream.write(document_xml[:split])
+        except Exception:
+            self._zip.close()
+            raise
+
+    def add_document(self, doc: DocumentObject) -> None:
+        """Write the body of doc to the output followed by a page break. doc gets the page break added."""
+        doc.add_page_break()
+        for element in doc.element.body.iterchildren():
+            if element.tag != qn("w:sectPr"):
+                self._stream.write(etree.tostring(element))
+
+    def close(self) -> None:
+        """Finish the document and close the file"""
+        self._stream.write(self._tail)
+        self._stream.close()
+        self._zip.close()
+
+    def abort(self) -> None:
+        """Close and delete the file after a failure rather than leave an incomplete document"""
+        for handle in (self._stream, self._zip):
+            try:
+                handle.close()
+            except Exception:
+                pass
+        try:
+            os.remove(self._filename)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "StreamingDocxWriter":
+        return self
+
+    def __exit__(self, exc_type, *_exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,164 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""New pathway warnings for RORs and POAs
+
+Every check is evaluated over the whole (filtered) province at once, producing one table with a
+row per warning. The checks look for officials that are one requirement short of a new pathway
+level, clinic combinations that should not occur and certification levels without the clinic
+records behind them.
+"""
+
+import numpy as np
+import pandas as pd
+
+from report_backends import ReportBackend
+
+# Warning codes and the text shown for them
+WARNINGS = {
+    "NP_OFFICIAL_CT": "Certified Official except for the Chief Timekeeper sign-offs",
+    "NP_OFFICIAL_INTRO": "Certified Official except for the Introduction sign-offs",
+    "REF1_PARA": "Referee 1 except for the para module",
+    "STARTER1_PARA": "Starter 1 except for the para module",
+    "STARTER2_CFJ": "Starter 2 except for the CFJ/CJE sign-offs",
+    "MM1_SIGNOFFS": "Meet Manager 1 except for the Meet Manager sign-offs",
+    "REF2_LEVEL": "Referee 2 except for a Level IV/V certification",
+    "ST_AND_IT": "Has both the Stroke & Turn (pre Sept/23) and Inspector of Turns clinics",
+    "JOS_WITHOUT_TURNS": "Judge of Stroke clinic without a Stroke & Turn or Inspector of Turns clinic",
+    "IT_WITHOUT_JOS": "Certified Inspector of Turns without the Judge of Stroke clinic",
+    "LEVEL_NO_INTRO": "Level I-III with no Introduction clinic record",
+    "LEVEL_NO_TURNS": "Level I-III with no Stroke & Turn or Inspector of Turns clinic record",
+    "LEVEL_NO_LEVEL_II": "Level II/III with no Level II clinic record",
+}
+
+# Columns identifying the official that are carried into the warnings table
+ID_COLUMNS = ["Registration Id", "Last Name", "First Name", "Club", "Level"]
+
+LEVEL_II_CLINICS = ["CT", "Admin", "MM", "Starter", "CFJ"]
+
+
+def _rules(data: pd.DataFrame) -> list:
+    """Return (code, mask) for every warning in the order they are reported"""
+
+    def status(clinic: str, value: str) -> pd.Series:
+        return data[f"{clinic}_Status"] == value
+
+    # Level IV/Vs are certified in everything regardless of their detail records, only check I-III
+    detailed = data["Level"] <= 3
+    level_1_3 = (data["Level"] >= 1) & detailed
+
+    # The rtr._np_* checks with the one requirement under test left out
+    turns_clinic = ~status("ST", "N") | (~status("IT", "N") & ~status("JoS", "N"))
+    turns_certified = (status("ST", "C") | status("IT", "C")) & status("JoS", "C")
+    para = (data["Para Swimming eModule"].str.lower() == "yes") | (data["Para Domestic"] == "Trained Official")
+    not_official = data["NP_Official"] == "No"
+    official = data["NP_Official"] == "Yes"
+    ref_1_except_para = (
+        official
+        & turns_certified
+        & status("Starter", "C")
+        & status("Admin", "C")
+        & ~status("Referee", "N")
+        & ~status("ChiefRec", "N")
+        & ~status("CFJ", "N")
+        & ~status("MM", "N")
+    )
+    ref_2_except_level = (data["NP_Ref1"] == "Yes") & status("ChiefRec", "C") & status("CFJ", "C") & status("MM", "C")
+
+    no_level_2_clinic = np.logical_and.reduce([status(clinic, "N") for clinic in LEVEL_II_CLINICS])
+
+    return [
+        # Near misses on the new pathway levels
+        ("NP_OFFICIAL_CT", not_official & status("Intro", "C") & turns_clinic & status("CT", "Q")),
+        ("NP_OFFICIAL_INTRO", not_official & status("Intro", "Q") & turns_clinic & status("CT", "C")),
+        ("REF1_PARA", (data["NP_Ref1"] == "No") & ref_1_except_para & ~para),
+        ("STARTER1_PARA", (data["NP_Starter1"] == "No") & official & turns_certified & status("Starter", "C") & ~para),
+        ("STARTER2_CFJ", (data["NP_Starter1"] == "Yes") & status("CFJ", "Q")),
+        ("MM1_SIGNOFFS", official & status("MM", "Q")),
+        ("REF2_LEVEL", (data["NP_Ref2"] == "No") & ref_2_except_level & detailed),
+        # Stroke & Turn, Inspector of Turns and Judge of Stroke combinations
+        ("ST_AND_IT", detailed & ~status("ST", "N") & ~status("IT", "N")),
+        ("JOS_WITHOUT_TURNS", detailed & ~status("JoS", "N") & status("ST", "N") & status("IT", "N")),
+        ("IT_WITHOUT_JOS", detailed & status("IT", "C") & status("ST", "N") & status("JoS", "N")),
+        # Certification levels without the records behind them
+        ("LEVEL_NO_INTRO", level_1_3 & status("Intro", "N")),
+        ("LEVEL_NO_TURNS", level_1_3 & status("ST", "N") & status("IT", "N")),
+        ("LEVEL_NO_LEVEL_II", (data["Level"] >= 2) & detailed & no_level_2_clinic),
+    ]
+
+
+def find_warnings(data: pd.DataFrame) -> pd.DataFrame:
+    """Run every check over data.
+
+    Returns a table indexed by the position of the official in data with a row per warning, grouped
+    by warning in the order of WARNINGS. Columns are ID_COLUMNS plus Code and Warning. Officials
+    without warnings have no rows.
+    """
+    # By position, the labels are not unique once several exports have been merged
+    data = data.reset_index(drop=True)
+    parts = []
+    for code, mask in _rules(data):
+        mask = np.asarray(mask, dtype=bool)
+        if not mask.any():
+            continue
+        part = data.loc[mask, ID_COLUMNS].copy()
+        part["Code"] = code
+        part["Warning"] = WARNINGS[code]
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=ID_COLUMNS + ["Code", "Warning"])
+    return pd.concat(parts)
+
+
+def dump_warnings(report: ReportBackend, table: pd.DataFrame, reviewed: int, reportdate: str) -> None:
+    """Render the warnings table, a summary of the counts followed by the officials for each warning"""
+
+    report.heading("New Pathway Warnings Report", 0)
+    report.paragraph(
+        "Report Generated: " + reportdate,
+        f"\n\nOfficials Reviewed: {reviewed}",
+        f"\n\nOfficials with Warnings: {table.index.nunique()}",
+    )
+
+    counts = table.groupby("Code", sort=False).size()
+    report.heading("Summary", 1)
+    report.table(
+        ["Warning", "Officials"],
+        [[WARNINGS[code], str(count)] for code, count in counts.items()],
+        ["left", "center"],
+    )
+
+    for code, officials in table.groupby("Code", sort=False):
+        report.heading(WARNINGS[code], 2)
+        officials = officials.sort_values(["Club", "Last Name", "First Name"])
+        rows = zip(
+            officials["Registration Id"].astype(str),
+            officials["Last Name"] + ", " + officials["First Name"],
+            officials["Club"].astype(str),
+            officials["Level"].astype(str),
+        )
+        report.table(
+            ["SNC ID #", "Name", "Club", "Level"],
+            [list(row) for row in rows],
+            ["left", "left", "left", "center"],
+            [1.0, 2.0, 2.5, 0.5],
+        )
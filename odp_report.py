@@ -0,0 +1,208 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Officials development (recommendations) documents - no UI dependencies so it can run in worker processes"""
+
+import logging
+from functools import partial
+from typing import Any, Optional
+
+import docx  # type: ignore
+import pandas as pd
+from docx import Document  # type: ignore
+
+from config import AnalyzerConfig
+from docx_utils import append_body
+from official_docs import (
+    DocumentBundle,
+    ProgressCallback,
+    RenderedDocument,
+    serialize_document,
+    write_documents,
+)
+from recommendations import recommend, recommendation_text
+from report_manifest import ReportManifest
+from report_writer import BackgroundWriter, SaveFailure
+from rtr_fields import RTR_CLINICS
+from rtr_loader import status_values
+
+# Bump whenever render_official changes what goes into the document, forces all documents to be rebuilt
+TEMPLATE_VERSION = 1
+
+
+def _get_date(date_string) -> str:
+    if pd.isnull(date_string):
+        return ""
+    return date_string
+
+
+def _add_clinic(table: Any, clinic_name: str, entry: Any, pos_info: dict) -> None:
+    row = table.add_row().cells
+    row[0].text = clinic_name
+    row[1].text = _get_date(entry[pos_info["clinicDate"]])
+    if pos_info["deckEvals"]:
+        row[2].text = _get_date(entry[pos_info["deckEvals"]].iloc[0])
+        if len(entry[pos_info["deckEvals"]]) > 1:
+            row[3].text = _get_date(entry[pos_info["deckEvals"]].iloc[1])
+        else:
+            row[3].text = "N/A"
+    else:
+        row[2].text = "N/A"
+        row[3].text = "N/A"
+
+    row[0].width = docx.shared.Inches(2.5)
+    row[1].width = docx.shared.Inches(1.5)
+    row[2].width = docx.shared.Inches(1.5)
+    row[3].width = docx.shared.Inches(1.5)
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+
+def render_official(entry: Any, club_code: str, club_fullname: str, reportdate: str) -> Document:
+    """Produce the Word Document for a single official"""
+
+    doc = Document()
+
+    doc.add_heading("2024/25 Officials Development", 0)
+
+    p = doc.add_paragraph()
+    p.add_run("Report Date: " + reportdate)
+    p.add_run(
+        "\n\nName: " + entry["Last Name"] + ", " + entry["First Name"] + " (SNC ID # " + entry["Registration Id"] + ")"
+    )
+    p.add_run("\n\nClub: " + club_fullname + " (" + club_code + ")")
+    p.add_run("\n\nCurrent Certification Level: ")
+    p.add_run("NONE" if pd.isnull(entry["Current_CertificationLevel"]) else entry["Current_CertificationLevel"])
+
+    table = doc.add_table(rows=1, cols=4)
+    row = table.rows[0].cells
+    row[0].text = "Clinic"
+    row[1].text = "Clinic Date"
+    row[2].text = "Sign Off #1"
+    row[3].text = "Sign Off #2"
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+    _add_clinic(table, "Intro to Swimming", entry, RTR_CLINICS["Intro"])
+    _add_clinic(table, "Safety Marshal", entry, RTR_CLINICS["Safety"])
+    _add_clinic(table, "Stroke & Turn (Combo)", entry, RTR_CLINICS["ST"])
+    _add_clinic(table, "Inspector of Turns", entry, RTR_CLINICS["IT"])
+    _add_clinic(table, "Judge of Stroke", entry, RTR_CLINICS["JoS"])
+    _add_clinic(table, "Chief Timekeeper", entry, RTR_CLINICS["CT"])
+    _add_clinic(table, "Admin Desk (Clerk)", entry, RTR_CLINICS["AdminDesk"])
+    _add_clinic(table, "Meet Manager", entry, RTR_CLINICS["MM"])
+    _add_clinic(table, "Starter", entry, RTR_CLINICS["Starter"])
+    _add_clinic(table, "CFJ/CJE", entry, RTR_CLINICS["CFJ"])
+    _add_clinic(table, "Chief Recorder/Recorder", entry, RTR_CLINICS["ChiefRec"])
+    _add_clinic(table, "Referee", entry, RTR_CLINICS["Referee"])
+    _add_clinic(table, "Para eModule", entry, RTR_CLINICS["Para"])
+
+    table.style = "Light Grid Accent 5"
+    table.autofit = True
+
+    # Add logic to define pathway progression
+
+    doc.add_heading("Recommended Actions", 2)
+
+    # The recommendations are computed for the whole club up front (see recommendations.py)
+    if entry["Recommendations"]:
+        for recommendation in entry["Recommendations"].split("\n"):
+            doc.add_paragraph(recommendation, style="List Bullet")
+
+    return doc
+
+
+def _render_official_job(club_code: str, club_fullname: str, reportdate: str, entry: Any) -> RenderedDocument:
+    """Worker process entry point"""
+    return serialize_document(render_official(entry, club_code, club_fullname, reportdate))
+
+
+def select_club_officials(rtr_data: pd.DataFrame, club_code: str, config: AnalyzerConfig) -> pd.DataFrame:
+    """The officials of a club with one of the statuses selected in the settings"""
+    club_data = rtr_data[(rtr_data["ClubCode"] == club_code)]
+    return club_data[club_data["Status"].isin(status_values(config))]
+
+
+class docgenCore:
+    def __init__(self, club: str, club_data_set: pd.DataFrame, config: AnalyzerConfig, **kwargs):
+        self._club_data_full = club_data_set
+        self._club_data = self._club_data_full.query("Level < 4")
+        self.club_code = club
+
+        # Recommendations for all officials, the documents get them as a column of newline separated text
+        self.recommendations = recommend(self._club_data)
+        self._club_data = self._club_data.assign(
+            Recommendations=recommendation_text(self.recommendations, len(self._club_data))
+        )
+
+        self._config = config
+        self.failures: list = []  # SaveFailure for each official whose document was not produced
+
+    def officials(self) -> pd.DataFrame:
+        """The officials a document is produced for, as they are given to render_official"""
+        return self._club_data
+
+    def dump_data_docx(
+        self,
+        club_fullname: str,
+        reportdate: str,
+        master: Optional[Document] = None,
+        workers: int = 1,
+        progress: Optional[ProgressCallback] = None,
+        bundle: Optional[DocumentBundle] = None,
+        saver: Optional[BackgroundWriter] = None,
+    ) -> list:
+        """Produce the Word Document for each official and return a list of files
+
+        If a master document is supplied each official's report is also appended to it so the
+        consolidated report never has to be re-read from disk. The documents are rendered on up to
+        workers processes (0 = automatic), progress is called with (done, total) as each one completes.
+        With incremental_docs set only officials whose data changed since the last run are rendered.
+        If a bundle is supplied the documents are written into it instead of the report directory.
+        With a saver the documents are written on its thread, save failures are recorded there.
+        """
+
+        _report_directory = self._config.get_str("odp_report_directory")
+        csv_list = []  # CSV entries for email list (Lastname, Firstname, E-Mail address and Filename)
+
+        manifest = None
+        if bundle is None and self._config.get_bool("incremental_docs"):
+            manifest = ReportManifest(_report_directory, "odp", TEMPLATE_VERSION)
+        render = partial(_render_official_job, self.club_code, club_fullname, reportdate)
+        context = (self.club_code, club_fullname)
+
+        for official in write_documents(
+            self._club_data, _report_directory, render, workers, progress, manifest, context, bundle, saver
+        ):
+            entry = official.entry
+            if official.error:  # Only add if saved
+                self.failures.append(SaveFailure(official.filename, official.error))
+                continue
+            csv_list.append([entry["Last Name"], entry["First Name"], entry["Email"], official.filename])
+
+            if master is not None:
+                append_body(master, official.body)
+
+        return csv_list
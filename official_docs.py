@@ -0,0 +1,290 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Rendering of the per-official documents (recommendations and pathway mapping)
+
+Each official's document is independent of the others so the rendering can be spread over a pool
+of worker processes. Results always come back in the order the officials were submitted so the
+consolidated document and the email list are identical to a serial run.
+
+Instead of one file per official the documents can be streamed into a single zip bundle, written
+sequentially through one file handle. Extracting the bundle into the report directory gives the
+same files a normal run writes.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+from docx.document import Document as DocumentObject  # type: ignore
+from docx.oxml.ns import qn  # type: ignore
+from lxml import etree  # type: ignore
+from slugify import slugify
+
+from docx_utils import read_body
+from report_manifest import ReportManifest, content_hashes
+from report_writer import BackgroundWriter
+
+# Clubs smaller than this are rendered in-process, starting the workers costs more than it saves
+MIN_PARALLEL_JOBS = 24
+
+# Upper limit on the number of worker processes picked automatically
+MAX_AUTO_WORKERS = 8
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class RenderedDocument(NamedTuple):
+    """A rendered official's document as returned from a worker process"""
+
+    docx: bytes  # The complete .docx file
+    body: list  # Serialized body elements for the consolidated document
+    error: str = ""  # Set if the document could not be rendered
+
+
+class OfficialDocument(NamedTuple):
+    """An official's document after it has been written (or found to be up to date)"""
+
+    entry: Any  # The official's row from the RTR data
+    filename: str
+    body: list  # Serialized body elements for the consolidated document, empty if rendering failed
+    error: str = ""  # Set if the document could not be rendered or saved
+
+
+class DocumentBundle:
+    """A zip file the generated documents are written into instead of the report directory.
+
+    Members are named by their path relative to directory so extract_bundle recreates the layout of
+    an unbundled run. The documents are already compressed so they are stored as is.
+    """
+
+    def __init__(self, filename: str, directory: str):
+        self.filename = os.path.abspath(filename)
+        self._directory = os.path.abspath(directory)
+        self._zip = zipfile.ZipFile(self.filename, "w", zipfile.ZIP_STORED)
+        self._members: set = set()
+
+    def write(self, filename: str, data: Any) -> None:
+        """Add filename (a path in the report directory) with data as its contents"""
+        name = os.path.relpath(os.path.abspath(filename), self._directory).replace(os.sep, "/")
+        if name in self._members:
+            # Two officials with the same name, a normal run overwrites the first file as well
+            logging.info(f"Duplicate document {name} in bundle, the last one is kept on extraction")
+        self._members.add(name)
+        self._zip.writestr(name, data)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "DocumentBundle":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+def bundle_filename(report_file: str) -> str:
+    """The bundle that goes with a consolidated report, the report name with a .zip extension"""
+    return os.path.splitext(report_file)[0] + ".zip"
+
+
+def extract_bundle(filename: str, directory: str) -> list:
+    """Extract a document bundle into directory and return the full paths of the files written"""
+    with zipfile.ZipFile(filename, "r") as bundle:
+        names = bundle.namelist()
+        bundle.extractall(directory)
+    return sorted({os.path.abspath(os.path.join(directory, name)) for name in names})
+
+
+def official_filename(directory: str, entry: Any) -> str:
+    """Return the full path of an official's document built from their name"""
+    return os.path.abspath(os.path.join(directory, slugify(entry["Last Name"] + "_" + entry["First Name"]) + ".docx"))
+
+
+def serialize_document(doc: DocumentObject) -> RenderedDocument:
+    """Convert a rendered document into a picklable result"""
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    body = [etree.tostring(element) for element in doc.element.body.iterchildren() if element.tag != qn("w:sectPr")]
+    return RenderedDocument(buffer.getvalue(), body)
+
+
+def worker_count(requested: int, jobs: int, min_jobs: int = MIN_PARALLEL_JOBS) -> int:
+    """Number of worker processes to use for a run of jobs documents.
+
+    A requested value of 0 picks one less than the number of CPUs (up to MAX_AUTO_WORKERS). Runs of
+    fewer than min_jobs are done in-process.
+    """
+    if jobs < min_jobs:
+        return 1
+    if requested <= 0:
+        requested = min((os.cpu_count() or 1) - 1, MAX_AUTO_WORKERS)
+    return max(1, min(requested, jobs))
+
+
+def render_documents(
+    render: Callable[[Any], RenderedDocument],
+    jobs: list,
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[RenderedDocument]:
+    """Render each job and yield the results in submission order.
+
+    With more than one worker the jobs are handed to a process pool. Only 2 jobs per worker are
+    in flight at any time so memory use stays flat regardless of the size of the club. render
+    must be a picklable (module level) callable. Failures are reported through the error field
+    rather than stopping the run.
+    """
+    total = len(jobs)
+    done = 0
+
+    if workers <= 1:
+        for job in jobs:
+            try:
+                result = render(job)
+            except Exception as e:
+                result = RenderedDocument(b"", [], f"{type(e).__name__} - {e}")
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            yield result
+        return
+
+    # spawn (rather than fork) as the workers are started from a thread of the UI
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending_jobs = iter(jobs)
+        in_flight = deque(pool.submit(render, job) for job in islice(pending_jobs, workers * 2))
+        while in_flight:
+            future = in_flight.popleft()
+            for job in islice(pending_jobs, 1):
+                in_flight.append(pool.submit(render, job))
+            try:
+                result = future.result()
+            except Exception as e:
+                result = RenderedDocument(b"", [], f"{type(e).__name__} - {e}")
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            yield result
+
+
+def write_documents(
+    club_data: Any,
+    directory: str,
+    render: Callable[[Any], RenderedDocument],
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+    manifest: Optional[ReportManifest] = None,
+    context: tuple = (),
+    bundle: Optional[DocumentBundle] = None,
+    saver: Optional[BackgroundWriter] = None,
+) -> Iterator[OfficialDocument]:
+    """Render and save the document for each official in club_data, yielding them in order.
+
+    With a manifest, officials whose data (plus the context strings, e.g. club name) is unchanged
+    since the last run keep their existing file and only its body is read back for the consolidated
+    document. Officials sharing a file (the same name) with another official in the run are always
+    rendered. The manifest is saved once every official has been processed.
+
+    With a bundle the documents are added to it rather than written to the directory, the manifest
+    does not apply to bundled runs.
+
+    With a saver the files are written on its background thread while the next official is rendered.
+    Save failures are then recorded by the saver (against the filename) rather than in the error
+    field of the yielded document.
+    """
+    # By position, the index labels are not unique once several exports have been merged
+    entries = [
+        (pos, entry, official_filename(directory, entry)) for pos, (_, entry) in enumerate(club_data.iterrows())
+    ]
+    if manifest is not None:
+        hashes = content_hashes(club_data, *context).to_numpy()
+        current = [manifest.is_current(str(entry["Registration Id"]), hashes[pos], f) for pos, entry, f in entries]
+        # Officials with the same name share a file, it only holds the last one written so is never current
+        shared = Counter(filename for _, _, filename in entries)
+        current = [up_to_date and shared[filename] == 1 for (_, _, filename), up_to_date in zip(entries, current)]
+    else:
+        current = [False] * len(entries)
+
+    stale = [entry for (_, entry, _), up_to_date in zip(entries, current) if not up_to_date]
+    if manifest is not None:
+        logging.info(f"{len(entries) - len(stale)} document(s) unchanged, {len(stale)} to generate")
+    rendered_docs = render_documents(render, stale, worker_count(workers, len(stale)), progress)
+
+    def save(key: str, filename: str, docx: bytes, digest: str) -> None:
+        try:
+            if bundle is not None:
+                bundle.write(filename, docx)
+            else:
+                with open(filename, "wb") as docx_file:
+                    docx_file.write(docx)
+            if manifest is not None:
+                manifest.update(key, digest, filename)
+        except Exception:
+            if manifest is not None:
+                manifest.discard(key)
+            raise
+
+    for (pos, entry, filename), up_to_date in zip(entries, current):
+        key = str(entry["Registration Id"])
+        if up_to_date:
+            try:
+                body = read_body(filename)
+            except Exception:
+                # The file has gone bad since it was checked, generate it again
+                rendered = next(render_documents(render, [entry]))
+            else:
+                yield OfficialDocument(entry, filename, body)
+                continue
+        else:
+            rendered = next(rendered_docs)
+
+        error = ""
+        try:
+            if rendered.error:
+                raise RuntimeError(rendered.error)
+            digest = hashes[pos] if manifest is not None else ""
+            if saver is not None:
+                saver.submit(filename, partial(save, key, filename, rendered.docx, digest))
+            else:
+                save(key, filename, rendered.docx, digest)
+        except Exception as e:
+            logging.info(
+                f'Error processing offiical {entry["Last Name"]}, {entry["First Name"]}: {type(e).__name__} - {e}'
+            )
+            error = f"{type(e).__name__} - {e}"
+            if manifest is not None:
+                manifest.discard(key)
+        yield OfficialDocument(entry, filename, rendered.body, error)
+
+    if manifest is not None:
+        if saver is not None:
+            saver.submit("manifest", manifest.save)  # Once all the queued documents are written
+        else:
+            manifest.save()
@@ -0,0 +1,264 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Lookup structures over the loaded RTR data for the data browser
+
+They are built from one version of the data (see RTR.version) and answer the browser's queries
+without scanning the whole data set again.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from rtr_fields import RTR_CLINICS
+
+# Counts shown for each position in the club cross-tab. The sign-off counts are of the officials that
+# are qualified for (and so working towards) the position.
+CROSSTAB_MEASURES = ["Qualified", "Certified", "1 Sign-off", "2 Sign-offs"]
+
+# Most officials returned by a search
+MAX_SEARCH_RESULTS = 100
+
+# Orders the browser can sort the officials in
+SORT_KEYS = ["name", "signoffs", "level"]
+
+# Positions the browser filters on, in long form and the associated short form
+BROWSE_POSITIONS = [
+    ("Introduction to Swimming Officiating", "Intro"),
+    ("Safety Marshal", "Safety"),
+    ("Judge of Stroke/Inspector of Turns (Combo)", "ST"),
+    ("Inspector of Turns", "IT"),
+    ("Judge of Stroke", "JoS"),
+    ("Administration Desk (formerly Clerk of Course) Clinic", "AdminDesk"),
+    ("Chief Timekeeper", "CT"),
+    ("Meet Manager", "MM"),
+    ("Starter", "Starter"),
+    ("Chief Finish Judge/Chief Judge Electronics", "CFJ"),
+    ("Chief Recorder", "ChiefRec"),
+]
+
+
+class OfficialsIndex:
+    """Row positions of the officials for each (club, position, N/Q/C status, registration status)
+
+    The groups for a position are computed the first time it is looked up. Sorting uses the rank of
+    every row in a sort order that is also computed once, so ordering a set of matches is a single
+    integer argsort.
+    """
+
+    def __init__(self, data: pd.DataFrame, version: int):
+        self.version = version
+        self._data = data
+        if data.empty:
+            self._names = self._levels = np.array([], dtype=object)
+        else:
+            self._names = data["Full Name"].astype(str).to_numpy()
+            self._levels = data["Level"].astype(str).to_numpy()
+        self._groups: dict = {}  # position -> {(club, N/Q/C, status): row positions}
+        self._signoffs: dict = {}  # position -> sign-off counts as text
+        self._ranks: dict = {}  # (sort key, position) -> rank of each row
+        self._crosstabs: dict = {}  # (positions, statuses) -> club cross-tab
+
+    def _position_groups(self, position: str) -> dict:
+        if position not in self._groups:
+            status = RTR_CLINICS[position]["status"]
+            self._groups[position] = self._data.groupby(["Club", status, "Status"], sort=False).indices
+            self._signoffs[position] = self._data[RTR_CLINICS[position]["signoffs"]].astype(str).to_numpy()
+        return self._groups[position]
+
+    def lookup(self, club: str, position: str, certs: list, statuses: list) -> np.ndarray:
+        """Row positions (in data order) of the officials of club with any of certs (N, Q or C) for
+        position and any of the registration statuses"""
+        if self._data.empty:
+            return np.array([], dtype=np.intp)
+        groups = self._position_groups(position)
+        parts = [groups[key] for key in ((club, c, s) for c in certs for s in statuses) if key in groups]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(parts))
+
+    def _rank(self, key: str, position: str) -> np.ndarray:
+        cache_key = (key, position if key == "signoffs" else "")
+        if cache_key not in self._ranks:
+            if key == "name":
+                order = np.lexsort(
+                    (self._data["First Name"].astype(str).str.lower(), self._data["Last Name"].astype(str).str.lower())
+                )
+            elif key == "signoffs":
+                order = np.argsort(self._data[RTR_CLINICS[position]["signoffs"]].to_numpy(), kind="stable")
+            else:
+                order = np.argsort(self._data["Level"].to_numpy(), kind="stable")
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            self._ranks[cache_key] = rank
+        return self._ranks[cache_key]
+
+    def sort(self, positions: np.ndarray, key: str, position: str, descending: bool = False) -> np.ndarray:
+        """Return positions ordered by one of the SORT_KEYS, sign-offs are those for position"""
+        if len(positions) == 0:
+            return positions
+        rank = self._rank(key, position)[positions]
+        return positions[np.argsort(-rank if descending else rank)]
+
+    def grid_columns(self, position: str, positions: np.ndarray) -> list:
+        """Name, sign-offs for position and level of the officials at positions, as text arrays"""
+        if len(positions) == 0:
+            return [[], [], []]
+        self._position_groups(position)
+        return [self._names[positions], self._signoffs[position][positions], self._levels[positions]]
+
+    def crosstab(self, positions: list, statuses: list) -> pd.DataFrame:
+        """Counts of the CROSSTAB_MEASURES for every club (rows) and position (columns) among the
+        officials with one of the registration statuses.
+
+        The columns are (position, measure) pairs. All the counts come from a single groupby on the
+        club, the result is kept for the next call with the same positions and statuses.
+        """
+        cache_key = (tuple(positions), tuple(statuses))
+        if cache_key not in self._crosstabs:
+            columns = pd.MultiIndex.from_product([positions, CROSSTAB_MEASURES])
+            if self._data.empty:
+                self._crosstabs[cache_key] = pd.DataFrame(columns=columns, dtype=int)
+                return self._crosstabs[cache_key]
+            data = self._data[self._data["Status"].isin(statuses)]
+            counts = {}
+            for position in positions:
+                status = data[RTR_CLINICS[position]["status"]]
+                signoffs = data[RTR_CLINICS[position]["signoffs"]]
+                qualified = status == "Q"
+                counts[(position, "Qualified")] = qualified
+                counts[(position, "Certified")] = status == "C"
+                counts[(position, "1 Sign-off")] = qualified & (signoffs == 1)
+                counts[(position, "2 Sign-offs")] = qualified & (signoffs >= 2)
+            table = pd.DataFrame(counts, index=data.index).astype(int).groupby(data["Club"]).sum()
+            self._crosstabs[cache_key] = table.reindex(columns=columns)
+        return self._crosstabs[cache_key]
+
+    def rows(self, positions: np.ndarray) -> pd.DataFrame:
+        return self._data.iloc[positions]
+
+
+def crosstab_export(table: pd.DataFrame) -> pd.DataFrame:
+    """Flatten a club cross-tab for export, a Club column then one "position measure" column per count"""
+    flat = table.copy()
+    flat.columns = [f"{position} {measure}" for position, measure in table.columns]
+    return flat.rename_axis("Club").reset_index()
+
+
+class OfficialsSearch:
+    """Find officials by name or Registration Id as the user types
+
+    Every word of an official's name and their Registration Id go into one sorted key array, the
+    keys starting with a prefix are found with two binary searches. Officials are stored by their
+    rank in name order so the matches of a query are marked in a flag array and read back already
+    sorted. A query of several words matches the officials that have a word starting with each of
+    them. Registration Ids are also held in a dictionary for exact lookups. Results are row positions
+    in the data.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self._registration_ids: dict = {}
+        self._keys: list = []
+        self._ranks = np.array([], dtype=np.intp)
+        self._by_name = np.array([], dtype=np.intp)
+        if data.empty:
+            return
+
+        positions = np.arange(len(data))
+        names = data["Full Name"].astype(str).str.lower().to_numpy()
+        registration_ids = data["Registration Id"].astype(str).str.strip().to_numpy()
+        for position, registration_id in zip(positions, registration_ids):
+            self._registration_ids.setdefault(registration_id, []).append(position)
+
+        self._by_name = np.argsort(names, kind="stable")
+        rank = np.empty(len(data), dtype=np.intp)
+        rank[self._by_name] = positions
+
+        words = pd.Series(names, index=rank).str.split(r"[\s,]+").explode()
+        words = words[words.str.len() > 0]
+        keys = pd.concat([words, pd.Series(registration_ids, index=rank)]).sort_values(kind="stable")
+        self._keys = keys.tolist()
+        self._ranks = keys.index.to_numpy()
+
+    def _prefix(self, prefix: str) -> np.ndarray:
+        """Name ranks of the officials with a key starting with prefix (may repeat)"""
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\uffff", start)
+        return self._ranks[start:end]
+
+    def find_registration_id(self, registration_id: str) -> list:
+        """Row positions of an exact Registration Id"""
+        return self._registration_ids.get(registration_id.strip(), [])
+
+    def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> np.ndarray:
+        """Row positions of the first limit officials matching query, in name order"""
+        words = query.lower().replace(",", " ").split()
+        if not words or not self._keys:
+            return np.array([], dtype=np.intp)
+        if len(words) == 1 and words[0].isdigit():
+            # A complete Registration Id, anything shorter is still matched as a prefix
+            exact = self.find_registration_id(words[0])
+            if exact:
+                return np.array(exact[:limit], dtype=np.intp)
+        found = np.zeros(len(self._by_name), dtype=bool)
+        found[self._prefix(words[0])] = True
+        for word in words[1:]:
+            matches = np.zeros_like(found)
+            matches[self._prefix(word)] = True
+            found &= matches
+        return self._by_name[np.flatnonzero(found)[:limit]]
+
+
+def format_record(entry: pd.Series) -> str:
+    """An official's full certification record as text"""
+    lines = [
+        f'{entry["Full Name"]} (SNC ID # {entry["Registration Id"]})',
+        f'Club: {entry["Club"]} ({entry["ClubCode"]})',
+        f'Status: {entry["Status"]}',
+        "Certification Level: "
+        + ("NONE" if pd.isnull(entry["Current_CertificationLevel"]) else str(entry["Current_CertificationLevel"])),
+        "",
+    ]
+    for clinic in RTR_CLINICS.values():
+        line = f'{clinic["hasClinic"]}: {entry[clinic["hasClinic"]]}'
+        if "status" in clinic:
+            line += f' - Status {entry[clinic["status"]]}, {entry[clinic["signoffs"]]} sign-off(s)'
+        lines.append(line)
+        details = [f'Clinic {entry[clinic["clinicDate"]]}'] + [
+            f"Sign-off #{k + 1} {entry[field]}" for k, field in enumerate(clinic["deckEvals"])
+        ]
+        lines.append("    " + ", ".join(str(detail) for detail in details))
+    lines.append("")
+    lines.extend(
+        f"{label}: {entry[column]}"
+        for label, column in [
+            ("Certified Official", "NP_Official"),
+            ("Referee 1", "NP_Ref1"),
+            ("Referee 2", "NP_Ref2"),
+            ("Starter 1", "NP_Starter1"),
+            ("Starter 2", "NP_Starter2"),
+            ("Meet Manager 1", "NP_MM1"),
+            ("Meet Manager 2", "NP_MM2"),
+        ]
+    )
+    return "\n".join(lines)
@@ -25,24 +25,30 @@
 import logging
 import os
 from datetime import datetime
-from threading import Thread
+from functools import partial
 from tkinter import BooleanVar, StringVar, filedialog
-
+from typing import Optional
 
 import customtkinter as ctk  # type: ignore
-import docx  # type: ignore
 import pandas as pd
 from docx import Document  # type: ignore
-from docx.shared import Inches  # type: ignore
-from docxcompose.composer import Composer  # type: ignore
-from slugify import slugify
 
 # Appliction Specific Imports
+from batch_docs import ALL_CLUBS, Generate_Batch
 from config import AnalyzerConfig
 from CTkMessagebox import CTkMessagebox  # type: ignore
+from data_export import EXPORT_FILETYPES, export_data
+from np_warnings import dump_warnings, find_warnings
+from odp_report import select_club_officials
+from official_docs import DocumentBundle, bundle_filename
+from pathway_report import PATHWAY_CSV_COLUMNS, NewPathway
+from report_backends import DocxBackend
+from report_writer import BackgroundWriter, failure_summary
 from rtr import RTR
+from rtr_loader import status_values
 from tooltip import ToolTip
-from ui_common import Officials_Status_Frame
+from task_runner import Task, watch_task
+from ui_common import Officials_Status_Frame, Task_Progress
 
 
 class Pathway_Documents_Frame(ctk.CTkFrame):
@@ -107,6 +113,30 @@ class Pathway_Documents_Frame(ctk.CTkFrame):
         ToolTip(btn3, text="Set report file name")
         ctk.CTkLabel(filesframe, textvariable=self._np_report_file).grid(column=1, row=2, sticky="w", padx=(0, 10))
 
+        self._incremental_docs_var = BooleanVar(filesframe, value=self._config.get_bool("incremental_docs"))
+        incremental_switch = ctk.CTkSwitch(
+            filesframe,
+            text="Only Update Changed Documents",
+            variable=self._incremental_docs_var,
+            onvalue=True,
+            offvalue=False,
+            command=self._handle_incremental_docs,
+        )
+        incremental_switch.grid(column=0, row=3, columnspan=2, sticky="w", padx=10, pady=10)
+        ToolTip(incremental_switch, text="Keep documents for officials whose data has not changed since the last run")
+
+        self._bundle_docs_var = BooleanVar(filesframe, value=self._config.get_bool("bundle_docs"))
+        bundle_switch = ctk.CTkSwitch(
+            filesframe,
+            text="Bundle Documents in a Zip File",
+            variable=self._bundle_docs_var,
+            onvalue=True,
+            offvalue=False,
+            command=self._handle_bundle_docs,
+        )
+        bundle_switch.grid(column=0, row=4, columnspan=2, sticky="w", padx=10, pady=10)
+        ToolTip(bundle_switch, text="Save the individual documents and email list as one zip file next to the report")
+
         # Add Command Button
 
         ctk.CTkLabel(buttonsframe, text="Actions").grid(column=0, row=0, sticky="w", padx=10)
@@ -114,22 +144,28 @@ class Pathway_Documents_Frame(ctk.CTkFrame):
         self.reports_btn = ctk.CTkButton(buttonsframe, text="Generate Reports", command=self._handle_reports_btn)
         self.reports_btn.grid(column=0, row=1, sticky="news", padx=10, pady=10)
 
-        self.bar = ctk.CTkProgressBar(master=buttonsframe, orientation="horizontal", mode="indeterminate")
+        self.bar = Task_Progress(buttonsframe)
 
         # Register Callback
         self._rtr.register_update_callback(self.refresh_club_list)
 
     def refresh_club_list(self):
-        self._club_list = ["None"]
+        self._club_list = ["None", ALL_CLUBS]
         self._club_list = self._club_list + [club[1] for club in self._rtr.club_list_names]
 
         self.club_dropdown.configure(values=self._club_list)
-        if len(self._club_list) == 2:  # There is only one club loaded, change default
-            self.club_dropdown.set(self._club_list[1])
+        if len(self._club_list) == 3:  # There is only one club loaded, change default
+            self.club_dropdown.set(self._club_list[2])
         else:
             self.club_dropdown.set(self._club_list[0])
         logging.info("New Pathway Module - Club List Refreshed")
 
+    def _handle_incremental_docs(self, *_arg) -> None:
+        self._config.set_bool("incremental_docs", self._incremental_docs_var.get())
+
+    def _handle_bundle_docs(self, *_arg) -> None:
+        self._config.set_bool("bundle_docs", self._bundle_docs_var.get())
+
     def _handle_report_dir_browse(self) -> None:
         directory = filedialog.askdirectory()
         if len(directory) == 0:
@@ -166,22 +202,32 @@ class Pathway_Documents_Frame(ctk.CTkFrame):
             CTkMessagebox(master=self, title="Error", message="Select a club first", icon="cancel", corner_radius=0)
             return
         self.buttons("disabled")
-        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="s")
-        self.bar.set(0)
-        self.bar.start()
-        reports_thread = Generate_Reports(self._rtr, self._config, club)
-        reports_thread.start()
-        self.monitor_reports_thread(reports_thread)
-
-    def monitor_reports_thread(self, thread):
-        if thread.is_alive():
-            # check the thread every 100ms
-            self.after(100, lambda: self.monitor_reports_thread(thread))
+        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="ew")
+        self.bar.reset()
+        if club == ALL_CLUBS:
+            # Every club into its own subfolder, progress is counted in clubs
+            reports_thread = Generate_Batch("pathway", self._rtr.rtr_data, self._rtr.club_list_names, self._config)
         else:
-            self.buttons("enabled")
-            self.bar.stop()
-            self.bar.grid_forget()
-            thread.join()
+            reports_thread = Generate_Reports(self._rtr, self._config, club)
+        watch_task(self, reports_thread, self.bar.show_event, self._reports_finished)
+
+    def _reports_finished(self, thread: Task) -> None:
+        self.buttons("enabled")
+        self.bar.grid_forget()
+        if isinstance(thread, Generate_Batch):
+            summary = failure_summary(thread.failures)
+            CTkMessagebox(
+                master=self,
+                title="Reports",
+                message="Reports complete for all clubs" if summary is None else summary,
+                icon="check" if summary is None else "warning",
+                option_1="OK",
+                corner_radius=0,
+            )
+        elif isinstance(thread, Generate_Reports) and thread.summary is not None:
+            CTkMessagebox(
+                master=self, title="Reports", message=thread.summary, icon="warning", option_1="OK", corner_radius=0
+            )
 
 
 class Pathway_ROR_Frame(ctk.CTkFrame):
@@ -256,7 +302,7 @@ class Pathway_ROR_Frame(ctk.CTkFrame):
         self.reports_btn = ctk.CTkButton(buttonsframe, text="Generate Reports", command=self._handle_reports_btn)
         self.reports_btn.grid(column=0, row=0, sticky="ew", padx=20, pady=10)
 
-        self.bar = ctk.CTkProgressBar(master=buttonsframe, orientation="horizontal", mode="indeterminate")
+        self.bar = Task_Progress(buttonsframe)
 
     def buttons(self, newstate) -> None:
         """Enable/disable all buttons on the UI"""
@@ -282,15 +328,15 @@ class Pathway_ROR_Frame(ctk.CTkFrame):
 
     def _handle_csv_browse(self) -> None:
         report_file = filedialog.asksaveasfilename(
-            filetypes=[("CSV Files", "*.csv")],
+            filetypes=EXPORT_FILETYPES,
             defaultextension=".csv",
             title="CSV Filename",
-            initialfile=os.path.basename(self._report_file.get()),
+            initialfile=os.path.basename(self._report_csv.get()),
         )
         if len(report_file) == 0:
             return
         self._config.set_str("np_report_file_csv", report_file)
-        self._report_file.set(report_file)
+        self._report_csv.set(report_file)
 
     def _handle_reports_btn(self) -> None:
         if self._rtr.rtr_data.empty:
@@ -298,31 +344,23 @@ class Pathway_ROR_Frame(ctk.CTkFrame):
             CTkMessagebox(master=self, title="Error", message="Load RTR Data First", icon="cancel", corner_radius=0)
             return
         self.buttons("disabled")
-        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="s")
-        self.bar.set(0)
-        self.bar.start()
+        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="ew")
+        self.bar.reset()
         reports_thread = _Generate_NP_ROR_Reports(self._rtr, self._config)
-        reports_thread.start()
-        self.monitor_reports_thread(reports_thread)
+        watch_task(self, reports_thread, self.bar.show_event, self._reports_finished)
 
-    def monitor_reports_thread(self, thread) -> None:
-        if thread.is_alive():
-            # check the thread every 100ms
-            self.after(100, lambda: self.monitor_reports_thread(thread))
-        else:
-            self.bar.stop()
-            self.bar.grid_forget()
-            self.buttons("enabled")
-            thread.join()
+    def _reports_finished(self, _thread: Task) -> None:
+        self.bar.grid_forget()
+        self.buttons("enabled")
 
 
-class _Generate_NP_ROR_Reports(Thread):
+class _Generate_NP_ROR_Reports(Task):
     def __init__(self, rtr: RTR, config: AnalyzerConfig):
         super().__init__()
         self._rtr: pd.DataFrame = rtr.rtr_data
         self._config: AnalyzerConfig = config
 
-    def run(self):
+    def run_task(self):
         logging.info("Reporting in Progress...")
 
         self._report_file = self._config.get_str("np_ror_file_docx")
@@ -330,52 +368,18 @@ class _Generate_NP_ROR_Reports(Thread):
 
         _gen_np_warnings = self._config.get_bool("gen_np_warnings")
         _gen_np_csv = self._config.get_bool("gen_np_csv")
+        stages = 1 + _gen_np_csv + _gen_np_warnings
+        self.stage("Selecting officials", 0, stages)
 
-        status_values = ["Active"]
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
-
-        self._rtr_filtered = self._rtr[self._rtr["Status"].isin(status_values)]
+        self._rtr_filtered = self._rtr[self._rtr["Status"].isin(status_values(self._config))]
 
         report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
 
         if _gen_np_csv:
             logging.info("Generating CSV Report")
-            key_columns = [
-                "Registration Id",
-                "First Name",
-                "Last Name",
-                "Club",
-                "Region",
-                "Province",
-                "Status",
-                "Current_CertificationLevel",
-                "Intro_Status",
-                "ST_Status",
-                "IT_Status",
-                "JoS_Status",
-                "CT_Status",
-                "Admin_Status",
-                "MM_Status",
-                "Starter_Status",
-                "CFJ_Status",
-                "ChiefRec_Status",
-                "Referee_Status",
-                "Para Swimming eModule",
-                "NP_Official",
-                "NP_Ref1",
-                "NP_Ref2",
-                "NP_Starter1",
-                "NP_Starter2",
-                "NP_MM1",
-                "NP_MM2",
-            ]
+            self.stage("CSV report", 1, stages)
             try:
-                self._rtr_filtered.to_csv(self._report_csv, columns=key_columns, index=False)
+                export_data(self._rtr_filtered, self._report_csv, PATHWAY_CSV_COLUMNS)
             except Exception as e:
                 logging.info("Unable to save CSV file: {}".format(type(e).__name__))
                 logging.info("Exception message: {}".format(e))
@@ -384,285 +388,36 @@ class _Generate_NP_ROR_Reports(Thread):
             logging.info("CSV Report Complete")
 
         if _gen_np_warnings:
-            doc = Document()
             logging.info("Generating Warnings Report")
+            self.stage("Warnings report", stages - 1, stages)
+            warnings_table = find_warnings(self._rtr_filtered)
+            logging.info(f"{len(warnings_table)} warning(s) for {len(self._rtr_filtered)} officials")
 
-            #           Place holder for warnings report
-            doc.add_heading("Warnings Report", 0)
-            doc.add_paragraph("Report Generated: " + report_time)
+            report = DocxBackend()
+            dump_warnings(report, warnings_table, len(self._rtr_filtered), report_time)
 
-        try:
-            doc.save(self._report_file)
-        except Exception as e:
-            logging.info("Unable to save full report: {}".format(type(e).__name__))
-            logging.info("Exception message: {}".format(e))
-            CTkMessagebox(title="Error", message="Unable to save full report file", icon="cancel", corner_radius=0)
+            try:
+                report.save(self._report_file)
+            except Exception as e:
+                logging.info("Unable to save full report: {}".format(type(e).__name__))
+                logging.info("Exception message: {}".format(e))
+                CTkMessagebox(title="Error", message="Unable to save full report file", icon="cancel", corner_radius=0)
 
         CTkMessagebox(title="Reports", message="Reports complete", icon="check", option_1="OK", corner_radius=0)
 
         logging.info("Reports Complete")
 
 
-class NewPathway:
-    def __init__(self, club: str, club_data_set: pd.DataFrame, config: AnalyzerConfig, **kwargs):
-        self._club_data = club_data_set.copy()
-        self.club_code = club
-        self._config = config
-
-    def _is_valid_date(self, date_string) -> bool:
-        if pd.isnull(date_string):
-            return False
-        if date_string == "0001-01-01":
-            return False
-        try:
-            datetime.strptime(date_string, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
-
-    def _get_date(self, date_string) -> str:
-        if pd.isnull(date_string):
-            return ""
-        if date_string == "0001-01-01":
-            return ""
-        return date_string
-
-    def _count_signoffs(self, clinic_date_1, clinic_date_2) -> int:
-        count = 0
-        if self._is_valid_date(clinic_date_1):
-            count += 1
-        if self._is_valid_date(clinic_date_2):
-            count += 1
-        return count
-
-    def add_clinic(self, table, clinic_name, clinic_date, signoff_1, signoff_2) -> None:
-        row = table.add_row().cells
-        row[0].text = clinic_name
-        row[1].text = self._get_date(clinic_date)
-        row[2].text = self._get_date(signoff_1)
-        row[3].text = self._get_date(signoff_2)
-        row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-        row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-        row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-        row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTERAdmin_Status
-
-    def add_pathway(self, table, pathway_progression, certified) -> None:
-        row = table.add_row().cells
-        row[0].text = pathway_progression
-        row[1].text = certified
-        row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-        row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-
-    def export_csv(self, filename: str) -> None:
-        """Export the club data to a CSV file"""
-
-        key_columns = [
-            "Registration Id",
-            "First Name",
-            "Last Name",
-            "Club",
-            "Region",
-            "Province",
-            "Status",
-            "Current_CertificationLevel",
-            "Intro_Status",
-            "ST_Status",
-            "IT_Status",
-            "JoS_Status",
-            "CT_Status",
-            "Admin_Status",
-            "MM_Status",
-            "Starter_Status",
-            "CFJ_Status",
-            "ChiefRec_Status",
-            "Referee_Status",
-            "Para Swimming eModule",
-            "NP_Official",
-            "NP_Ref1",
-            "NP_Ref2",
-            "NP_Starter1",
-            "NP_Starter2",
-            "NP_MM1",
-            "NP_MM2",
-        ]
-        try:
-            self._club_data.to_csv(filename, columns=key_columns, index=False)
-        except Exception as e:
-            logging.info("Unable to save CSV file: {}".format(type(e).__name__))
-            logging.info("Exception message: {}".format(e))
-            CTkMessagebox(title="Error", message="Unable to save CSV file", icon="cancel", corner_radius=0)
-
-    def dump_data_docx(self, club_fullname: str, reportdate: str) -> list:
-        """Produce the Word Document for the club and return a list of files"""
-
-        _report_directory = self._config.get_str("np_report_directory")
-        _email_list_csv = self._config.get_str("email_list_csv")
-        csv_list = []  # CSV entries for email list (Lastname, Firstname, E-Mail address and Filename)
-
-        for index, entry in self._club_data.iterrows():
-            # create a filename from the last and firstnames using slugify and the report directory
-
-            filename = os.path.abspath(
-                os.path.join(_report_directory, slugify(entry["Last Name"] + "_" + entry["First Name"]) + ".docx")
-            )
-            csv_list.append([entry["Last Name"], entry["First Name"], entry["Email"], filename])
-
-            doc = Document()
-
-            doc.add_heading("2023/24 New Pathway Mapping", 0)
-
-            p = doc.add_paragraph()
-            p.add_run("Report Date: " + reportdate)
-            p.add_run(
-                "\n\nName: "
-                + entry["Last Name"]
-                + ", "
-                + entry["First Name"]
-                + " (SNC ID # "
-                + entry["Registration Id"]
-                + ")"
-            )
-            p.add_run("\n\nClub: " + club_fullname + " (" + self.club_code + ")")
-            p.add_run("\n\nCurrent Certification Level: ")
-            p.add_run(
-                "NONE" if pd.isnull(entry["Current_CertificationLevel"]) else entry["Current_CertificationLevel"]
-            )
-
-            table = doc.add_table(rows=1, cols=4)
-            row = table.rows[0].cells
-            row[0].text = "Clinic"
-            row[1].text = "Clinic Date"
-            row[2].text = "Sign Off #1"
-            row[3].text = "Sign Off #2"
-            row[0].width = Inches(2.0)
-            row[1].width = Inches(1.5)
-            row[2].width = Inches(1.5)
-            row[3].width = Inches(1.5)
-            row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-            row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-            row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-            row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-
-            self.add_clinic(
-                table,
-                "Intro to Swimming",
-                entry["Introduction to Swimming Officiating-ClinicDate"],
-                entry["Introduction to Swimming Officiating-Deck Evaluation #1 Date"],
-                entry["Introduction to Swimming Officiating-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(table, "Safety Marshal", entry["Safety Marshal-ClinicDate"], "N/A", "N/A")
-            self.add_clinic(
-                table,
-                "Stroke & Turn (Pre Sept/23)",
-                entry["Judge of Stroke/Inspector of Turns-ClinicDate"],
-                entry["Judge of Stroke/Inspector of Turns-Deck Evaluation #1 Date"],
-                entry["Judge of Stroke/Inspector of Turns-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Inspector of Turns",
-                entry["Inspector of Turns-ClinicDate"],
-                entry["Inspector of Turns-Deck Evaluation #1 Date"],
-                entry["Inspector of Turns-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Judge of Stroke",
-                entry["Judge of Stroke-ClinicDate"],
-                entry["Judge of Stroke-Deck Evaluation #1 Date"],
-                entry["Judge of Stroke-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Chief Timekeeper",
-                entry["Chief Timekeeper-ClinicDate"],
-                entry["Chief Timekeeper-Deck Evaluation #1 Date"],
-                entry["Chief Timekeeper-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Admin Desk (Clerk)",
-                entry["Administration Desk (formerly Clerk of Course) Clinic-ClinicDate"],
-                entry["Administration Desk (formerly Clerk of Course) Clinic-Deck Evaluation #1 Date"],
-                entry["Administration Desk (formerly Clerk of Course) Clinic-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Meet Manager",
-                entry["Meet Manager-ClinicDate"],
-                entry["Meet Manager-Deck Evaluation #1 Date"],
-                entry["Meet Manager-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Starter",
-                entry["Starter-ClinicDate"],
-                entry["Starter-Deck Evaluation #1 Date"],
-                entry["Starter-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "CFJ/CJE",
-                entry["Chief Finish Judge/Chief Judge-ClinicDate"],
-                entry["Chief Finish Judge/Chief Judge-Deck Evaluation #1 Date"],
-                entry["Chief Finish Judge/Chief Judge-Deck Evaluation #2 Date"],
-            )
-            self.add_clinic(
-                table,
-                "Chief Recorder/Recorder",
-                entry["Chief Recorder and Recorder (formerly Recorder/Scorer) Clinic-ClinicDate"],
-                "N/A",
-                "N/A",
-            )
-            self.add_clinic(table, "Referee", entry["Referee-ClinicDate"], "N/A", "N/A")
-            self.add_clinic(table, "Para eModule", entry["Para Swimming eModule-ClinicDate"], "N/A", "N/A")
-
-            table.style = "Light Grid Accent 5"
-            table.autofit = True
-
-            # Add logic to define pathway progression
-
-            doc.add_heading("New Pathway Progression", 2)
-            nptable = doc.add_table(rows=1, cols=4)
-            row = nptable.rows[0].cells
-            row[0].text = "New Pathway Level"
-            row[1].text = "Certifed?"
-            row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
-            row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
-
-            self.add_pathway(nptable, "Certified Official", entry["NP_Official"])
-            self.add_pathway(nptable, "Referee 1", entry["NP_Ref1"])
-            self.add_pathway(nptable, "Referee 2", entry["NP_Ref2"])
-            self.add_pathway(nptable, "Starter 1", entry["NP_Starter1"])
-            self.add_pathway(nptable, "Starter 2", entry["NP_Starter2"])
-            self.add_pathway(nptable, "Meet Manager 1", entry["NP_MM1"])
-            self.add_pathway(nptable, "Meet Manager 2", entry["NP_MM2"])
-
-            nptable.style = "Light Grid Accent 5"
-            nptable.autofit = True
-
-            # Recommendations to be added here
-
-            try:
-                doc.save(filename)
-
-            except Exception as e:
-                logging.info(
-                    f'Error processing offiical {entry["Last Name"]}, {entry["First Name"]}: {type(e).__name__} - {e}'
-                )
-
-        return csv_list
-
-
-class Generate_Reports(Thread):
+class Generate_Reports(Task):
     def __init__(self, rtr: RTR, config: AnalyzerConfig, selected_club: str):
         super().__init__()
         self._rtr = rtr
         self._df: pd.DataFrame = self._rtr.rtr_data
         self._config: AnalyzerConfig = config
         self._selected_club = selected_club
+        self.summary: Optional[str] = None  # Save failures, None if everything was saved
 
-    def run(self):
+    def run_task(self):
         # This still has code elements to run multiple clubs. For single clubs a simple filter has been applied.
         # Once the final specifications are set, this can be greatly simplified.
 
@@ -678,24 +433,38 @@ class Generate_Reports(Thread):
 
         club_summaries = []
 
-        status_values = ["Active"]
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
-
         report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
 
         all_csv_entries = []
 
+        # The master document is built as we go rather than re-reading every individual file
+        master = Document()
+
+        # Files are saved on a background thread while the next official is rendered
+        saver = BackgroundWriter()
+
+        # Optionally stream the individual documents and the email list into one zip file
+        bundle = None
+        if self._config.get_bool("bundle_docs"):
+            try:
+                bundle = DocumentBundle(bundle_filename(_full_report_file), _report_directory)
+            except Exception as e:
+                logging.info("Unable to create document bundle: {}".format(type(e).__name__))
+                logging.info("Exception message: {}".format(e))
+
         for club, club_full in filter(lambda x: x[1] == self._selected_club, club_list_names):
             logging.info("Processing %s" % club_full)
-            club_data = self._df[(self._df["ClubCode"] == club)]
-            club_data = club_data[club_data["Status"].isin(status_values)]
+            club_data = select_club_officials(self._df, club, self._config)
             club_stat = NewPathway(club, club_data, self._config)
-            club_csv = club_stat.dump_data_docx(club_full, report_time)
+            club_csv = club_stat.dump_data_docx(
+                club_full,
+                report_time,
+                master,
+                self._config.get_int("render_workers"),
+                self.progress,
+                bundle,
+                saver,
+            )
             all_csv_entries.extend(club_csv)
             club_summaries.append([club, club_full, club_stat])
 
@@ -707,29 +476,28 @@ class Generate_Reports(Thread):
         logging.info("Creating email list CSV file")
         email_list_df = pd.DataFrame(all_csv_entries, columns=["Last Name", "First Name", "EMail", "Filename"])
 
-        try:
-            email_list_df.to_csv(_full_csv_file, index=False)
-        except Exception as e:
-            logging.info("Unable to save email list: {}".format(type(e).__name__))
-            logging.info("Exception message: {}".format(e))
+        def save_email_list() -> None:
+            # Runs after every document has been written, leave out the ones that failed
+            failed = [failure.description for failure in saver.failures]
+            saved_df = email_list_df[~email_list_df["Filename"].isin(failed)]
+            if bundle is not None:
+                bundle.write(_full_csv_file, saved_df.to_csv(index=False))
+            else:
+                saved_df.to_csv(_full_csv_file, index=False)
 
-        # Create the master document
+        saver.submit(_full_csv_file, save_email_list)
+        if bundle is not None:
+            saver.submit(bundle.filename, bundle.close)
+
+        # Save the master document
 
         logging.info("Creating master document")
+        self.stage("Saving documents")
+        saver.submit(_full_report_file, partial(master.save, _full_report_file))
 
-        number_of_sections = len(all_csv_entries)
-        master = Document()
-        composer = Composer(master)
-        for i in range(0, number_of_sections):
-            doc_temp = Document(all_csv_entries[i][3])
-            doc_temp.add_page_break()
-            composer.append(doc_temp)
-
-        try:
-            composer.save(_full_report_file)
-        except Exception as e:
-            logging.info("Unable to save full report: {}".format(type(e).__name__))
-            logging.info("Exception message: {}".format(e))
+        self.summary = failure_summary(saver.close())  # Shown once the task has finished, on the Tk thread
+        if self.summary is None and bundle is not None:
+            logging.info("Documents saved to %s" % bundle.filename)
 
         logging.info("Report Complete")
 
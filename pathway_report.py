@@ -0,0 +1,329 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""New pathway mapping documents - no UI dependencies so it can run in worker processes"""
+
+import logging
+from datetime import datetime
+from functools import partial
+from typing import Any, Optional
+
+import docx  # type: ignore
+import pandas as pd
+from docx import Document  # type: ignore
+from docx.shared import Inches  # type: ignore
+
+from config import AnalyzerConfig
+from docx_utils import append_body
+from official_docs import (
+    DocumentBundle,
+    ProgressCallback,
+    RenderedDocument,
+    serialize_document,
+    write_documents,
+)
+from report_manifest import ReportManifest
+from report_writer import BackgroundWriter, SaveFailure
+
+# Bump whenever render_official changes what goes into the document, forces all documents to be rebuilt
+TEMPLATE_VERSION = 1
+
+# Columns of the pathway CSV export
+PATHWAY_CSV_COLUMNS = [
+    "Registration Id",
+    "First Name",
+    "Last Name",
+    "Club",
+    "Region",
+    "Province",
+    "Status",
+    "Current_CertificationLevel",
+    "Intro_Status",
+    "ST_Status",
+    "IT_Status",
+    "JoS_Status",
+    "CT_Status",
+    "Admin_Status",
+    "MM_Status",
+    "Starter_Status",
+    "CFJ_Status",
+    "ChiefRec_Status",
+    "Referee_Status",
+    "Para Swimming eModule",
+    "NP_Official",
+    "NP_Ref1",
+    "NP_Ref2",
+    "NP_Starter1",
+    "NP_Starter2",
+    "NP_MM1",
+    "NP_MM2",
+]
+
+
+def _is_valid_date(date_string) -> bool:
+    if pd.isnull(date_string):
+        return False
+    if date_string == "0001-01-01":
+        return False
+    try:
+        datetime.strptime(date_string, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _get_date(date_string) -> str:
+    if pd.isnull(date_string):
+        return ""
+    if date_string == "0001-01-01":
+        return ""
+    return date_string
+
+
+def _count_signoffs(clinic_date_1, clinic_date_2) -> int:
+    count = 0
+    if _is_valid_date(clinic_date_1):
+        count += 1
+    if _is_valid_date(clinic_date_2):
+        count += 1
+    return count
+
+
+def _add_clinic(table, clinic_name, clinic_date, signoff_1, signoff_2) -> None:
+    row = table.add_row().cells
+    row[0].text = clinic_name
+    row[1].text = _get_date(clinic_date)
+    row[2].text = _get_date(signoff_1)
+    row[3].text = _get_date(signoff_2)
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+
+def _add_pathway(table, pathway_progression, certified) -> None:
+    row = table.add_row().cells
+    row[0].text = pathway_progression
+    row[1].text = certified
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+
+def render_official(entry: Any, club_code: str, club_fullname: str, reportdate: str) -> Document:
+    """Produce the Word Document for a single official"""
+
+    doc = Document()
+
+    doc.add_heading("2023/24 New Pathway Mapping", 0)
+
+    p = doc.add_paragraph()
+    p.add_run("Report Date: " + reportdate)
+    p.add_run(
+        "\n\nName: " + entry["Last Name"] + ", " + entry["First Name"] + " (SNC ID # " + entry["Registration Id"] + ")"
+    )
+    p.add_run("\n\nClub: " + club_fullname + " (" + club_code + ")")
+    p.add_run("\n\nCurrent Certification Level: ")
+    p.add_run("NONE" if pd.isnull(entry["Current_CertificationLevel"]) else entry["Current_CertificationLevel"])
+
+    table = doc.add_table(rows=1, cols=4)
+    row = table.rows[0].cells
+    row[0].text = "Clinic"
+    row[1].text = "Clinic Date"
+    row[2].text = "Sign Off #1"
+    row[3].text = "Sign Off #2"
+    row[0].width = Inches(2.0)
+    row[1].width = Inches(1.5)
+    row[2].width = Inches(1.5)
+    row[3].width = Inches(1.5)
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[2].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+    row[3].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+    _add_clinic(
+        table,
+        "Intro to Swimming",
+        entry["Introduction to Swimming Officiating-ClinicDate"],
+        entry["Introduction to Swimming Officiating-Deck Evaluation #1 Date"],
+        entry["Introduction to Swimming Officiating-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(table, "Safety Marshal", entry["Safety Marshal-ClinicDate"], "N/A", "N/A")
+    _add_clinic(
+        table,
+        "Stroke & Turn (Pre Sept/23)",
+        entry["Judge of Stroke/Inspector of Turns-ClinicDate"],
+        entry["Judge of Stroke/Inspector of Turns-Deck Evaluation #1 Date"],
+        entry["Judge of Stroke/Inspector of Turns-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Inspector of Turns",
+        entry["Inspector of Turns-ClinicDate"],
+        entry["Inspector of Turns-Deck Evaluation #1 Date"],
+        entry["Inspector of Turns-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Judge of Stroke",
+        entry["Judge of Stroke-ClinicDate"],
+        entry["Judge of Stroke-Deck Evaluation #1 Date"],
+        entry["Judge of Stroke-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Chief Timekeeper",
+        entry["Chief Timekeeper-ClinicDate"],
+        entry["Chief Timekeeper-Deck Evaluation #1 Date"],
+        entry["Chief Timekeeper-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Admin Desk (Clerk)",
+        entry["Administration Desk (formerly Clerk of Course) Clinic-ClinicDate"],
+        entry["Administration Desk (formerly Clerk of Course) Clinic-Deck Evaluation #1 Date"],
+        entry["Administration Desk (formerly Clerk of Course) Clinic-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Meet Manager",
+        entry["Meet Manager-ClinicDate"],
+        entry["Meet Manager-Deck Evaluation #1 Date"],
+        entry["Meet Manager-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Starter",
+        entry["Starter-ClinicDate"],
+        entry["Starter-Deck Evaluation #1 Date"],
+        entry["Starter-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "CFJ/CJE",
+        entry["Chief Finish Judge/Chief Judge-ClinicDate"],
+        entry["Chief Finish Judge/Chief Judge-Deck Evaluation #1 Date"],
+        entry["Chief Finish Judge/Chief Judge-Deck Evaluation #2 Date"],
+    )
+    _add_clinic(
+        table,
+        "Chief Recorder/Recorder",
+        entry["Chief Recorder and Recorder (formerly Recorder/Scorer) Clinic-ClinicDate"],
+        "N/A",
+        "N/A",
+    )
+    _add_clinic(table, "Referee", entry["Referee-ClinicDate"], "N/A", "N/A")
+    _add_clinic(table, "Para eModule", entry["Para Swimming eModule-ClinicDate"], "N/A", "N/A")
+
+    table.style = "Light Grid Accent 5"
+    table.autofit = True
+
+    # Add logic to define pathway progression
+
+    doc.add_heading("New Pathway Progression", 2)
+    nptable = doc.add_table(rows=1, cols=4)
+    row = nptable.rows[0].cells
+    row[0].text = "New Pathway Level"
+    row[1].text = "Certifed?"
+    row[0].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT
+    row[1].paragraphs[0].alignment = docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER
+
+    _add_pathway(nptable, "Certified Official", entry["NP_Official"])
+    _add_pathway(nptable, "Referee 1", entry["NP_Ref1"])
+    _add_pathway(nptable, "Referee 2", entry["NP_Ref2"])
+    _add_pathway(nptable, "Starter 1", entry["NP_Starter1"])
+    _add_pathway(nptable, "Starter 2", entry["NP_Starter2"])
+    _add_pathway(nptable, "Meet Manager 1", entry["NP_MM1"])
+    _add_pathway(nptable, "Meet Manager 2", entry["NP_MM2"])
+
+    nptable.style = "Light Grid Accent 5"
+    nptable.autofit = True
+
+    # Recommendations to be added here
+
+    return doc
+
+
+def _render_official_job(club_code: str, club_fullname: str, reportdate: str, entry: Any) -> RenderedDocument:
+    """Worker process entry point"""
+    return serialize_document(render_official(entry, club_code, club_fullname, reportdate))
+
+
+class NewPathway:
+    def __init__(self, club: str, club_data_set: pd.DataFrame, config: AnalyzerConfig, **kwargs):
+        self._club_data = club_data_set.copy()
+        self.club_code = club
+        self._config = config
+        self.failures: list = []  # SaveFailure for each official whose document was not produced
+
+    def officials(self) -> pd.DataFrame:
+        """The officials a document is produced for, as they are given to render_official"""
+        return self._club_data
+
+    def export_csv(self, filename: str) -> None:
+        """Export the club data to a CSV file"""
+
+        try:
+            self._club_data.to_csv(filename, columns=PATHWAY_CSV_COLUMNS, index=False)
+        except Exception as e:
+            logging.info("Unable to save CSV file: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+
+    def dump_data_docx(
+        self,
+        club_fullname: str,
+        reportdate: str,
+        master: Optional[Document] = None,
+        workers: int = 1,
+        progress: Optional[ProgressCallback] = None,
+        bundle: Optional[DocumentBundle] = None,
+        saver: Optional[BackgroundWriter] = None,
+    ) -> list:
+        """Produce the Word Document for each official and return a list of files
+
+        If a master document is supplied each official's report is also appended to it so the
+        consolidated report never has to be re-read from disk. The documents are rendered on up to
+        workers processes (0 = automatic), progress is called with (done, total) as each one completes.
+        With incremental_docs set only officials whose data changed since the last run are rendered.
+        If a bundle is supplied the documents are written into it instead of the report directory.
+        With a saver the documents are written on its thread, save failures are recorded there.
+        """
+
+        _report_directory = self._config.get_str("np_report_directory")
+        csv_list = []  # CSV entries for email list (Lastname, Firstname, E-Mail address and Filename)
+
+        manifest = None
+        if bundle is None and self._config.get_bool("incremental_docs"):
+            manifest = ReportManifest(_report_directory, "pathway", TEMPLATE_VERSION)
+        render = partial(_render_official_job, self.club_code, club_fullname, reportdate)
+        context = (self.club_code, club_fullname)
+
+        for official in write_documents(
+            self._club_data, _report_directory, render, workers, progress, manifest, context, bundle, saver
+        ):
+            entry = official.entry
+            if official.error:
+                self.failures.append(SaveFailure(official.filename, official.error))
+            csv_list.append([entry["Last Name"], entry["First Name"], entry["Email"], official.filename])
+
+            if master is not None and official.body:
+                append_body(master, official.body)
+
+        return csv_list
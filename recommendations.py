@@ -0,0 +1,161 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Officials development recommendations
+
+The rules that decide what an official should do next are evaluated for a whole set of officials
+at once, producing one table with a row per recommendation. The Word documents, CSV/JSON exports
+and the on-screen preview all read that table.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Recommendation codes and the text shown for them, {count} is the number of sign-offs still needed
+RECOMMENDATIONS = {
+    "TAKE_INTRO": "Take Introduction to Swimming Officiating Clinic",
+    "TIMER_SIGNOFFS": "Obtain {count} sign-off(s) as a Timer",
+    "TAKE_SAFETY": "Take Safety Marshal Clinc",
+    "TAKE_IT": "Take Inspector of Turns Clinic and obtain 2 sign-offs",
+    "TAKE_JOS": "Take Judge of Stroke Clinic",
+    "JOS_SIGNOFF": "Obtain 1 sign-off as Judge of Stroke",
+    "IT_SIGNOFFS": "Obtain {count} sign-off(s) as Inspector of Turns",
+    "TAKE_LEVEL_II": "Take a Level II clinic (CT, MM, CFJ/CJE, Admin Desk or Starter) and obtain sign-offs",
+    "LEVEL_II_SIGNOFFS": "Obtain sign-offs on at least 1 Level II clinic (CT, MM, CFJ/CJE, Admin Desk or Starter)",
+}
+
+# Columns identifying the official that are carried into the recommendations table
+ID_COLUMNS = ["Registration Id", "Last Name", "First Name", "Level"]
+
+LEVEL_II_CLINICS = ["CT", "Admin", "MM", "Starter", "CFJ"]
+
+
+def _rules(data: pd.DataFrame) -> list:
+    """Return (code, mask, count) for every recommendation in the order they are listed.
+
+    count is the series of sign-offs still needed or None. An official can get the same
+    recommendation from more than one rule (e.g. Timer sign-offs), that is preserved.
+    """
+    intro = data["Intro_Count"]
+    it = data["IT_Count"]
+    jos = data["JoS_Count"]
+    combo = data["ST_Count"]
+
+    level_0 = data["Level"] == 0
+    no_intro = data["Intro_Status"] == "N"
+    timers_needed = intro < 2
+
+    # Level I officials with at least one Timer sign-off get a path to Level II
+    level_1 = (data["Level"] == 1) & (intro > 0)
+    no_combo = data["ST_Status"] == "N"  # They don't have the (legacy) combo clinic
+    no_it = data["IT_Status"] == "N"
+    needs_jos_clinic = (data["JoS_Status"] == "N") & ~no_it  # They have the new IT clinic but not the JoS clinic
+
+    # They have completed or nearly completed the "core" requirements, 3 of the 5 sign-offs
+    core = (intro + combo + jos >= 3) | (intro + it + jos >= 3)
+    no_level_2_clinic = np.logical_and.reduce([data[f"{clinic}_Status"] == "N" for clinic in LEVEL_II_CLINICS])
+    level_2_signed_off = np.logical_or.reduce([data[f"{clinic}_Count"] == 2 for clinic in LEVEL_II_CLINICS])
+
+    return [
+        # No Level officials - what they need to get to Level I
+        ("TAKE_INTRO", level_0 & no_intro, None),
+        ("TIMER_SIGNOFFS", level_0 & ~no_intro & timers_needed, 2 - intro),
+        ("TAKE_SAFETY", level_0 & (data["Safety_Status"] == "N"), None),
+        # Level I officials. With the addition of the separated clinics the logic is:
+        # Combo clinic - 2 sign offs - Recommend JoS sign-off if they don't have one.
+        # Combo clinic - < 2 sign offs - Recommend IT sign-offs + JoS sign-off
+        # Split clinic - # of needed IT sign offs if < 2
+        # Split clinic - Take JoS if they don't have it and have at least 1 IT sign-off
+        # Split Clinic - JoS Sign-off if still need it
+        # If they have most of the sign-offs tell them to take a L2 clinic. 3 out of the 5 needed signoffs.
+        ("TIMER_SIGNOFFS", level_1 & timers_needed, 2 - intro),
+        ("TAKE_IT", level_1 & no_combo & no_it, None),
+        ("TIMER_SIGNOFFS", level_1 & no_combo & ~no_it & timers_needed, 2 - intro),
+        ("TAKE_JOS", level_1 & no_combo & needs_jos_clinic, None),
+        ("JOS_SIGNOFF", level_1 & no_combo & ~needs_jos_clinic & (jos == 0), None),
+        ("IT_SIGNOFFS", level_1 & ~no_combo & (combo < 2), 2 - combo),
+        ("JOS_SIGNOFF", level_1 & ~no_combo & (combo > 0) & (jos == 0), None),
+        ("TAKE_LEVEL_II", level_1 & core & no_level_2_clinic, None),
+        ("LEVEL_II_SIGNOFFS", level_1 & core & ~no_level_2_clinic & ~level_2_signed_off, None),
+        # Everyone else still short on Timer sign-offs
+        ("TIMER_SIGNOFFS", ~level_1 & timers_needed, 2 - intro),
+    ]
+
+
+def recommend(data: pd.DataFrame) -> pd.DataFrame:
+    """Compute the recommendations for every official in data.
+
+    Returns a table indexed by the position of the official in data with one row per recommendation,
+    in the order they are to be listed for each official. Columns are ID_COLUMNS plus Order, Code,
+    Count and Recommendation. Officials with nothing to do have no rows.
+    """
+    # By position, the labels are not unique once several exports have been merged
+    data = data.reset_index(drop=True)
+    parts = []
+    for order, (code, mask, count) in enumerate(_rules(data)):
+        mask = np.asarray(mask, dtype=bool)
+        if not mask.any():
+            continue
+        part = data.loc[mask, ID_COLUMNS].copy()
+        part["Order"] = order
+        part["Code"] = code
+        if count is None:
+            part["Count"] = ""
+            part["Recommendation"] = RECOMMENDATIONS[code]
+        else:
+            part["Count"] = count[mask].astype(str)
+            part["Recommendation"] = [RECOMMENDATIONS[code].format(count=n) for n in part["Count"]]
+        part["_position"] = part.index
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=ID_COLUMNS + ["Order", "Code", "Count", "Recommendation"])
+
+    table = pd.concat(parts).sort_values(["_position", "Order"], kind="stable")
+    table["Order"] = table.groupby("_position").cumcount() + 1
+    return table.drop(columns="_position")
+
+
+def recommendation_text(table: pd.DataFrame, officials: int) -> np.ndarray:
+    """The recommendations of each of the officials as newline separated text, in position order"""
+    text = table.groupby(level=0, sort=False)["Recommendation"].agg("\n".join)
+    return text.reindex(range(officials)).fillna("").to_numpy()
+
+
+def export_recommendations(table: pd.DataFrame, filename: str) -> None:
+    """Save the recommendations table, as JSON if filename ends in .json and CSV otherwise"""
+    if filename.lower().endswith(".json"):
+        table.to_json(filename, orient="records", indent=2)
+    else:
+        table.to_csv(filename, index=False)
+
+
+def format_recommendations(table: pd.DataFrame) -> str:
+    """Plain text listing of the recommendations for on-screen display"""
+    lines = []
+    for _, official in table.groupby(level=0, sort=False):
+        first = official.iloc[0]
+        lines.append(
+            f'{first["Last Name"]}, {first["First Name"]} ({first["Registration Id"]}) - Level {first["Level"]}'
+        )
+        lines.extend("    - " + recommendation for recommendation in official["Recommendation"])
+        lines.append("")
+    return "\n".join(lines)
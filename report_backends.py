@@ -0,0 +1,286 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Report output backends
+
+The report generators describe a report as headings, paragraphs, bullets and tables and a backend
+turns that into a file. DocxBackend produces the Word documents the reports have always produced,
+HtmlBackend produces a single HTML page from precompiled string templates and is much faster for
+reports that are only going to be read on screen or published on a web page.
+
+Each backend also has a master writer used to stream a multi-club report to disk one section at a
+time.
+"""
+
+import html
+import os
+from abc import ABC, abstractmethod
+from string import Template
+from typing import Optional
+
+import docx  # type: ignore
+from docx import Document  # type: ignore
+from docx.shared import Inches  # type: ignore
+
+from docx_utils import StreamingDocxWriter
+
+# Report formats that can be selected in the settings, maps the name shown to the backend key
+REPORT_FORMATS = {"Word": "docx", "HTML": "html"}
+
+_DOCX_ALIGNMENT = {
+    "left": docx.enum.text.WD_ALIGN_PARAGRAPH.LEFT,
+    "center": docx.enum.text.WD_ALIGN_PARAGRAPH.CENTER,
+    "right": docx.enum.text.WD_ALIGN_PARAGRAPH.RIGHT,
+}
+
+
+class ReportBackend(ABC):
+    """Interface implemented by every report backend"""
+
+    # File extension (including the dot) of the files produced
+    extension = ""
+
+    @abstractmethod
+    def heading(self, text: str, level: int) -> None:
+        """Add a heading, level 0 is the title"""
+
+    @abstractmethod
+    def paragraph(self, *runs: str) -> None:
+        """Add a paragraph made of one or more runs of text, newlines become line breaks"""
+
+    @abstractmethod
+    def bullet(self, text: str) -> None:
+        """Add a bulleted list item"""
+
+    @abstractmethod
+    def table(self, header: list, rows: list, align: list, widths: Optional[list] = None) -> None:
+        """Add a table.
+
+        align holds "left", "center" or "right" for each column. widths (in inches) are applied to
+        the cells of the data rows.
+        """
+
+    @abstractmethod
+    def page_break(self) -> None:
+        """Start a new page"""
+
+    @abstractmethod
+    def save(self, filename: str) -> None:
+        """Write the report to filename"""
+
+    @staticmethod
+    @abstractmethod
+    def master(filename: str) -> "MasterWriter":
+        """Open a master report that sections (backends of the same type) are streamed into"""
+
+
+class MasterWriter(ABC):
+    """Interface of the streaming master report writers"""
+
+    @abstractmethod
+    def add(self, section: ReportBackend) -> None:
+        """Write a section to the report followed by a page break"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the report and close the file"""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Close and delete the file after a failure"""
+
+
+class DocxBackend(ReportBackend):
+    """Word documents through python-docx"""
+
+    extension = ".docx"
+
+    def __init__(self, doc: Optional[Document] = None):
+        self.doc = Document() if doc is None else doc
+
+    def heading(self, text: str, level: int) -> None:
+        self.doc.add_heading(text, level)
+
+    def paragraph(self, *runs: str) -> None:
+        p = self.doc.add_paragraph()
+        for run in runs:
+            p.add_run(run)
+
+    def bullet(self, text: str) -> None:
+        self.doc.add_paragraph(text, style="List Bullet")
+
+    def table(self, header: list, rows: list, align: list, widths: Optional[list] = None) -> None:
+        table = self.doc.add_table(rows=1, cols=len(header))
+        cells = table.rows[0].cells
+        for k, text in enumerate(header):
+            cells[k].text = text
+            cells[k].paragraphs[0].alignment = _DOCX_ALIGNMENT[align[k]]
+        for entry in rows:
+            cells = table.add_row().cells
+            for k, text in enumerate(entry):
+                cells[k].text = text
+                if widths:
+                    cells[k].width = Inches(widths[k])
+                cells[k].paragraphs[0].alignment = _DOCX_ALIGNMENT[align[k]]
+        table.style = "Light Grid Accent 5"
+
+    def page_break(self) -> None:
+        self.doc.add_page_break()
+
+    def save(self, filename: str) -> None:
+        self.doc.save(filename)
+
+    @staticmethod
+    def master(filename: str) -> MasterWriter:
+        return _DocxMasterWriter(filename)
+
+
+class _DocxMasterWriter(MasterWriter):
+    def __init__(self, filename: str):
+        self._writer = StreamingDocxWriter(filename)
+
+    def add(self, section: ReportBackend) -> None:
+        self._writer.add_document(section.doc)  # type: ignore
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def abort(self) -> None:
+        self._writer.abort()
+
+
+class HtmlBackend(ReportBackend):
+    """A single self-contained HTML page built from string templates"""
+
+    extension = ".html"
+
+    _PAGE = Template(
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>$title</title>\n'
+        "<style>\n$style</style>\n</head>\n<body>\n"
+    )
+    _PAGE_END = "</body>\n</html>\n"
+    _STYLE = (
+        "body { font-family: Calibri, Arial, sans-serif; margin: 2em; }\n"
+        "h1 { color: #17365d; border-bottom: 1px solid #4f81bd; }\n"
+        "h2, h3, h4 { color: #4f81bd; }\n"
+        "table { border-collapse: collapse; margin: 0.5em 0; }\n"
+        "th, td { border: 1px solid #7ba0cd; padding: 0.2em 0.6em; }\n"
+        "th { background: #4bacc6; color: white; }\n"
+        "tr:nth-child(even) td { background: #d2eaf1; }\n"
+        ".page-break { break-after: page; border-top: 1px dashed #ccc; margin: 2em 0; }\n"
+    )
+    _HEADING = Template("<h$level>$text</h$level>\n")
+    _PARAGRAPH = Template("<p>$text</p>\n")
+    _BULLET = Template("<ul><li>$text</li></ul>\n")
+    _CELL = Template('<$tag style="text-align: $align"$width>$text</$tag>')
+    _PAGE_BREAK = '<div class="page-break"></div>\n'
+
+    def __init__(self, title: str = ""):
+        self.title = title
+        self._parts: list = []
+
+    @staticmethod
+    def _text(text: str) -> str:
+        return html.escape(text).replace("\n", "<br>\n")
+
+    def heading(self, text: str, level: int) -> None:
+        if level == 0 and not self.title:
+            self.title = text
+        self._parts.append(self._HEADING.substitute(level=min(level + 1, 6), text=self._text(text)))
+
+    def paragraph(self, *runs: str) -> None:
+        self._parts.append(self._PARAGRAPH.substitute(text="".join(self._text(run) for run in runs)))
+
+    def bullet(self, text: str) -> None:
+        self._parts.append(self._BULLET.substitute(text=self._text(text)))
+
+    def _row(self, tag: str, entry: list, align: list, widths: Optional[list]) -> str:
+        return (
+            "<tr>"
+            + "".join(
+                self._CELL.substitute(
+                    tag=tag,
+                    align=align[k],
+                    width=f' width="{int(widths[k] * 96)}"' if widths else "",
+                    text=self._text(text),
+                )
+                for k, text in enumerate(entry)
+            )
+            + "</tr>\n"
+        )
+
+    def table(self, header: list, rows: list, align: list, widths: Optional[list] = None) -> None:
+        self._parts.append("<table>\n" + self._row("th", header, align, None))
+        self._parts.extend(self._row("td", entry, align, widths) for entry in rows)
+        self._parts.append("</table>\n")
+
+    def page_break(self) -> None:
+        self._parts.append(self._PAGE_BREAK)
+
+    def body(self) -> str:
+        """The HTML of everything added so far, without the page wrapper"""
+        return "".join(self._parts)
+
+    def page(self) -> str:
+        """The complete HTML page"""
+        return self._PAGE.substitute(title=html.escape(self.title), style=self._STYLE) + self.body() + self._PAGE_END
+
+    def save(self, filename: str) -> None:
+        with open(filename, "w", encoding="utf-8") as html_file:
+            html_file.write(self.page())
+
+    @staticmethod
+    def master(filename: str) -> MasterWriter:
+        return _HtmlMasterWriter(filename)
+
+
+class _HtmlMasterWriter(MasterWriter):
+    def __init__(self, filename: str):
+        self._file = open(filename, "w", encoding="utf-8")
+        self._file.write(HtmlBackend._PAGE.substitute(title="", style=HtmlBackend._STYLE))
+
+    def add(self, section: ReportBackend) -> None:
+        self._file.write(section.body())  # type: ignore
+        self._file.write(HtmlBackend._PAGE_BREAK)
+
+    def close(self) -> None:
+        self._file.write(HtmlBackend._PAGE_END)
+        self._file.close()
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._file.name)
+        except OSError:
+            pass
+
+
+_BACKENDS = {"docx": DocxBackend, "html": HtmlBackend}
+
+
+def backend_class(report_format: str) -> type:
+    """Return the backend class for a report format key (docx, html), unknown formats fall back to docx"""
+    return _BACKENDS.get(report_format, DocxBackend)
+
+
+def report_filename(filename: str, backend: type) -> str:
+    """Swap the extension of a configured report file name for the one produced by backend"""
+    return os.path.splitext(filename)[0] + backend.extension
@@ -0,0 +1,98 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Content manifest for incremental regeneration of the per-official documents
+
+The manifest lives next to the generated documents and records, for each official (keyed on the
+Registration Id), a hash of the data their document was built from and the file that was written.
+On the next run only officials whose data changed (or whose file was removed or modified) are
+rendered again. The report date is not part of the hash, an unchanged document keeps the date it
+was generated on. Bumping the template version of a report invalidates all of its entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+import pandas as pd
+
+
+def content_hashes(data: pd.DataFrame, *context: str) -> pd.Series:
+    """Return a hash for each row of data, aligned with its index.
+
+    The context strings (e.g. the club code and name printed on the document) and the column names
+    are folded into every hash.
+    """
+    salt = hashlib.sha256("\x1f".join([*context, *map(str, data.columns)]).encode()).hexdigest()[:16]
+    try:
+        rows = pd.util.hash_pandas_object(data, index=False)
+    except TypeError:  # Unhashable cell values (lists), fall back to their text
+        rows = pd.util.hash_pandas_object(data.astype(str), index=False)
+    return rows.map(lambda h: f"{salt}{h:016x}")
+
+
+class ReportManifest:
+    """Track which per-official documents in a directory are up to date"""
+
+    def __init__(self, directory: str, report: str, template_version: int):
+        self._filename = os.path.abspath(os.path.join(directory, f"{report}-manifest.json"))
+        self._template_version = template_version
+        self._officials: dict = {}
+        try:
+            with open(self._filename, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest.get("template_version") == template_version:
+                self._officials = manifest.get("officials", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.info("Ignoring unreadable manifest {}: {}".format(self._filename, type(e).__name__))
+
+    def is_current(self, key: str, digest: str, filename: str) -> bool:
+        """True if filename was produced from data with the same digest and has not been touched since"""
+        entry = self._officials.get(key)
+        if entry is None or entry["hash"] != digest or entry["file"] != filename:
+            return False
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime"]
+
+    def update(self, key: str, digest: str, filename: str) -> None:
+        """Record that filename has just been written from data with digest"""
+        stat = os.stat(filename)
+        self._officials[key] = {"hash": digest, "file": filename, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def discard(self, key: str) -> None:
+        self._officials.pop(key, None)
+
+    def save(self) -> None:
+        """Write the manifest, replacing the previous one in a single step"""
+        temp_file = self._filename + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as manifest_file:
+                json.dump({"template_version": self._template_version, "officials": self._officials}, manifest_file)
+            os.replace(temp_file, self._filename)
+        except Exception as e:
+            logging.info("Unable to save manifest: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
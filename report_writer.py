@@ -0,0 +1,89 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Background saving of report files
+
+The report threads render a club or official and hand the save (compressing and writing the file)
+to a writer thread through a bounded queue, then carry on rendering the next one. Saves run one at
+a time in the order they were submitted. Failures are collected so the user gets one summary at
+the end of the run rather than a message box per file.
+"""
+
+import logging
+import queue
+from threading import Thread
+from typing import Callable, NamedTuple, Optional
+
+# Saves waiting for the writer, each one holds a rendered document in memory
+MAX_PENDING_SAVES = 4
+
+
+class SaveFailure(NamedTuple):
+    description: str  # What was being saved, e.g. a file or club name
+    error: str
+
+
+class BackgroundWriter:
+    """Run save jobs on a background thread"""
+
+    def __init__(self, max_pending: int = MAX_PENDING_SAVES):
+        self.failures: list = []
+        self._jobs: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = Thread(target=self._run, name="BackgroundWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            description, save = job
+            try:
+                save()
+            except Exception as e:
+                logging.info("Unable to save {}: {}".format(description, type(e).__name__))
+                logging.info("Exception message: {}".format(e))
+                self.failures.append(SaveFailure(description, f"{type(e).__name__} - {e}"))
+
+    def submit(self, description: str, save: Callable[[], None]) -> None:
+        """Queue a save, blocks while the writer is MAX_PENDING_SAVES behind"""
+        self._jobs.put((description, save))
+
+    def fail(self, description: str, error: str) -> None:
+        """Record a failure that happened outside the writer so it appears in the same summary"""
+        self.failures.append(SaveFailure(description, error))
+
+    def close(self) -> list:
+        """Wait for every queued save to finish and return the failures"""
+        self._jobs.put(None)
+        self._thread.join()
+        return self.failures
+
+
+def failure_summary(failures: list, limit: int = 10) -> Optional[str]:
+    """A message listing the failed saves (up to limit of them), None if there were none"""
+    if not failures:
+        return None
+    lines = [f"{len(failures)} file(s) could not be saved:"]
+    lines.extend(f"{failure.description}: {failure.error}" for failure in failures[:limit])
+    if len(failures) > limit:
+        lines.append(f"... and {len(failures) - limit} more, see the log for details")
+    return "\n".join(lines)
@@ -0,0 +1,349 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Synthetic RTR exports
+
+Writes an RTR export of made up officials, in the CSV or HTML format of the real exports, so loading
+and the reports can be timed and checked at any size without real member data:
+
+    python rtr_synthetic.py export.csv --officials 20000 --clubs 400
+    python rtr_synthetic.py export.xls --officials 100000 --clubs 2000 --extra-columns 150
+
+The same options and seed always give the same file. Levels, clinics and sign-offs follow each other
+the way they do in the RTR (a Level II has taken the Level I clinics and most of its sign-offs, older
+officials have the combined S&T clinic and newer ones the Inspector of Turns and Judge of Stroke
+clinics), with both kinds of empty dates, mixed yes/no capitalization, officials with statuses that
+are not loaded and affiliations to other (and unknown) clubs.
+"""
+
+import argparse
+import html
+import sys
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from rtr_fields import REQUIRED_RTR_FIELDS
+
+SEED = 20240930
+
+# The day the export was taken, every date is on or before it
+EXPORT_DATE = "2024-09-30"
+
+# Officials starting after this take the Inspector of Turns and Judge of Stroke clinics instead of S&T
+NEW_PATHWAY_DATE = "2023-09-18"
+
+LEVEL_NAMES = [
+    "",
+    "LEVEL I - RED PIN",
+    "LEVEL II - WHITE PIN",
+    "LEVEL III - ORANGE PIN",
+    "LEVEL IV - GREEN PIN",
+    "LEVEL V - BLUE PIN",
+]
+_LEVEL_WEIGHTS = [0.38, 0.30, 0.17, 0.10, 0.04, 0.01]
+
+# Everything but Active and the pending statuses is dropped by the loader
+_STATUS_WEIGHTS = {
+    "Active": 0.72,
+    "PSO Pending": 0.06,
+    "Invoice Pending": 0.04,
+    "Account Pending": 0.05,
+    "Inactive": 0.10,
+    "Cancelled": 0.03,
+}
+
+_ST = "Judge of Stroke/Inspector of Turns"
+_NEW_ST = ["Inspector of Turns", "Judge of Stroke"]
+
+# For each clinic, by level (none, I to V): the chance the clinic was taken, the chance all of its
+# sign-offs are done and when it is taken as a fraction of the time since the official started
+_CLINICS = {
+    "Introduction to Swimming Officiating": ([0.85, 1, 1, 1, 1, 1], [0.45, 1, 1, 1, 1, 1], (0, 0.05)),
+    "Safety Marshal": ([0.55, 1, 1, 1, 1, 1], [0.4, 0.9, 1, 1, 1, 1], (0, 0.1)),
+    _ST: ([0.25, 0.9, 1, 1, 1, 1], [0.2, 0.5, 0.95, 1, 1, 1], (0.02, 0.3)),
+    "Inspector of Turns": ([0.25, 0.9, 1, 1, 1, 1], [0.2, 0.5, 0.95, 1, 1, 1], (0.02, 0.3)),
+    "Judge of Stroke": ([0.2, 0.85, 1, 1, 1, 1], [0.2, 0.5, 0.95, 1, 1, 1], (0.02, 0.3)),
+    "Chief Timekeeper": ([0.05, 0.55, 0.9, 1, 1, 1], [0.2, 0.4, 0.85, 1, 1, 1], (0.05, 0.4)),
+    "Administration Desk (formerly Clerk of Course) Clinic": (
+        [0.01, 0.12, 0.5, 0.75, 0.9, 0.9],
+        [0.1, 0.3, 0.7, 0.9, 1, 1],
+        (0.2, 0.8),
+    ),
+    "Meet Manager": ([0.01, 0.1, 0.45, 0.7, 0.9, 0.9], [0.1, 0.3, 0.7, 0.9, 1, 1], (0.2, 0.8)),
+    "Starter": ([0.01, 0.1, 0.5, 0.75, 0.9, 0.9], [0.1, 0.3, 0.7, 0.9, 1, 1], (0.2, 0.8)),
+    "Chief Finish Judge/Chief Judge": ([0.01, 0.12, 0.55, 0.8, 0.9, 0.9], [0.1, 0.3, 0.7, 0.9, 1, 1], (0.2, 0.8)),
+    "Chief Judge Electronics": ([0, 0.01, 0.05, 0.1, 0.2, 0.2], [0, 0.2, 0.5, 0.8, 1, 1], (0.3, 0.9)),
+    "Chief Recorder and Recorder (formerly Recorder/Scorer) Clinic": (
+        [0.01, 0.08, 0.35, 0.6, 0.8, 0.8],
+        [0.1, 0.3, 0.6, 0.9, 1, 1],
+        (0.2, 0.8),
+    ),
+    "Referee": ([0, 0, 0.15, 0.85, 1, 1], [0, 0, 0.3, 0.9, 1, 1], (0.5, 0.95)),
+    "Para Swimming eModule": ([0.05, 0.2, 0.35, 0.5, 0.6, 0.6], [1, 1, 1, 1, 1, 1], (0, 1)),
+}
+_PARA_DOMESTIC_CHANCE = [0, 0.02, 0.1, 0.3, 0.5, 0.5]
+
+# Chance an official is affiliated with other clubs, by level
+_AFFILIATION_CHANCE = [0.02, 0.06, 0.06, 0.06, 0.06, 0.06]
+
+# Chance an empty date is 0001-01-01 rather than blank
+_SENTINEL_CHANCE = 0.3
+
+_FIRST_NAMES = [
+    "Aiden", "Amélie", "Anaïs", "Andrew", "Anna", "Benoît", "Brian", "Caroline", "Chloé", "Christine",
+    "Daniel", "David", "Denise", "Élise", "Emma", "Éric", "Ethan", "François", "Gabriel", "Hélène",
+    "Ian", "Isabelle", "Jacob", "James", "Jennifer", "Jessica", "Joël", "Julie", "Karen", "Kevin",
+    "Laura", "Liam", "Linda", "Lucas", "Marc", "Maria", "Mark", "Mathieu", "Megan", "Michael",
+    "Michelle", "Mohammed", "Nathalie", "Nicole", "Noah", "Olivia", "Patrick", "Paul", "Priya", "Rachel",
+    "Raj", "Rebecca", "Richard", "Robert", "Sarah", "Sébastien", "Stephanie", "Steven", "Susan", "Thomas",
+    "Wei", "William", "Yuki", "Zoë",
+]  # fmt: skip
+_LAST_NAMES = [
+    "Anderson", "Bélanger", "Bouchard", "Brown", "Campbell", "Chen", "Clark", "Côté", "Das", "Davis",
+    "Fortin", "Gagné", "Gagnon", "Gauthier", "Girard", "Graham", "Gupta", "Hall", "Harris", "Johnson",
+    "Khan", "Kim", "Lavoie", "Lee", "Lefebvre", "Li", "MacDonald", "Martin", "Mitchell", "Morin",
+    "Murphy", "Nguyen", "O'Brien", "Ouellet", "Patel", "Pelletier", "Roy", "Scott", "Singh", "Smith",
+    "Stewart", "Taylor", "Thompson", "Tremblay", "Walker", "Wang", "White", "Williams", "Wilson", "Wong",
+    "Young", "Zhang",
+]  # fmt: skip
+_TOWNS = [
+    "Ajax", "Barrie", "Belleville", "Brampton", "Brantford", "Burlington", "Cambridge", "Cobourg",
+    "Cornwall", "Etobicoke", "Guelph", "Halton Hills", "Hamilton", "Kanata", "Kingston", "Kitchener",
+    "London", "Markham", "Milton", "Mississauga", "Nepean", "Newmarket", "Niagara", "North Bay",
+    "North York", "Oakville", "Orillia", "Oshawa", "Ottawa", "Owen Sound", "Peterborough", "Pickering",
+    "Richmond Hill", "Sarnia", "Sault Ste. Marie", "Scarborough", "Stratford", "Sudbury", "Thunder Bay",
+    "Timmins", "Toronto", "Vaughan", "Waterloo", "Whitby", "Windsor", "Woodstock",
+]  # fmt: skip
+_CLUB_KINDS = ["Swim Club", "Aquatic Club", "Aquatics", "Swim Team", "Dolphins", "Marlins", "Stingrays", "Sharks"]
+_REGIONS = ["Central", "Eastern", "Northern", "Southern", "Western"]
+
+
+def _ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().replace("'", "").lower()
+
+
+def _dates(days: np.ndarray) -> np.ndarray:
+    """Days since 1970 as YYYY-MM-DD"""
+    return np.datetime_as_string(days.astype("datetime64[D]"), unit="D")
+
+
+def _day(text: str) -> int:
+    return int(np.datetime64(text, "D").astype(np.int64))
+
+
+def _make_clubs(rng: np.random.Generator, clubs: int) -> tuple:
+    """Unique codes and names for the clubs and the region of each"""
+    letters = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    codes: list = []
+    seen: set = set()
+    while len(codes) < clubs:
+        code = "".join(rng.choice(letters, rng.integers(3, 6)))
+        if code not in seen:
+            seen.add(code)
+            codes.append(code)
+
+    names = []
+    used: dict = {}
+    for _ in range(clubs):
+        name = f"{rng.choice(_TOWNS)} {rng.choice(_CLUB_KINDS)}"
+        used[name] = used.get(name, 0) + 1
+        names.append(name if used[name] == 1 else f"{name} {used[name]}")
+
+    regions = rng.choice(_REGIONS, clubs)
+    return np.array(codes), np.array(names), regions
+
+
+def generate_rtr(
+    officials: int = 1000, clubs: int = 50, seed: int = SEED, blank_rows: int = 0, extra_columns: int = 0
+) -> pd.DataFrame:
+    """An RTR export of made up officials, every value is text ("" when empty) as in the exports.
+
+    blank_rows empty rows are mixed in (as in club level exports) and extra_columns columns the
+    analyzer does not use are added after the required ones, real exports have over 200 columns.
+    """
+    if officials < 1 or clubs < 1:
+        raise ValueError("There must be at least one official and one club")
+    if clubs > officials:
+        raise ValueError("Every club needs an official, there are more clubs than officials")
+
+    rng = np.random.default_rng(seed)
+    n = officials
+    export_day = _day(EXPORT_DATE)
+    new_pathway_day = _day(NEW_PATHWAY_DATE)
+    data: dict = {}
+
+    def empty_dates() -> np.ndarray:
+        return np.where(rng.random(n) < _SENTINEL_CHANCE, "0001-01-01", "")
+
+    def date_column(days: np.ndarray, present: np.ndarray) -> np.ndarray:
+        return np.where(present, _dates(days), empty_dates())
+
+    club_codes, club_names, club_regions = _make_clubs(rng, clubs)
+
+    # A few large clubs and many small ones, every club has at least one official
+    weights = rng.lognormal(0, 1, clubs)
+    club = np.concatenate([np.arange(clubs), rng.choice(clubs, n - clubs, p=weights / weights.sum())])
+    rng.shuffle(club)
+
+    level = rng.choice(len(LEVEL_NAMES), n, p=_LEVEL_WEIGHTS)
+
+    # Most officials started recently, higher levels have been at it for longer
+    started_ago = np.minimum(rng.exponential(4 * 365, n).astype(np.int64) + 30, 20 * 365)
+    started_ago = np.where(level > 0, np.maximum(started_ago, level * 400 + rng.integers(0, 365, n)), started_ago)
+    start = export_day - started_ago
+    legacy = start < new_pathway_day
+
+    data["id"] = (rng.integers(10000, 90000) + np.cumsum(rng.integers(1, 4, n))).astype(str)
+    data["Registration Id"] = (rng.choice(9000000, n, replace=False) + 1000000).astype(str)
+    first_names = rng.choice(_FIRST_NAMES, n)
+    last_names = rng.choice(_LAST_NAMES, n)
+    data["First Name"] = first_names
+    data["Last Name"] = last_names
+    data["Email"] = np.array(
+        [
+            f"{_ascii(first)}.{_ascii(last)}{number}@example.com"
+            for first, last, number in zip(first_names, last_names, rng.integers(1, 1000, n))
+        ]
+    )
+    data["Club"] = club_names[club]
+    data["Region"] = club_regions[club]
+    data["Province"] = np.full(n, "ON")
+    data["Status"] = rng.choice(list(_STATUS_WEIGHTS), n, p=list(_STATUS_WEIGHTS.values()))
+
+    for k in range(1, len(LEVEL_NAMES)):
+        day = start + (started_ago * k / (level + 0.5)).astype(np.int64)
+        data[f"Level {k} Date of Certification"] = date_column(day, level >= k)
+
+    # Level IV/Vs are certified for everything, some have no clinic records at all
+    detail = ~((level > 3) & (rng.random(n) < 0.3))
+
+    for name, (taken_chance, signed_chance, (earliest, latest)) in _CLINICS.items():
+        taken = (rng.random(n) < np.take(taken_chance, level)) & detail
+        if name == _ST:
+            taken &= legacy
+        elif name in _NEW_ST:
+            taken &= ~legacy
+        clinic_day = start + (rng.uniform(earliest, latest, n) * started_ago).astype(np.int64)
+        if name == _ST:
+            clinic_day = np.minimum(clinic_day, new_pathway_day - 1)
+
+        # The export is not consistent about the capitalization of yes/no
+        yes, no = ("Yes", "No") if rng.random() < 0.5 else ("yes", "no")
+        data[name] = np.where(taken, yes, no)
+        data[f"{name}-ClinicDate"] = date_column(clinic_day, taken & (rng.random(n) > 0.01))
+
+        if f"{name}-Deck Evaluation #1 Date" in REQUIRED_RTR_FIELDS:
+            signoffs = np.where(rng.random(n) < np.take(signed_chance, level), 2, rng.integers(0, 2, n))
+            offsets = np.sort(rng.uniform(0.05, 1, (2, n)), axis=0)  # The first sign-off before the second
+            for number in [1, 2]:
+                day = clinic_day + (offsets[number - 1] * (export_day - clinic_day)).astype(np.int64)
+                data[f"{name}-Deck Evaluation #{number} Date"] = date_column(day, taken & (signoffs >= number))
+
+    para_domestic = (rng.random(n) < np.take(_PARA_DOMESTIC_CHANCE, level)) & detail
+    data["Para Domestic"] = np.where(para_domestic, "Trained Official", "")
+    course_day = start + (rng.uniform(0.3, 1, n) * started_ago).astype(np.int64)
+    data["Para Domestic Course Date"] = np.where(para_domestic, _dates(course_day), "")
+
+    data["ClubCode"] = club_codes[club]
+    data["Current_CertificationLevel"] = np.array(LEVEL_NAMES)[level]
+
+    affiliations = np.full(n, "", dtype=object)
+    if clubs > 1:
+        for i in np.flatnonzero(rng.random(n) < np.take(_AFFILIATION_CHANCE, level)):
+            others = rng.choice(clubs - 1, min(clubs - 1, 1 + int(rng.random() < 0.15)), replace=False)
+            others += others >= club[i]  # Never their own club
+            codes = list(club_codes[others])
+            if rng.random() < 0.03:
+                codes.append("X%03d" % rng.integers(1000))  # A club that is not in the export
+            affiliations[i] = ",".join(codes)
+    data["AffiliatedClubs"] = affiliations
+
+    export = pd.DataFrame(data, columns=REQUIRED_RTR_FIELDS)
+
+    for k in range(1, extra_columns + 1):
+        export[f"Custom Field {k}"] = rng.choice(["", "", "yes", "no", EXPORT_DATE], n)
+
+    if blank_rows > 0:
+        blank = pd.DataFrame("", index=range(blank_rows), columns=export.columns)
+        export = pd.concat([export, blank], ignore_index=True)
+        export = export.iloc[rng.permutation(len(export))].reset_index(drop=True)
+
+    return export
+
+
+def write_csv(export: pd.DataFrame, filename: str, encoding: str = "utf-8") -> None:
+    export.to_csv(filename, index=False, encoding=encoding)
+
+
+def write_html(export: pd.DataFrame, filename: str, encoding: str = "utf-8") -> None:
+    """As the RTR writes its HTML (.xls) exports, a single table with the column names as its first row"""
+    with open(filename, "w", encoding=encoding) as f:
+        f.write('<html>\n<head><meta http-equiv="Content-Type" content="text/html; charset=%s"></head>\n' % encoding)
+        f.write('<body>\n<table border="1">\n')
+        for row in [export.columns.tolist()] + export.values.tolist():
+            f.write("<tr>" + "".join(f"<td>{html.escape(value)}</td>" for value in row) + "</tr>\n")
+        f.write("</table>\n</body>\n</html>\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Swim Ontario Club Analyzer - write a synthetic RTR export")
+    parser.add_argument("filename", help="export to write")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "html"],
+        help="format of the export (default csv for .csv files, html for anything else e.g. .xls)",
+    )
+    parser.add_argument("--officials", type=int, default=1000, metavar="N", help="(default %(default)s)")
+    parser.add_argument("--clubs", type=int, default=50, metavar="N", help="(default %(default)s)")
+    parser.add_argument("--seed", type=int, default=SEED, metavar="N", help="(default %(default)s)")
+    parser.add_argument("--blank-rows", type=int, default=0, metavar="N", help="empty rows to mix in")
+    parser.add_argument("--extra-columns", type=int, default=0, metavar="N", help="unused columns to add")
+    parser.add_argument("--encoding", default="utf-8", help="(default %(default)s)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    file_format = args.format or ("csv" if args.filename.lower().endswith(".csv") else "html")
+
+    try:
+        export = generate_rtr(args.officials, args.clubs, args.seed, args.blank_rows, args.extra_columns)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        if file_format == "csv":
+            write_csv(export, args.filename, args.encoding)
+        else:
+            write_html(export, args.filename, args.encoding)
+    except Exception as e:
+        print(f"Unable to write {args.filename}: {type(e).__name__} - {e}", file=sys.stderr)
+        return 1
+
+    print(f"{args.officials} officials of {args.clubs} clubs written to {args.filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,18 +28,29 @@ import os
 import tkinter as tk
 from datetime import datetime
 from tkinter import BooleanVar, StringVar, filedialog
-from typing import Any
+from typing import Any, Optional
 
 import customtkinter as ctk  # type: ignore
+import numpy as np
 import pandas as pd
 
 # Appliction Specific Imports
 from config import AnalyzerConfig
 from CTkMessagebox import CTkMessagebox  # type: ignore
+from data_export import EXPORT_FILETYPES, Export_Data
+from officials_index import (
+    BROWSE_POSITIONS,
+    CROSSTAB_MEASURES,
+    SORT_KEYS,
+    OfficialsIndex,
+    crosstab_export,
+    format_record,
+)
 from rtr import RTR
-from rtr_fields import RTR_CLINICS
+from rtr_loader import status_values
+from task_runner import watch_task
 from tooltip import ToolTip
-from ui_common import Officials_Status_Frame
+from ui_common import Officials_Status_Frame, Task_Progress, Virtual_Grid
 
 tkContainer = Any
 
@@ -51,25 +62,14 @@ class RTR_Browse_Frame(ctk.CTkFrame):
         super().__init__(container)
         self._config = config
         self._rtr = rtr
+        self._index: Optional[OfficialsIndex] = None
 
         # Add support for the club selection
         self._club_list = ["None"]
         self._club_selected = ctk.StringVar(value="None")
 
         # List of positions in long form and the associated short form
-        self._positions = [
-            ("Introduction to Swimming Officiating", "Intro"),
-            ("Safety Marshal", "Safety"),
-            ("Judge of Stroke/Inspector of Turns (Combo)", "ST"),
-            ("Inspector of Turns", "IT"),
-            ("Judge of Stroke", "JoS"),
-            ("Administration Desk (formerly Clerk of Course) Clinic", "AdminDesk"),
-            ("Chief Timekeeper", "CT"),
-            ("Meet Manager", "MM"),
-            ("Starter", "Starter"),
-            ("Chief Finish Judge/Chief Judge Electronics", "CFJ"),
-            ("Chief Recorder", "ChiefRec"),
-        ]
+        self._positions = BROWSE_POSITIONS
 
         self._positions_long = [position[0] for position in self._positions]
         self._position_selected = ctk.StringVar(value=self._positions_long[0])
@@ -88,6 +88,10 @@ class RTR_Browse_Frame(ctk.CTkFrame):
         optionsframe = ctk.CTkFrame(self)
         optionsframe.grid(column=0, row=2, sticky="news")
 
+        search_frame = ctk.CTkFrame(self)
+        search_frame.grid(column=0, row=3, sticky="news", padx=10, pady=10)
+        search_frame.columnconfigure(0, weight=1)
+
         # Add Command Buttons
 
         ctk.CTkLabel(club_select_frame, text="Club Selection").grid(column=0, row=0, sticky="w", padx=10)
@@ -101,10 +105,14 @@ class RTR_Browse_Frame(ctk.CTkFrame):
         )
         self.club_dropdown.grid(row=2, column=0, padx=20, pady=(20, 10), sticky="w")
 
-        self.reports_btn = ctk.CTkButton(club_select_frame, text="Full Export (CSV)", command=self._handle_reports_btn)
+        self.reports_btn = ctk.CTkButton(club_select_frame, text="Full Export", command=self._handle_reports_btn)
         self.reports_btn.grid(column=1, row=2, sticky="w", padx=20, pady=(20, 10))
 
-        self.bar = ctk.CTkProgressBar(master=club_select_frame, orientation="horizontal", mode="indeterminate")
+        self.crosstab_btn = ctk.CTkButton(club_select_frame, text="Club Cross-Tab", command=self._handle_crosstab_btn)
+        self.crosstab_btn.grid(column=2, row=2, sticky="w", padx=20, pady=(20, 10))
+        ToolTip(self.crosstab_btn, text="Qualified/Certified/1 sign-off/2 sign-off counts for every club and position")
+
+        self.bar = Task_Progress(club_select_frame)
 
         # Options Frame - Left and Right Panels
 
@@ -142,15 +150,44 @@ class RTR_Browse_Frame(ctk.CTkFrame):
 
         # Lower options frame for club selection
 
-        ctk.CTkLabel(lower_optionsframe, text="Matching Officials   ").grid(
+        self._matching_officials = StringVar(value="Matching Officials")
+        ctk.CTkLabel(lower_optionsframe, textvariable=self._matching_officials).grid(
             column=0, row=0, sticky="ws", padx=10, pady=(10, 0)
         )
 
-        self.officials_list = ctk.CTkTextbox(lower_optionsframe, state="disabled")
+        # Only the visible rows are drawn, click a heading to sort on it (again to reverse)
+        self._sort_column = 0
+        self._sort_descending = False
+        self._matches = np.array([], dtype=np.intp)
+        self.officials_list = Virtual_Grid(
+            lower_optionsframe, ["Name", "Sign-offs", "Level"], [260, 80, 60], sort_command=self._handle_sort
+        )
         self.officials_list.grid(column=0, row=1, sticky="ew", padx=10, pady=10)
+        self.officials_list.set_sort_indicator(self._sort_column, self._sort_descending)
+
+        # Search all the loaded officials by name or Registration Id, click a result to see their record
+
+        self._search_text = StringVar(value="")
+        self._search_results = np.array([], dtype=np.intp)
+        ctk.CTkLabel(search_frame, text="Find an Official (Name or Registration Id)").grid(
+            column=0, row=0, sticky="w", padx=10, pady=(10, 0)
+        )
+        search_entry = ctk.CTkEntry(search_frame, textvariable=self._search_text)
+        search_entry.grid(column=0, row=1, sticky="ew", padx=10, pady=10)
+        search_entry.bind("<KeyRelease>", self._handle_search)
+        ToolTip(search_entry, text="Type part of a name or a Registration Id, click a match to see the full record")
+        self.search_list = Virtual_Grid(
+            search_frame,
+            ["Name", "Registration Id", "Club"],
+            [260, 120, 200],
+            visible_rows=6,
+            select_command=self._handle_search_select,
+        )
+        self.search_list.grid(column=0, row=2, sticky="ew", padx=10, pady=10)
 
         # Register Callback
         self._rtr.register_update_callback(self.refresh_club_list)
+        self._rtr.register_update_callback(self._handle_search)
 
     def refresh_club_list(self):
         self._club_list = ["None"]
@@ -173,60 +210,129 @@ class RTR_Browse_Frame(ctk.CTkFrame):
     def _handle_qual_change(self, *_arg) -> None:
         self._update_officials_list()
 
+    def _officials_index(self) -> OfficialsIndex:
+        """The lookup index for the loaded data, rebuilt when the data changes"""
+        if self._index is None or self._index.version != self._rtr.version:
+            self._index = OfficialsIndex(self._rtr.rtr_data.reset_index(drop=True), self._rtr.version)
+        return self._index
+
     def _update_officials_list(self) -> None:
         """Update the officials list"""
         club = self._club_selected.get()
-        position_long = self._position_selected.get()
-        position = [position[1] for position in self._positions if position[0] == position_long][0]
+        position = self._selected_position()
 
         cert = self._cert_selected.get()[0]  # First letter of the selected value
-        pos_status = RTR_CLINICS[position]["status"]
-        pos_signoffs = RTR_CLINICS[position]["signoffs"]
-        status_values = ["Active"]
-
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
+        statuses = status_values(self._config)
 
         if club == "None":
-            self.officials_list.configure(state="disabled")
-            self.officials_list.delete("1.0", "end")
-            self.officials_list.insert("1.0", "Select a club first")
+            self._matches = np.array([], dtype=np.intp)
+            self._matching_officials.set("Matching Officials")
+            self.officials_list.set_message("Select a club first")
             return
 
         # Filter on status values, club and position status.  If both are selected the filter is != "N"
-        if cert == "B":
-            self._rtr_filtered = self._rtr.rtr_data.loc[
-                (self._rtr.rtr_data["Status"].isin(status_values))
-                & (self._rtr.rtr_data["Club"] == club)
-                & (self._rtr.rtr_data[pos_status] != "N")
-            ]
-        else:
-            self._rtr_filtered = self._rtr.rtr_data.loc[
-                (self._rtr.rtr_data["Status"].isin(status_values))
-                & (self._rtr.rtr_data["Club"] == club)
-                & (self._rtr.rtr_data[pos_status] == cert)
-            ]
+        certs = ["Q", "C"] if cert == "B" else [cert]
+        self._matches = self._officials_index().lookup(club, position, certs, statuses)
+        self._matching_officials.set(f"Matching Officials ({len(self._matches)})")
+        self._show_matches()
 
-        # Sort by last name
-        #        self._rtr_filtered = self._rtr_filtered.sort_values(by=["Last Name"])
-
-        # Build the list of officials and number of signoffs
-        officials = ""
-        for index, row in self._rtr_filtered.iterrows():
-            officials = officials + row["Full Name"] + " (" + str(row[pos_signoffs]) + " signoffs)\n"
+    def _selected_position(self) -> str:
+        position_long = self._position_selected.get()
+        return [position[1] for position in self._positions if position[0] == position_long][0]
+
+    def _show_matches(self) -> None:
+        """Sort the matching officials and show them in the grid"""
+        index = self._officials_index()
+        position = self._selected_position()
+        matches = index.sort(self._matches, SORT_KEYS[self._sort_column], position, self._sort_descending)
+        self.officials_list.set_rows(index.grid_columns(position, matches))
+
+    def _handle_sort(self, column: int) -> None:
+        if column == self._sort_column:
+            self._sort_descending = not self._sort_descending
+        else:
+            self._sort_column = column
+            self._sort_descending = False
+        self.officials_list.set_sort_indicator(self._sort_column, self._sort_descending)
+        self._show_matches()
+
+    def _handle_search(self, *_arg) -> None:
+        """Show the officials matching the search text"""
+        query = self._search_text.get()
+        self._search_results = self._rtr.search.search(query)
+        if len(self._search_results) == 0:
+            self.search_list.set_message("No matching officials" if query.strip() else "")
+            return
+        results = self._rtr.rtr_data.iloc[self._search_results]
+        self.search_list.set_rows(
+            [results["Full Name"].tolist(), results["Registration Id"].astype(str).tolist(), results["Club"].tolist()]
+        )
 
-        self.officials_list.configure(state="normal")
-        self.officials_list.delete("1.0", "end")
-        self.officials_list.insert("1.0", officials)
-        self.officials_list.configure(state="disabled")
+    def _handle_search_select(self, row: int) -> None:
+        """Open the full certification record of a search result"""
+        if row >= len(self._search_results):
+            return
+        entry = self._rtr.rtr_data.iloc[self._search_results[row]]
+        record = ctk.CTkToplevel(self)
+        record.title(f'{entry["Full Name"]} ({entry["Registration Id"]})')
+        record.geometry("700x500")
+        record.columnconfigure(0, weight=1)
+        record.rowconfigure(0, weight=1)
+        textbox = ctk.CTkTextbox(record, wrap="word")
+        textbox.grid(column=0, row=0, sticky="news", padx=10, pady=10)
+        textbox.insert("0.0", format_record(entry))
+        textbox.configure(state="disabled")
+        record.after(100, record.lift)  # Make sure it is not hidden behind the main window
+
+    def _crosstab(self) -> pd.DataFrame:
+        positions = [position[1] for position in self._positions]
+        return self._officials_index().crosstab(positions, status_values(self._config))
+
+    def _handle_crosstab_btn(self) -> None:
+        """Show the counts for every club and position in one window"""
+        if self._rtr.rtr_data.empty:
+            logging.info("Load data first...")
+            CTkMessagebox(master=self, title="Error", message="Load RTR Data First", icon="cancel", corner_radius=0)
+            return
+        table = self._crosstab()
+        positions = [position[1] for position in self._positions]
+
+        crosstab = ctk.CTkToplevel(self)
+        crosstab.title("Club Cross-Tab")
+        crosstab.columnconfigure(0, weight=1)
+        ctk.CTkLabel(crosstab, text="Each position shows " + " / ".join(CROSSTAB_MEASURES)).grid(
+            column=0, row=0, sticky="w", padx=10, pady=(10, 0)
+        )
+        grid = Virtual_Grid(crosstab, ["Club"] + positions, [200] + [70] * len(positions), visible_rows=20)
+        grid.grid(column=0, row=1, sticky="news", padx=10, pady=10)
+        cells = table.astype(str)
+        grid.set_rows(
+            [table.index.tolist()] + [cells[position].agg("/".join, axis=1).tolist() for position in positions]
+        )
+        ctk.CTkButton(crosstab, text="Export", command=self._handle_crosstab_export).grid(
+            column=0, row=2, sticky="e", padx=10, pady=(0, 10)
+        )
+        crosstab.after(100, crosstab.lift)  # Make sure it is not hidden behind the main window
+
+    def _handle_crosstab_export(self) -> None:
+        report_file = filedialog.asksaveasfilename(
+            filetypes=EXPORT_FILETYPES,
+            defaultextension=".csv",
+            title="Export Cross-Tab",
+            initialdir=self._config.get_str("odp_report_directory"),
+        )
+        if len(report_file) == 0:
+            return
+        self.buttons("disabled")
+        self.bar.grid(row=3, column=0, columnspan=3, pady=10, padx=20, sticky="ew")
+        self.bar.reset()
+        export_thread = Export_Data(crosstab_export(self._crosstab()), report_file)
+        watch_task(self, export_thread, self.bar.show_event, self._export_finished)
 
     def buttons(self, newstate) -> None:
         """Enable/disable all buttons"""
         self.reports_btn.configure(state=newstate)
+        self.crosstab_btn.configure(state=newstate)
 
     def _handle_reports_btn(self) -> None:
         if self._rtr.rtr_data.empty:
@@ -239,9 +345,8 @@ class RTR_Browse_Frame(ctk.CTkFrame):
             CTkMessagebox(master=self, title="Error", message="Select a club first", icon="cancel", corner_radius=0)
             return """
         self.buttons("disabled")
-        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="s")
-        self.bar.set(0)
-        self.bar.start()
+        self.bar.grid(row=3, column=0, columnspan=3, pady=10, padx=20, sticky="ew")
+        self.bar.reset()
 
         key_columns = [
             "id",
@@ -278,50 +383,33 @@ class RTR_Browse_Frame(ctk.CTkFrame):
             "Para Domestic",
         ]
 
-        status_values = ["Active"]
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
+        statuses = status_values(self._config)
 
         # Filter on status values and club
         self._rtr_filtered = self._rtr.rtr_data.loc[
-            (self._rtr.rtr_data["Status"].isin(status_values)) & (self._rtr.rtr_data["Club"] == club)
+            (self._rtr.rtr_data["Status"].isin(statuses)) & (self._rtr.rtr_data["Club"] == club)
         ]
 
-        # dump filtered dataframe to a test.csv file
-        # self._rtr_filtered.to_csv("test.csv", index=False)
-
-        try:
-            report_file = filedialog.asksaveasfilename(
-                filetypes=[("CSV Files", "*.csv")],
-                defaultextension=".csv",
-                title="Export File",
-                initialdir=self._config.get_str("odp_report_directory"),
-            )
-            if len(report_file) == 0:
-                self.bar.stop()
-                self.bar.grid_forget()
-                self.buttons("enable")
-                return
-
-            self._rtr_filtered.to_csv(report_file, columns=key_columns, index=False)
-            # create temp dataframe with just the columns we need
-            # temp_df = self._rtr_filtered[key_columns]
-            # temp_df.to_json(report_file.replace(".csv", ".json"),  orient="records", lines=True)
-
-            logging.info("CSV Report Saved: {}".format(report_file))
-
-        except Exception as e:
-            logging.info("Unable to save CSV file: {}".format(type(e).__name__))
-            logging.info("Exception message: {}".format(e))
-            CTkMessagebox(title="Error", message="Unable to save CSV file", icon="cancel", corner_radius=0)
-
-        self.bar.stop()
+        report_file = filedialog.asksaveasfilename(
+            filetypes=EXPORT_FILETYPES,
+            defaultextension=".csv",
+            title="Export File",
+            initialdir=self._config.get_str("odp_report_directory"),
+        )
+        if len(report_file) == 0:
+            self.bar.grid_forget()
+            self.buttons("enable")
+            return
+
+        # The file is written on a background thread so the UI stays responsive
+        export_thread = Export_Data(self._rtr_filtered, report_file, key_columns)
+        watch_task(self, export_thread, self.bar.show_event, self._export_finished)
+
+    def _export_finished(self, thread: Export_Data) -> None:
         self.bar.grid_forget()
         self.buttons("enable")
+        if thread.error is not None:
+            CTkMessagebox(title="Error", message="Unable to save export file", icon="cancel", corner_radius=0)
 
 
 def main():
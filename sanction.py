@@ -23,22 +23,24 @@
 """ Sanctioning Application """
 
 import os
-import pandas as pd
 import logging
 import customtkinter as ctk  # type: ignore
 from tkinter import filedialog, BooleanVar, StringVar
-from threading import Thread
 from datetime import datetime
+from typing import Optional
 from tooltip import ToolTip
-from docx import Document  # type: ignore
 from CTkMessagebox import CTkMessagebox  # type: ignore
 
 
 # Appliction Specific Imports
 from config import AnalyzerConfig
+from report_backends import REPORT_FORMATS, backend_class, report_filename
+from report_writer import failure_summary
 from club_summary import club_summary
 from rtr import RTR
-from ui_common import Officials_Status_Frame
+from sanction_report import cohost_report_data, generate_club_reports
+from task_runner import Task, watch_task
+from ui_common import Officials_Status_Frame, Task_Progress
 
 
 class Sanctioning_Report_Options_Frame(ctk.CTkFrame):
@@ -90,6 +92,21 @@ class Sanctioning_Report_Options_Frame(ctk.CTkFrame):
             offvalue=False,
         ).grid(column=0, row=4, sticky="w", padx=20, pady=10)
 
+        format_names = {key: name for name, key in REPORT_FORMATS.items()}
+        self._report_format_var = StringVar(value=format_names.get(self._config.get_str("report_format"), "Word"))
+        report_format_frame = ctk.CTkFrame(optionsframe, fg_color="transparent")
+        report_format_frame.grid(column=0, row=5, sticky="w", padx=20, pady=10)
+        ctk.CTkLabel(report_format_frame, text="Format").grid(column=0, row=0, sticky="w", padx=(0, 10))
+        ctk.CTkOptionMenu(
+            report_format_frame,
+            values=list(REPORT_FORMATS),
+            variable=self._report_format_var,
+            command=self._handle_report_format,
+        ).grid(column=1, row=0, sticky="w")
+
+    def _handle_report_format(self, *_arg):
+        self._config.set_str("report_format", REPORT_FORMATS[self._report_format_var.get()])
+
     def _handle_incl_affiliates(self, *_arg):
         self._config.set_bool("incl_affiliates", self._incl_affiliates_var.get())
 
@@ -240,7 +257,7 @@ class Sanction_ROR(ctk.CTkFrame):
         self.reports_btn = ctk.CTkButton(buttonsframe, text="Generate Reports", command=self._handle_reports_btn)
         self.reports_btn.grid(column=0, row=0, sticky="ew", padx=20, pady=10)
 
-        self.bar = ctk.CTkProgressBar(master=buttonsframe, orientation="horizontal", mode="indeterminate")
+        self.bar = Task_Progress(buttonsframe)
 
     def buttons(self, newstate) -> None:
         """Enable/disable all buttons on the UI"""
@@ -279,22 +296,20 @@ class Sanction_ROR(ctk.CTkFrame):
             CTkMessagebox(master=self, title="Error", message="Load RTR Data First", icon="cancel", corner_radius=0)
             return
         self.buttons("disabled")
-        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="s")
-        self.bar.set(0)
-        self.bar.start()
-        reports_thread = _Generate_Reports(self._rtr, self._config)
-        reports_thread.start()
-        self.monitor_reports_thread(reports_thread)
-
-    def monitor_reports_thread(self, thread):
-        if thread.is_alive():
-            # check the thread every 100ms
-            self.after(100, lambda: self.monitor_reports_thread(thread))
+        self.bar.grid(row=2, column=0, pady=10, padx=20, sticky="ew")
+        self.bar.reset()
+        watch_task(self, _Generate_Reports(self._rtr, self._config), self.bar.show_event, self._reports_finished)
+
+    def _reports_finished(self, thread: "_Generate_Reports") -> None:
+        self.bar.grid_forget()
+        self.buttons("enabled")
+        summary = thread.summary
+        if summary is None:
+            CTkMessagebox(
+                master=self, title="Reports", message="Reports complete", icon="check", option_1="OK", corner_radius=0
+            )
         else:
-            self.bar.stop()
-            self.bar.grid_forget()
-            self.buttons("enabled")
-            thread.join()
+            CTkMessagebox(master=self, title="Reports", message=summary, icon="warning", option_1="OK", corner_radius=0)
 
 
 class Sanction_COA_CoHost(ctk.CTkFrame):
@@ -368,6 +383,8 @@ class Sanction_COA_CoHost(ctk.CTkFrame):
         self.cohost_btn = ctk.CTkButton(buttonsframe, text="Sanctioning Report", command=self._handle_cohost_btn)
         self.cohost_btn.grid(column=0, row=0, sticky="ew", padx=20, pady=10)
 
+        self.bar = Task_Progress(buttonsframe)
+
         self._rtr.register_update_callback(self.refresh_club_list)
 
     def refresh_club_list(self):
@@ -422,9 +439,10 @@ class Sanction_COA_CoHost(ctk.CTkFrame):
         club_list = self.get_clubs()
 
         if club_list:
+            self.bar.grid(row=1, column=0, pady=10, padx=20, sticky="ew")
+            self.bar.reset()
             cohost_thread = _Cohost_Analyzer(self._rtr, self._config, club_list)
-            cohost_thread.start()
-            self.monitor_cohost_thread(cohost_thread)
+            watch_task(self, cohost_thread, self.bar.show_event, self._cohost_finished)
         else:
             logging.info("Please select at least 1 club first")
             CTkMessagebox(
@@ -436,110 +454,42 @@ class Sanction_COA_CoHost(ctk.CTkFrame):
             )
             self.buttons("enabled")
 
-    def monitor_cohost_thread(self, thread):
-        if thread.is_alive():
-            # check the thread every 100ms
-            self.after(100, lambda: self.monitor_cohost_thread(thread))
-        else:
-            self.buttons("enabled")
-            thread.join()
+    def _cohost_finished(self, _thread: Task) -> None:
+        self.bar.grid_forget()
+        self.buttons("enabled")
 
 
-class _Generate_Reports(Thread):
+class _Generate_Reports(Task):
     def __init__(self, rtr: RTR, config: AnalyzerConfig):
         super().__init__()
-        self._df: pd.DataFrame = rtr.rtr_data
-        self._affiliates: pd.DataFrame = rtr.affiliates
-        self._club_list_names_df: pd.DataFrame = rtr.club_list_names_df
-        self._club_list_names: list = rtr.club_list_names
+        self._rtr = rtr
         self._config: AnalyzerConfig = config
+        self.summary: Optional[str] = None  # Save failures, None if everything was saved
 
-    def run(self):
+    def run_task(self):
         logging.info("Reporting in Progress...")
 
-        _report_directory = self._config.get_str("report_directory")
-        _report_file_docx = self._config.get_str("report_file_docx")
-        _full_report_file = os.path.abspath(os.path.join(_report_directory, _report_file_docx))
-        _full_report = self._config.get_bool("gen_word")
-        _per_club = self._config.get_bool("gen_1_per_club")
-        _use_affiliates = self._config.get_bool("incl_affiliates")
-
-        club_summaries = []
-
-        status_values = ["Active"]
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
-
-        report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
-
-        if _full_report:
-            doc = Document()
-        for club, club_full in self._club_list_names:
-            logging.info("Processing %s" % club_full)
-            affiliation_reg_ids = []
-            if _use_affiliates and not self._affiliates.empty:
-                affiliation_club_list = self._affiliates[self._affiliates["AffiliatedClubs"] == club]
-                if not affiliation_club_list.empty:
-                    affiliation_reg_ids = affiliation_club_list[("Registration Id")].values.tolist()
-
-            club_data = self._df[
-                (self._df["ClubCode"] == club) | (self._df["Registration Id"].isin(affiliation_reg_ids))
-            ]
-            club_data = club_data[club_data["Status"].isin(status_values)]
-            club_stat = club_summary(club, club_data, self._config)
-
-            if _full_report:
-                club_stat.dump_data_docx(doc, club_full, report_time, affiliation_reg_ids)
-                doc.add_page_break()
-            if _per_club:
-                _club_file = os.path.abspath(os.path.join(_report_directory, club + ".docx"))
-                club_doc = Document()
-                club_stat.dump_data_docx(club_doc, club_full, report_time, affiliation_reg_ids)
-                try:
-                    club_doc.save(_club_file)
-                except Exception as e:
-                    logging.info("Unable to save individual report: {}".format(type(e).__name__))
-                    logging.info("Exception message: {}".format(e))
-                    CTkMessagebox(
-                        title="Error", message=f"Unable to save file for {club_full}", icon="cancel", corner_radius=0
-                    )
-            club_summaries.append([club, club_full, club_stat])
-
-        if _full_report:
-            try:
-                doc.save(_full_report_file)
-            except Exception as e:
-                logging.info("Unable to save full report: {}".format(type(e).__name__))
-                logging.info("Exception message: {}".format(e))
-                CTkMessagebox(title="Error", message="Unable to save full report file", icon="cancel", corner_radius=0)
-
-        CTkMessagebox(title="Reports", message="Reports complete", icon="check", option_1="OK", corner_radius=0)
+        self.stage("Analyzing clubs")
+        # Shown once the task has finished, on the Tk thread
+        self.summary = failure_summary(generate_club_reports(self._rtr, self._config, self.progress))
 
         logging.info("Reports Complete")
 
 
-class _Cohost_Analyzer(Thread):
+class _Cohost_Analyzer(Task):
     def __init__(self, rtr: RTR, config: AnalyzerConfig, selected_clubs: list):
         super().__init__()
-        # quick fix - just map new datastructure to old
-        self._df: pd.DataFrame = rtr.rtr_data
-        self._affiliates: pd.DataFrame = rtr.affiliates
-        self._club_list_names_df: pd.DataFrame = rtr.club_list_names_df
-        self._club_list_names: list = rtr.club_list_names
+        self._rtr = rtr
         self._config: AnalyzerConfig = config
         self._selected_clubs: list = selected_clubs
 
-    def run(self):
+    def run_task(self):
         logging.info("Sanctioning report in Progress...")
+        self.stage("Selecting officials", 0, 3)
 
         _report_directory = self._config.get_str("report_directory")
         _report_file_cohost = self._config.get_str("report_file_cohost")
         _full_report_file = os.path.abspath(os.path.join(_report_directory, _report_file_cohost))
-        _use_affiliates = self._config.get_bool("incl_affiliates")
 
         club_list_names = self._selected_clubs
         club_codes = [i[0] for i in self._selected_clubs]
@@ -550,38 +500,21 @@ class _Cohost_Analyzer(Thread):
         else:
             report_club_code = "COHOST"
 
-        status_values = ["Active"]
-        if self._config.get_bool("incl_inv_pending"):
-            status_values.append("Invoice Pending")
-        if self._config.get_bool("incl_account_pending"):
-            status_values.append("Account Pending")
-        if self._config.get_bool("incl_pso_pending"):
-            status_values.append("PSO Pending")
-
         report_time = datetime.now().strftime("%A %B %d %Y %I:%M%p")
 
-        doc = Document()
         logging.info("Processing COA/Co-host report for %s" % club_full)
 
-        affiliation_reg_ids = []
-        if _use_affiliates and not self._affiliates.empty:
-            # Affiliation is removed if the offiical is from one of the host clubs
-            affiliation_club_list = self._affiliates[
-                self._affiliates["AffiliatedClubs"].isin(club_codes) & ~self._affiliates["ClubCode"].isin(club_codes)
-            ]
-            if not affiliation_club_list.empty:
-                affiliation_reg_ids = affiliation_club_list[("Registration Id")].values.tolist()
-
-        club_data = self._df[
-            (self._df["ClubCode"].isin(club_codes)) | (self._df["Registration Id"].isin(affiliation_reg_ids))
-        ]
-        club_data = club_data[club_data["Status"].isin(status_values)]
+        club_data, affiliation_reg_ids = cohost_report_data(self._rtr, club_codes, self._config)
+        self.stage("Analyzing clubs", 1, 3)
         club_stat = club_summary(report_club_code, club_data, self._config)
 
-        club_stat.dump_data_docx(doc, club_full, report_time, affiliation_reg_ids)
+        _backend = backend_class(self._config.get_str("report_format"))
+        report = _backend()
+        club_stat.dump_report(report, club_full, report_time, affiliation_reg_ids)
 
+        self.stage("Saving report", 2, 3)
         try:
-            doc.save(_full_report_file)
+            report.save(report_filename(_full_report_file, _backend))
             CTkMessagebox(
                 title="Sanctioning Report", message="Report complete", icon="check", option_1="OK", corner_radius=0
             )
@@ -0,0 +1,135 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Club sanctioning reports (ROR/POA)
+
+Runs the club_summary analysis for every club and writes the reports, shared by the sanctioning
+screen and the command line.
+"""
+
+import logging
+import os
+from datetime import datetime
+from functools import partial
+from typing import Optional
+
+import pandas as pd
+
+from club_summary import club_summary
+from config import AnalyzerConfig
+from official_docs import ProgressCallback
+from report_backends import ReportBackend, backend_class, report_filename
+from report_writer import BackgroundWriter
+from rtr_loader import RTR_Data, status_values
+
+
+def club_report_data(rtr: RTR_Data, club: str, config: AnalyzerConfig) -> tuple[pd.DataFrame, list]:
+    """The officials reported on for a club and the registration ids of those included as affiliates"""
+    affiliation_reg_ids = []
+    if config.get_bool("incl_affiliates") and not rtr.affiliates.empty:
+        affiliation_club_list = rtr.affiliates[rtr.affiliates["AffiliatedClubs"] == club]
+        if not affiliation_club_list.empty:
+            affiliation_reg_ids = affiliation_club_list[("Registration Id")].values.tolist()
+
+    df = rtr.rtr_data
+    club_data = df[(df["ClubCode"] == club) | (df["Registration Id"].isin(affiliation_reg_ids))]
+    club_data = club_data[club_data["Status"].isin(status_values(config))]
+    return club_data, affiliation_reg_ids
+
+
+def cohost_report_data(rtr: RTR_Data, club_codes: list, config: AnalyzerConfig) -> tuple[pd.DataFrame, list]:
+    """The officials of clubs hosting a meet together, and the registration ids of their affiliates"""
+    affiliation_reg_ids = []
+    if config.get_bool("incl_affiliates") and not rtr.affiliates.empty:
+        # Affiliation is removed if the offiical is from one of the host clubs
+        affiliation_club_list = rtr.affiliates[
+            rtr.affiliates["AffiliatedClubs"].isin(club_codes) & ~rtr.affiliates["ClubCode"].isin(club_codes)
+        ]
+        if not affiliation_club_list.empty:
+            affiliation_reg_ids = affiliation_club_list[("Registration Id")].values.tolist()
+
+    df = rtr.rtr_data
+    club_data = df[(df["ClubCode"].isin(club_codes)) | (df["Registration Id"].isin(affiliation_reg_ids))]
+    club_data = club_data[club_data["Status"].isin(status_values(config))]
+    return club_data, affiliation_reg_ids
+
+
+def generate_club_reports(rtr: RTR_Data, config: AnalyzerConfig, progress: Optional[ProgressCallback] = None) -> list:
+    """Produce the sanctioning reports of every club, returns a SaveFailure for each file not saved"""
+    _report_directory = config.get_str("report_directory")
+    _report_file_docx = config.get_str("report_file_docx")
+    _backend = backend_class(config.get_str("report_format"))
+    _full_report_file = report_filename(os.path.abspath(os.path.join(_report_directory, _report_file_docx)), _backend)
+    _full_report = config.get_bool("gen_word")
+    _per_club = config.get_bool("gen_1_per_club")
+
+    report_time = datetime.now().strftime("%B %d %Y %I:%M%p")
+
+    # Saves run on a background thread while the next club is analyzed and rendered. The master
+    # document is streamed to disk one club at a time, it is only ever touched by that thread.
+    saver = BackgroundWriter()
+    master = None
+    if _full_report:
+        try:
+            master = _backend.master(_full_report_file)
+        except Exception as e:
+            logging.info("Unable to save full report: {}".format(type(e).__name__))
+            logging.info("Exception message: {}".format(e))
+            saver.fail(_full_report_file, f"{type(e).__name__} - {e}")
+    _full_report = master is not None
+
+    def add_to_master(section: ReportBackend) -> None:
+        nonlocal master
+        if master is None:
+            return
+        try:
+            master.add(section)
+        except Exception:
+            # Give up on the master document, the individual files are still produced
+            master.abort()
+            master = None
+            raise
+
+    def close_master() -> None:
+        if master is not None:
+            master.close()
+
+    for club_number, (club, club_full) in enumerate(rtr.club_list_names):
+        logging.info("Processing %s" % club_full)
+        if progress is not None:
+            progress(club_number, len(rtr.club_list_names))
+        club_data, affiliation_reg_ids = club_report_data(rtr, club, config)
+        club_stat = club_summary(club, club_data, config)
+
+        # The same club section is used for the individual file and the master document
+        if _full_report or _per_club:
+            club_report = _backend()
+            club_stat.dump_report(club_report, club_full, report_time, affiliation_reg_ids)
+        if _per_club:
+            _club_file = os.path.abspath(os.path.join(_report_directory, club + _backend.extension))
+            saver.submit(_club_file, partial(club_report.save, _club_file))
+        if _full_report:
+            saver.submit(f"{_full_report_file} ({club_full})", partial(add_to_master, club_report))
+
+    saver.submit(_full_report_file, close_master)
+    if progress is not None:
+        progress(len(rtr.club_list_names), len(rtr.club_list_names))
+    return saver.close()
@@ -3,7 +3,6 @@ from PyInstaller.utils.hooks import collect_data_files
 
 datas = [('media\\swon-analyzer.ico', 'media')]
 datas += collect_data_files('CTkMessagebox')
-datas += collect_data_files('docxcompose')
 
 
 block_cipher = None
@@ -21,7 +21,10 @@
 
 """Version information"""
 import datetime
+import json
+import os
 import re
+import time
 from typing import List, Optional
 
 import dateutil.parser
@@ -30,6 +33,12 @@ import requests
 import semver.version  # type: ignore
 
 
+RELEASES_REPO = "dmanusrex/SWON-Analyzer"
+
+# How long (in seconds) a cached release list is used before GitHub is asked again
+CACHE_TTL = 24 * 60 * 60
+
+
 class ReleaseInfo:
     """
     ReleaseInfo describes a single release from a GitHub repository.
@@ -54,19 +63,65 @@ class ReleaseInfo:
             self.semver = match.group(1)
 
 
-def releases(user_repo: str) -> List[ReleaseInfo]:
-    """
-    Retrieves the list of releases for the provided repo. user_repo should be
-    of the form "user/repo"
-    """
-    url = f"https://api.github.com/repos/{user_repo}/releases"
+def releases_url(user_repo: str) -> str:
+    """The GitHub API url listing the releases of user_repo ("user/repo")"""
+    return f"https://api.github.com/repos/{user_repo}/releases"
+
+
+def _fetch_releases(url: str) -> Optional[list]:
+    """The release list (as JSON) from url, None if the server refused the request"""
     # The timeout may be too fast, but it's going to hold up displaying the
     # settings screen. Better to miss an update than hang for too long.
     resp = requests.get(url, headers={"Accept": "application/vnd.github.v3+json"}, timeout=2)
     if not resp.ok:
+        return None
+    return resp.json()
+
+
+def releases(user_repo: str, url: Optional[str] = None) -> List[ReleaseInfo]:
+    """
+    Retrieves the list of releases for the provided repo. user_repo should be
+    of the form "user/repo". url replaces the GitHub API url (e.g. a local test server).
+    """
+    body = _fetch_releases(url or releases_url(user_repo))
+    if body is None:
         return []
+    return list(map(ReleaseInfo, body))
+
 
-    body = resp.json()
+def cached_releases(url: str, cache_file: str, ttl: float = CACHE_TTL) -> List[ReleaseInfo]:
+    """
+    Retrieves the list of releases from url, using the copy saved in cache_file
+    if it was fetched from the same url less than ttl seconds ago. If the
+    request fails an expired copy is used rather than nothing.
+    """
+    cache = None
+    try:
+        with open(cache_file, "r", encoding="utf-8") as cached:
+            cache = json.load(cached)
+        if cache.get("url") != url:
+            cache = None
+    except (OSError, ValueError):
+        pass
+    if cache is not None and 0 <= time.time() - cache["fetched"] < ttl:
+        return list(map(ReleaseInfo, cache["releases"]))
+
+    try:
+        body = _fetch_releases(url)
+    except requests.RequestException:
+        if cache is None:
+            raise
+        body = None
+    if body is None:
+        return [] if cache is None else list(map(ReleaseInfo, cache["releases"]))
+
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as cached:
+            json.dump({"url": url, "fetched": time.time(), "releases": body}, cached)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass  # Ask again next time
     return list(map(ReleaseInfo, body))
 
 
@@ -132,9 +187,10 @@ def git_semver(wrv: str) -> str:
     return str(version_info)
 
 
-def latest() -> Optional[ReleaseInfo]:
-    """Retrieves the latest release info"""
-    rlist = releases("dmanusrex/SWON-Analyzer")
+def latest(url: Optional[str] = None, cache_file: Optional[str] = None) -> Optional[ReleaseInfo]:
+    """Retrieves the latest release info, through cache_file if one is given"""
+    url = url or releases_url(RELEASES_REPO)
+    rlist = releases(RELEASES_REPO, url) if cache_file is None else cached_releases(url, cache_file)
     if len(rlist) == 0:
         return None
     return highest_semver(rlist)
@@ -0,0 +1,140 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Long running operations started from the UI
+
+Each operation runs on its own thread and reports what it is doing as TaskEvents on a queue. When an
+event is posted the Tk loop is asked to drain the queue, so progress and completion are handled as
+soon as they happen. A slow poll on the Tk thread picks up events whose wake up could not be sent.
+"""
+
+import queue
+import time
+from threading import Event, Thread
+from typing import Any, Callable, NamedTuple, Optional
+
+# Milliseconds between checks of the queue on the Tk thread, in case a wake up from the worker was lost
+SAFETY_POLL_MS = 500
+
+
+class TaskEvent(NamedTuple):
+    """Progress of a task"""
+
+    stage: str  # What the task is doing
+    done: int  # Steps of the stage completed
+    total: int  # Steps in the stage, 0 if unknown
+    elapsed: float  # Seconds since the task started
+    finished: bool = False  # The last event of the task
+
+
+class Task(Thread):
+    """A long operation run on a background thread.
+
+    Subclasses put the work in run_task and report progress with stage() and progress(). A finished
+    event is always posted when run_task returns, even if it raised.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.events: queue.Queue = queue.Queue()
+        self._stage = ""
+        self._start_time = time.perf_counter()
+        self._notify: Optional[Callable[[], None]] = None
+
+    def _post(self, done: int, total: int, finished: bool = False) -> None:
+        self.events.put(TaskEvent(self._stage, done, total, time.perf_counter() - self._start_time, finished))
+        if self._notify is not None:
+            self._notify()
+
+    def stage(self, stage: str, done: int = 0, total: int = 0) -> None:
+        """Start a new stage, done and total can count the stages themselves"""
+        self._stage = stage
+        self._post(done, total)
+
+    def progress(self, done: int, total: int) -> None:
+        """Report progress through the current stage, usable as a ProgressCallback"""
+        self._post(done, total)
+
+    def run(self):
+        self._start_time = time.perf_counter()
+        try:
+            self.run_task()
+        finally:
+            # Exceptions carry on to the thread's excepthook (and crash reporting) as before
+            self._post(1, 1, finished=True)
+
+    def run_task(self) -> None:
+        raise NotImplementedError
+
+
+def watch_task(
+    widget: Any,
+    task: Task,
+    on_event: Optional[Callable[[TaskEvent], None]],
+    on_finished: Callable[[Any], None],
+) -> None:
+    """Start task and handle its events on the Tk thread of widget.
+
+    on_event gets the latest progress event each time the queue is drained, on_finished gets the
+    task once it has finished. The worker wakes the Tk loop with after(0) (tkinter hands the call to
+    the main thread) and only one drain is pending at a time. Must be called from the Tk thread.
+    """
+    pending = Event()
+    finished = Event()
+
+    def drain() -> None:
+        pending.clear()  # Anything posted from here on schedules another drain
+        if finished.is_set():
+            return
+        latest = None
+        while True:
+            try:
+                event = task.events.get_nowait()
+            except queue.Empty:
+                break
+            if event.finished:
+                finished.set()
+                # Not joined, the thread may still be waiting for this loop to take its last wake up
+                on_finished(task)
+                return
+            latest = event
+        if latest is not None and on_event is not None:
+            on_event(latest)
+
+    def poll() -> None:
+        drain()
+        if not finished.is_set():
+            widget.after(SAFETY_POLL_MS, poll)
+
+    def notify() -> None:
+        if pending.is_set():
+            return
+        pending.set()
+        try:
+            widget.after(0, drain)
+        except RuntimeError:
+            # tkinter refuses calls from other threads while the main loop is not running (not started
+            # yet or already gone), poll picks the events up
+            pending.clear()
+
+    task._notify = notify
+    task.start()
+    widget.after(SAFETY_POLL_MS, poll)
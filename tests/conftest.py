@@ -0,0 +1,60 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Officials loaded from more than one export, their index labels are not unique"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AnalyzerConfig  # noqa: E402
+from rtr_loader import Data_Loader, RTR_Data  # noqa: E402
+from rtr_synthetic import generate_rtr, write_csv  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AnalyzerConfig()
+    for name, value in AnalyzerConfig.defaults().items():
+        config.set_str(name, value)
+    config.set_str("odp_report_directory", str(tmp_path / "odp"))
+    os.makedirs(config.get_str("odp_report_directory"))
+    return config
+
+
+@pytest.fixture
+def merged_rtr(tmp_path, config):
+    """A synthetic export split in two and loaded one half after the other"""
+    export = generate_rtr(officials=240, clubs=4)
+    rtr = RTR_Data(config)
+    for part, rows in enumerate([export.iloc[::2], export.iloc[1::2]]):
+        filename = str(tmp_path / f"export{part}.csv")
+        write_csv(rows, filename)
+        config.set_str("officials_list", filename)
+        loader = Data_Loader(config)
+        loader.run()
+        assert not loader.failure_reason
+        rtr.load_rtr_data(loader.rtr_data)
+    assert rtr.rtr_data.index.has_duplicates
+    return rtr
@@ -0,0 +1,46 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""New pathway warnings for officials loaded from more than one export"""
+
+from docx_utils import document_text
+from np_warnings import dump_warnings, find_warnings
+from report_backends import DocxBackend
+from rtr_loader import status_values
+
+
+def test_merged_exports(config, merged_rtr):
+    officials = merged_rtr.rtr_data[merged_rtr.rtr_data["Status"].isin(status_values(config))]
+    table = find_warnings(officials)
+    warned = table["Registration Id"].nunique()
+    assert warned > 0
+
+    report = DocxBackend()
+    dump_warnings(report, table, len(officials), "2024-09-30")
+    assert f"Officials with Warnings: {warned}" in "\n".join(document_text(report.doc))
+
+
+def test_near_misses_took_the_clinic(config, merged_rtr):
+    officials = merged_rtr.rtr_data
+    table = find_warnings(officials)
+    for code, clinic in [("NP_OFFICIAL_CT", "CT"), ("NP_OFFICIAL_INTRO", "Intro")]:
+        positions = table.index[table["Code"] == code]
+        assert (officials[f"{clinic}_Status"].iloc[positions] == "Q").all()
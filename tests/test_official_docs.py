@@ -0,0 +1,67 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Incremental per-official documents"""
+
+import json
+import os
+
+from docx import Document  # type: ignore
+
+from docx_utils import document_text
+from odp_report import docgenCore, select_club_officials
+
+
+def _write(config, rtr, club):
+    generator = docgenCore(club, select_club_officials(rtr.rtr_data, club, config), config)
+    return generator, generator.dump_data_docx("Club", "2024-09-30")
+
+
+def test_manifest_merged_exports(config, merged_rtr):
+    config.set_bool("incremental_docs", True)
+    club = merged_rtr.club_list_names[0][0]
+    generator, written = _write(config, merged_rtr, club)
+    assert written and not generator.failures
+
+    manifest = os.path.join(config.get_str("odp_report_directory"), "odp-manifest.json")
+    with open(manifest, "r", encoding="utf-8") as manifest_file:
+        officials = json.load(manifest_file)["officials"]
+    assert len(officials) == len(generator.officials())
+
+    generator, rewritten = _write(config, merged_rtr, club)
+    assert rewritten == written and not generator.failures
+
+
+def test_manifest_shared_name(config, merged_rtr):
+    config.set_bool("incremental_docs", True)
+    club = merged_rtr.club_list_names[0][0]
+    officials = select_club_officials(merged_rtr.rtr_data, club, config).copy()
+    officials = officials[officials["Level"] < 4]
+    officials.loc[officials.index[1], ["Last Name", "First Name"]] = officials.iloc[0][["Last Name", "First Name"]]
+    reg_ids = [str(reg_id) for reg_id in officials["Registration Id"].iloc[:2]]
+
+    for _ in range(2):
+        master = Document()
+        generator = docgenCore(club, officials, config)
+        generator.dump_data_docx("Club", "2024-09-30", master)
+        assert not generator.failures
+        text = "\n".join(document_text(master))
+        assert all(reg_id in text for reg_id in reg_ids)
@@ -0,0 +1,40 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Officials search"""
+
+import pandas as pd
+
+from officials_index import OfficialsSearch
+
+
+def test_registration_id():
+    data = pd.DataFrame(
+        {
+            "Full Name": ["Wilson, Robert", "Adams, Jane", "Wilson, Roberta"],
+            "Registration Id": ["4532159", "45321590", "9623114"],
+        }
+    )
+    search = OfficialsSearch(data)
+    assert search.search("4532159").tolist() == [0]  # Not 45321590 as well
+    assert search.search(" 9623114 ").tolist() == [2]
+    assert search.search("453215").tolist() == [1, 0]  # Still a prefix while typing, in name order
+    assert search.search("wilson").tolist() == [0, 2]
@@ -0,0 +1,78 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Update check against a local stand-in for the GitHub releases API"""
+
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import swon_version
+
+RELEASES = [
+    {
+        "tag_name": f"v{version}",
+        "html_url": f"https://example.invalid/releases/v{version}",
+        "draft": False,
+        "prerelease": False,
+        "published_at": "2024-09-30T00:00:00Z",
+    }
+    for version in ["0.6.0", "0.7.1", "0.7.0"]
+]
+
+
+class _Releases(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        body = json.dumps(RELEASES).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_latest_cached(tmp_path):
+    server = HTTPServer(("127.0.0.1", 0), _Releases)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/releases"
+    cache_file = str(tmp_path / "releases.json")
+
+    try:
+        assert swon_version.latest(url, cache_file).tag == "v0.7.1"
+        assert swon_version.latest(url, cache_file).tag == "v0.7.1"
+        assert _Releases.requests == 1  # The second answer came from the cache
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Expired and the server is down, the old copy is still better than nothing
+    with open(cache_file, "r", encoding="utf-8") as cached:
+        cache = json.load(cached)
+    cache["fetched"] = 0
+    with open(cache_file, "w", encoding="utf-8") as cached:
+        json.dump(cache, cached)
+    assert swon_version.latest(url, cache_file).tag == "v0.7.1"
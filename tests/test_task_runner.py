@@ -0,0 +1,57 @@
+# Club Analyzer - https://github.com/dmanusrex/SWON-Analyzer
+# Copyright (C) 2024 - Darren Richer
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Task events handed to the Tk thread"""
+
+import threading
+
+from task_runner import Task, watch_task
+
+
+class _Widget:
+    """Stands in for a Tk widget whose main loop has not started, after() fails off the main thread"""
+
+    def __init__(self):
+        self.calls: list = []
+
+    def after(self, _ms, callback):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("main thread is not in main loop")
+        self.calls.append(callback)
+
+    def mainloop(self, finished):
+        while self.calls and not finished:
+            self.calls.pop(0)()
+
+
+class _Quick(Task):
+    def run_task(self):
+        self.stage("Working", 0, 1)
+
+
+def test_events_before_mainloop():
+    widget = _Widget()
+    task = _Quick()
+    finished: list = []
+    watch_task(widget, task, None, finished.append)
+    task.join()  # Every event was posted before the main loop started
+    widget.mainloop(finished)
+    assert finished == [task]
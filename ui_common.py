@@ -25,12 +25,13 @@
 
 import logging
 from tkinter import BooleanVar, StringVar
-from typing import Any
+from typing import Any, Callable, Optional
 
 import customtkinter as ctk  # type: ignore
 
 # Appliction Specific Imports
 from config import AnalyzerConfig
+from task_runner import TaskEvent
 
 
 class Officials_Status_Frame(ctk.CTkFrame):
@@ -92,6 +93,130 @@ class Officials_Status_Frame(ctk.CTkFrame):
         self._config.set_bool("incl_inv_pending", self._incl_inv_pending.get())
 
 
+class Virtual_Grid(ctk.CTkFrame):
+    """A table that only has widgets for the rows on screen
+
+    The data is a list of columns, each a sequence of text in display order. Scrolling changes which
+    slice of them the fixed set of cells shows, so the number of rows makes no difference to the
+    time taken to draw. Clicking a heading calls sort_command with the column number, clicking a row
+    calls select_command with its row number in the data.
+    """
+
+    def __init__(
+        self,
+        container: ctk.CTkFrame,
+        headings: list,
+        widths: list,
+        visible_rows: int = 15,
+        sort_command: Optional[Callable[[int], None]] = None,
+        select_command: Optional[Callable[[int], None]] = None,
+    ):
+        super().__init__(container)
+        self._headings = headings
+        self._visible_rows = visible_rows
+        self._sort_command = sort_command
+        self._select_command = select_command
+        self._columns: list = [[] for _ in headings]
+        self._rows = 0
+        self._top = 0  # First row shown
+
+        self._heading_buttons = []
+        for c, heading in enumerate(headings):
+            self.columnconfigure(c, weight=1 if c == 0 else 0)
+            button = ctk.CTkButton(self, text=heading, width=widths[c], command=lambda c=c: self._handle_heading(c))
+            button.grid(column=c, row=0, sticky="ew", padx=1, pady=(0, 2))
+            self._heading_buttons.append(button)
+
+        self._cells = []
+        for r in range(visible_rows):
+            row = []
+            for c in range(len(headings)):
+                cell = ctk.CTkLabel(self, text="", width=widths[c], height=20, anchor="w" if c == 0 else "center")
+                cell.grid(column=c, row=r + 1, sticky="ew", padx=5)
+                cell.bind("<Button-1>", lambda _event, r=r: self._handle_select(r))
+                row.append(cell)
+            self._cells.append(row)
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._yview)
+        self._scrollbar.grid(column=len(headings), row=1, rowspan=visible_rows, sticky="ns")
+
+        for widget in [self] + [cell for row in self._cells for cell in row]:
+            widget.bind("<MouseWheel>", self._handle_mouse_wheel)
+            widget.bind("<Button-4>", self._handle_mouse_wheel)
+            widget.bind("<Button-5>", self._handle_mouse_wheel)
+
+    def _handle_heading(self, column: int) -> None:
+        if self._sort_command is not None:
+            self._sort_command(column)
+
+    def _handle_select(self, row: int) -> None:
+        if self._select_command is not None and self._top + row < self._rows:
+            self._select_command(self._top + row)
+
+    def _handle_mouse_wheel(self, event) -> None:
+        self._scroll_to(self._top + (-3 if event.num == 4 or event.delta > 0 else 3))
+
+    def _yview(self, *args) -> None:
+        """Scrollbar command"""
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * self._rows))
+        elif args[0] == "scroll":
+            self._scroll_to(self._top + int(args[1]) * (self._visible_rows if args[2] == "pages" else 1))
+
+    def _scroll_to(self, top: int) -> None:
+        self._top = max(0, min(top, self._rows - self._visible_rows))
+        self._draw()
+
+    def _draw(self) -> None:
+        for r, row in enumerate(self._cells):
+            i = self._top + r
+            for c, cell in enumerate(row):
+                text = str(self._columns[c][i]) if i < self._rows else ""
+                if cell.cget("text") != text:
+                    cell.configure(text=text)
+        if self._rows > self._visible_rows:
+            self._scrollbar.set(self._top / self._rows, (self._top + self._visible_rows) / self._rows)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def set_rows(self, columns: list) -> None:
+        """Show new data from the top, columns holds one sequence of text per heading"""
+        self._columns = columns
+        self._rows = len(columns[0])
+        self._top = 0
+        self._draw()
+
+    def set_message(self, text: str) -> None:
+        """Show a line of text in place of the data"""
+        self.set_rows([[text]] + [[""] for _ in self._headings[1:]])
+
+    def set_sort_indicator(self, column: int, descending: bool) -> None:
+        for c, button in enumerate(self._heading_buttons):
+            marker = (" \u25bc" if descending else " \u25b2") if c == column else ""
+            button.configure(text=self._headings[c] + marker)
+
+
+class Task_Progress(ctk.CTkFrame):
+    """Progress bar for a running task with its stage, step count and elapsed time underneath"""
+
+    def __init__(self, container: ctk.CTkFrame):
+        super().__init__(container, fg_color="transparent")
+        self.columnconfigure(0, weight=1)
+        self._bar = ctk.CTkProgressBar(self, orientation="horizontal", mode="determinate")
+        self._bar.grid(column=0, row=0, sticky="ew")
+        self._status = StringVar(value="")
+        ctk.CTkLabel(self, textvariable=self._status, height=20).grid(column=0, row=1, sticky="w")
+
+    def reset(self) -> None:
+        self._bar.set(0)
+        self._status.set("Starting")
+
+    def show_event(self, event: TaskEvent) -> None:
+        self._bar.set(event.done / event.total if event.total else 0)
+        count = f" ({event.done}/{event.total})" if event.total else ""
+        self._status.set(f"{event.stage}{count} - {event.elapsed:.0f}s")
+
+
 class Application_Preferences(ctk.CTkFrame):
     """Application Wide Preferences"""
 